@@ -0,0 +1,92 @@
+# Tamanho da tabela quente e p50/p99 de GET /tasks/ (ETag da lista + página) antes e depois do arquivamento,
+# e o maior tempo de um lote (tempo máximo com o lock de escrita).
+# Uso: python -m benchmarks.archive_hot_cold --rows 200000 --done-ratio 0.8
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from sqlalchemy.orm import sessionmaker
+
+from src.database import create_db_engine, run_migrations
+from src.controllers import archive_controller
+from src.controllers.task_controller import list_tasks_filtered, tasks_filtered_etag
+from src.controllers.list_cache import list_cache
+
+def seed(engine, rows, done_ratio, chunk=50_000):
+    rnd = random.Random(42)
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for start in range(0, rows, chunk):
+            batch = []
+            for i in range(start, min(start + chunk, rows)):
+                done = rnd.random() < done_ratio
+                batch.append((
+                    f"t{i}", "done" if done else rnd.choice(["pending", "in_progress"]),
+                    rnd.choice(["low", "medium", "high"]),
+                    (date.today() + timedelta(days=rnd.randint(-365, 365))).isoformat(),
+                    "2020-01-01 00:00:00" if done else None,
+                ))
+            cursor.executemany(
+                "INSERT INTO tasks (title, status, priority, due_date, completed_at) VALUES (?, ?, ?, ?, ?)", batch
+            )
+            raw.commit()
+    finally:
+        raw.close()
+
+def latencies(db, repeat):
+    # filtros típicos da tela de tarefas abertas; o cache é limpo para medir o banco
+    samples = []
+    for _ in range(repeat):
+        for filters in ({"status_filter": "pending"}, {"priority": "high"}, {}):
+            list_cache.clear()
+            start = time.perf_counter()
+            tasks_filtered_etag(db, limit=100, **filters)
+            list_tasks_filtered(db, limit=100, **filters)
+            samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--done-ratio", type=float, default=0.8)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run_migrations(url)
+        engine = create_db_engine(url)
+        seed(engine, args.rows, args.done_ratio)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            p50, p99 = latencies(db, args.repeat)
+            print(f"antes:  {archive_controller.hot_table_size(db)} tarefas quentes | p50 {p50:.2f} ms | p99 {p99:.2f} ms")
+
+            chunk_times = []
+            original = archive_controller.archive_chunk
+            def timed_chunk(*a, **kw):
+                start = time.perf_counter()
+                result = original(*a, **kw)
+                chunk_times.append((time.perf_counter() - start) * 1000)
+                return result
+            archive_controller.archive_chunk = timed_chunk
+            try:
+                summary = archive_controller.archive_done_tasks(db, 30, args.chunk_size, pause=0)
+            finally:
+                archive_controller.archive_chunk = original
+            print(
+                f"arquivadas {summary['archived_tasks']} em {summary['chunks']} lotes ({summary['seconds']}s); "
+                f"lote mais longo {max(chunk_times):.1f} ms"
+            )
+
+            p50, p99 = latencies(db, args.repeat)
+            print(f"depois: {archive_controller.hot_table_size(db)} tarefas quentes | p50 {p50:.2f} ms | p99 {p99:.2f} ms")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Compara a vazão (linhas/s) de criar, atualizar e remover tarefas uma a uma
+# (create_task/update_task/delete_task) com os endpoints em lote.
+# Uso: python -m benchmarks.bulk_tasks --rows 5000
+import argparse
+import os
+import tempfile
+import time
+from sqlalchemy.orm import sessionmaker
+
+from src.database import create_db_engine, run_migrations
+from src.controllers import task_controller, task_bulk_controller
+from src.models.user_model import User
+from src.models.task_model import TaskCreate, TaskUpdate, TaskBulkUpdate
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run_migrations(url)
+        engine = create_db_engine(url)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            db.add(User(name="bench", email="bench@example.com", hashed_password="x", is_active=True))
+            db.commit()
+            payloads = [TaskCreate(title=f"t{i}", priority="low", assigned_to=1) for i in range(rows)]
+
+            created = []
+            single = {"create": timed(lambda: created.extend(task_controller.create_task(p, db).id for p in payloads))}
+            single["update"] = timed(lambda: [
+                task_controller.update_task(i, TaskUpdate(status="done"), db) for i in created
+            ])
+            single["delete"] = timed(lambda: [task_controller.delete_task(i, db) for i in created])
+
+            result = {}
+            bulk = {"create": timed(lambda: result.update(task_bulk_controller.bulk_create_tasks(payloads, db)))}
+            ids = [r["id"] for r in result["results"]]
+            bulk["update"] = timed(lambda: task_bulk_controller.bulk_update_tasks(
+                [TaskBulkUpdate(id=i, status="done") for i in ids], db
+            ))
+            bulk["delete"] = timed(lambda: task_bulk_controller.bulk_delete_tasks(ids, db))
+        engine.dispose()
+        return single, bulk
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    single, bulk = run(args.rows)
+    for op in ("create", "update", "delete"):
+        print(
+            f"{op:>6}: um a um {args.rows / single[op]:9.0f} linhas/s | "
+            f"lote {args.rows / bulk[op]:9.0f} linhas/s ({single[op] / bulk[op]:.1f}x)"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Custo x benefício da compressão em corpos reais de GET /tasks/: para cada codificação/nível,
+# tamanho, CPU para comprimir e tempo total estimado (compressão + transferência) em alguns links.
+# Uso: python -m benchmarks.compression_lists --rows 100 1000
+import argparse
+import os
+import tempfile
+import time
+import zlib
+from datetime import date, timedelta
+from sqlalchemy.orm import sessionmaker
+
+from src import compression
+from src.database import create_db_engine, run_migrations
+from src.controllers.fast_json import TASK_ROWS
+from src.controllers.task_controller import list_tasks_filtered
+
+# links em Mbit/s (móvel, banda larga, rede interna)
+LINKS = {"4G": 10, "banda larga": 100, "LAN": 1000}
+
+def seed(engine, rows):
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().executemany(
+            "INSERT INTO tasks (title, description, status, priority, due_date, assigned_to) VALUES (?, ?, ?, ?, ?, NULL)",
+            [
+                (f"Tarefa {i}", f"Revisar o item {i} do backlog e atualizar a documentação", ("pending", "done")[i % 2],
+                 ("low", "medium", "high")[i % 3], (date.today() + timedelta(days=i % 365)).isoformat())
+                for i in range(rows)
+            ],
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+def variants():
+    yield "gzip-1", lambda body: zlib.compress(body, 1, wbits=31)
+    yield "gzip-6", lambda body: zlib.compress(body, 6, wbits=31)
+    yield "gzip-9", lambda body: zlib.compress(body, 9, wbits=31)
+    if compression.brotli is not None:
+        for quality in (1, 4, 11):
+            yield f"br-{quality}", lambda body, q=quality: compression.brotli.compress(body, quality=q)
+    if compression.zstandard is not None:
+        for level in (1, 3, 9):
+            yield f"zstd-{level}", lambda body, l=level: compression.zstandard.ZstdCompressor(level=l).compress(body)
+
+def timed(fn, body, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        data = fn(body)
+        samples.append((time.process_time() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], len(data)
+
+def transfer_ms(size, mbits):
+    return size * 8 / (mbits * 1000)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run_migrations(url)
+        engine = create_db_engine(url)
+        seed(engine, max(args.rows))
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            bodies = {rows: TASK_ROWS.dumps(list_tasks_filtered(db, limit=rows, rows=True)) for rows in args.rows}
+        engine.dispose()
+
+    header = f"{'codificação':<12}{'bytes':>10}{'razão':>8}{'CPU ms':>9}" + "".join(f"{name:>14}" for name in LINKS)
+    for rows, body in bodies.items():
+        print(f"\nGET /tasks/?limit={rows}: {len(body) / 1024:.0f} KiB (tempo total em ms por link)")
+        print(header)
+        print(f"{'identity':<12}{len(body):>10}{1:>8.2f}{0:>9.2f}"
+              + "".join(f"{transfer_ms(len(body), mbits):>14.1f}" for mbits in LINKS.values()))
+        for name, fn in variants():
+            cpu_ms, size = timed(fn, body, args.repeat)
+            print(f"{name:<12}{size:>10}{size / len(body):>8.2f}{cpu_ms:>9.2f}"
+                  + "".join(f"{cpu_ms + transfer_ms(size, mbits):>14.1f}" for mbits in LINKS.values()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Compara vazão de leituras/escritas concorrentes no SQLite com a configuração
+# antiga (rollback journal, synchronous=FULL) e com os PRAGMAs de src/database.py.
+# Uso: python -m benchmarks.db_mixed_rw --threads 8 --duration 5 --write-ratio 0.2
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, create_db_engine, SQLITE_PRAGMAS
+from src.models.user_model import User  # registra as tabelas no metadata
+from src.models.task_model import Task
+from src.models.comment_model import Comment
+
+LEGACY_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+def run(pragmas, threads, duration, write_ratio, seed_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", sqlite_pragmas=pragmas)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            db.add_all(Task(title=f"t{i}", status="pending", priority="medium") for i in range(seed_rows))
+            db.commit()
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def worker():
+            rnd = random.Random()
+            local = {"reads": 0, "writes": 0, "errors": 0}
+            with Session() as db:
+                while time.perf_counter() < deadline:
+                    try:
+                        if rnd.random() < write_ratio:
+                            db.add(Task(title="w", status="pending", priority="low"))
+                            db.commit()
+                            local["writes"] += 1
+                        else:
+                            db.query(Task).filter(Task.id == rnd.randint(1, seed_rows)).first()
+                            db.rollback()
+                            local["reads"] += 1
+                    except OperationalError:
+                        db.rollback()
+                        local["errors"] += 1
+            with lock:
+                for k, v in local.items():
+                    counts[k] += v
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        engine.dispose()
+        return counts
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--seed-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    for label, pragmas in (("antes (journal)", LEGACY_PRAGMAS), ("depois (WAL)", SQLITE_PRAGMAS)):
+        c = run(pragmas, args.threads, args.duration, args.write_ratio, args.seed_rows)
+        total = c["reads"] + c["writes"]
+        print(
+            f"{label:>16}: {total / args.duration:8.0f} ops/s "
+            f"(leituras={c['reads']} escritas={c['writes']} erros={c['errors']})"
+        )
+
+if __name__ == "__main__":
+    main()
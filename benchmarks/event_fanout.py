@@ -0,0 +1,49 @@
+# Mede o custo do feed de eventos com muitos assinantes ociosos: memória por
+# assinante e tempo de fan-out de um evento (broadcast e filtrado por responsável).
+# Uso: python -m benchmarks.event_fanout --subscribers 10000 --events 200
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from src.controllers.event_broker import EventBroker
+
+def row(assigned_to):
+    return {"status": "pending", "priority": "medium", "due_date": None, "assigned_to": assigned_to}
+
+async def run(subscribers, events, assignees, broadcast_ratio):
+    broker = EventBroker()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subs = []
+    for i in range(subscribers):
+        # parte assina tudo, o resto filtra por um responsável
+        assigned_to = None if i < subscribers * broadcast_ratio else i % assignees
+        subs.append(broker.subscribe(assigned_to=assigned_to, max_queue=events + 1))
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(events):
+        broker.publish("task.updated", {"task_id": i}, [row(i % assignees)])
+    await asyncio.sleep(0)  # executa os fan-outs agendados
+    elapsed = time.perf_counter() - start
+    stats = broker.stats()
+    return per_subscriber, elapsed, stats
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--assignees", type=int, default=1000)
+    args = parser.parse_args()
+
+    for label, ratio in (("todos filtrados", 0.0), ("10% broadcast", 0.1), ("100% broadcast", 1.0)):
+        per_sub, elapsed, stats = asyncio.run(run(args.subscribers, args.events, args.assignees, ratio))
+        print(
+            f"{label:>16}: {per_sub:6.0f} B/assinante | {elapsed / args.events * 1000:7.3f} ms/evento | "
+            f"entregas={stats['delivered']}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Pico de memória de GET /tasks/ (ORM + TaskOut + lista JSON) vs. a exportação em streaming.
+# Uso: python -m benchmarks.export_memory --rows 200000
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, create_db_engine
+from src.models.user_model import User  # registra as tabelas no metadata
+from src.models.task_model import Task, TaskOut
+from src.controllers.task_controller import list_tasks_filtered, export_tasks
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed, first
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'export.db')}")
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(insert(Task), [
+                {"title": f"tarefa {i}", "description": "x" * 80, "status": "pending", "priority": "medium"}
+                for i in range(args.rows)
+            ])
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        def full_listing():
+            with Session() as db:
+                tasks = list_tasks_filtered(db)
+                body = json.dumps([TaskOut.model_validate(t).model_dump(mode="json") for t in tasks])
+                return len(body)
+
+        def streamed(fmt):
+            def run():
+                size, first_byte = 0, None
+                start = time.perf_counter()
+                for chunk in export_tasks(fmt, session_factory=Session):
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - start
+                    size += len(chunk)
+                return first_byte
+            return run
+
+        peak, elapsed, _ = measure(full_listing)
+        print(f"{'GET /tasks/':>16}: pico={peak:8.1f} MiB  tempo={elapsed:6.2f}s")
+        for fmt in ("ndjson", "csv"):
+            peak, elapsed, first_byte = measure(streamed(fmt))
+            print(f"{'export ' + fmt:>16}: pico={peak:8.1f} MiB  tempo={elapsed:6.2f}s  primeiro byte={first_byte * 1000:.1f}ms")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
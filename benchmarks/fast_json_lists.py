@@ -0,0 +1,79 @@
+# Tempo de montar o corpo de uma listagem grande: caminho padrão (ORM + validação de cada linha
+# pelo response_model + JSONResponse) vs. FAST_JSON (tuplas de colunas + serializador orjson).
+# Uso: python -m benchmarks.fast_json_lists --rows 5000
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import sessionmaker
+
+from src.database import create_db_engine, run_migrations
+from src.controllers import fast_json
+from src.controllers.fast_json import TASK_ROWS
+from src.controllers.task_controller import list_tasks_filtered
+from src.controllers.list_cache import list_cache
+from src.models.task_model import TaskExpandedOut
+
+def seed(engine, rows):
+    raw = engine.raw_connection()
+    try:
+        raw.cursor().executemany(
+            "INSERT INTO tasks (title, description, status, priority, due_date) VALUES (?, ?, ?, ?, ?)",
+            [
+                (f"Tarefa {i}", f"Descrição da tarefa {i}", "pending", ("low", "medium", "high")[i % 3],
+                 (date.today() + timedelta(days=i % 365)).isoformat())
+                for i in range(rows)
+            ],
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+def default_body(db, adapter):
+    # o que o FastAPI faz com response_model=List[TaskExpandedOut] e response_model_exclude_unset
+    items = list_tasks_filtered(db)
+    validated = adapter.validate_python(items, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validated, mode="json", exclude_unset=True)).body
+
+def fast_body(db):
+    return TASK_ROWS.dumps(list_tasks_filtered(db, rows=True))
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        list_cache.clear()
+        start = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], body
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run_migrations(url)
+        engine = create_db_engine(url)
+        seed(engine, args.rows)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        adapter = TypeAdapter(List[TaskExpandedOut])
+        with Session() as db:
+            default_ms, expected = timed(lambda: default_body(db, adapter), args.repeat)
+            fast_ms, body = timed(lambda: fast_body(db), args.repeat)
+        engine.dispose()
+    assert body == expected, "corpos diferentes"
+    encoder = "orjson" if fast_json.orjson is not None else "json (stdlib)"
+    print(f"{args.rows} linhas, {len(body) / 1024:.0f} KiB")
+    print(f"padrão (ORM + response_model): p50 {default_ms:.1f} ms")
+    print(f"FAST_JSON (tuplas + {encoder}): p50 {fast_ms:.1f} ms ({default_ms / fast_ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Teste de carga: requisições/s em GET /tasks/{id} e GET /tasks/ com N conexões concorrentes.
+# Rode o servidor em cada modo e compare:
+#   DB_MODE=sync  uvicorn src.main:app --port 8000
+#   DB_MODE=async uvicorn src.main:app --port 8000
+#   python -m benchmarks.load_test --url http://127.0.0.1:8000 --concurrency 500
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="root@root.com")
+    parser.add_argument("--password", default="root")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--path", default=None, help="rota a exercitar (padrão: tarefa recém-criada)")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        r = await client.post("/auth/login", json={"email": args.email, "password": args.password})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        path = args.path
+        if path is None:
+            task = await client.post("/tasks/", json={"title": "load"}, headers=headers)
+            path = f"/tasks/{task.json()['id']}"
+
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + args.duration
+
+        async def user():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    resp = await client.get(path, headers=headers)
+                    if resp.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"rota: {path}  conexões: {args.concurrency}")
+    print(f"requisições/s: {len(latencies) / elapsed:.0f}  erros: {errors}")
+    print(f"p50={statistics.median(latencies):.1f}ms p99={latencies[int(len(latencies) * 0.99) - 1]:.1f}ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+# Mede a latência de GET /tasks/{id} enquanto uma rajada de logins ocorre.
+# Uso: uvicorn src.main:app  (em outro terminal)
+#      python -m benchmarks.login_storm --url http://127.0.0.1:8000
+import argparse
+import statistics
+import threading
+import time
+import httpx
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--email", default="root@root.com")
+    parser.add_argument("--password", default="root")
+    parser.add_argument("--login-threads", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url) as client:
+        token = client.post("/auth/login", json={"email": args.email, "password": args.password}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        task_id = client.post("/tasks/", json={"title": "bench"}, headers=headers).json()["id"]
+
+        def read_latencies(seconds):
+            samples = []
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                start = time.perf_counter()
+                client.get(f"/tasks/{task_id}", headers=headers)
+                samples.append((time.perf_counter() - start) * 1000)
+            return samples
+
+        baseline = read_latencies(args.duration / 2)
+
+        stop = threading.Event()
+        codes = {}
+        def storm():
+            with httpx.Client(base_url=args.url, timeout=60) as c:
+                while not stop.is_set():
+                    try:
+                        r = c.post("/auth/login", json={"email": args.email, "password": args.password})
+                        key = r.status_code
+                    except httpx.HTTPError as exc:
+                        key = type(exc).__name__
+                    codes[key] = codes.get(key, 0) + 1
+        threads = [threading.Thread(target=storm) for _ in range(args.login_threads)]
+        for t in threads:
+            t.start()
+        under_storm = read_latencies(args.duration / 2)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    for label, samples in (("sem carga", baseline), ("durante logins", under_storm)):
+        print(f"{label:>15}: n={len(samples)} p50={statistics.median(samples):.1f}ms p99={percentile(samples, 0.99):.1f}ms")
+    print(f"respostas de login: {codes}")
+
+if __name__ == "__main__":
+    main()
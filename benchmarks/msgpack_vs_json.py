@@ -0,0 +1,87 @@
+# Tamanho do corpo e tempo de codificar/decodificar uma página de GET /tasks/ e de comentários:
+# JSON (caminho FAST_JSON) vs. MessagePack, ambos montados direto das tuplas de colunas.
+# Uso: python -m benchmarks.msgpack_vs_json --rows 1000
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from sqlalchemy.orm import sessionmaker
+
+from src.database import create_db_engine, run_migrations
+from src.controllers import fast_json
+from src.controllers.fast_json import TASK_ROWS, COMMENT_ROWS
+from src.controllers.msgpack_codec import msgpack, packb
+from src.controllers.task_controller import list_tasks_filtered
+from src.controllers.comment_controller import list_comments
+
+def seed(engine, rows):
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("INSERT INTO users (name, email, hashed_password, is_active) VALUES ('bench', 'bench@example.com', 'x', 1)")
+        cursor.executemany(
+            "INSERT INTO tasks (title, description, status, priority, due_date, assigned_to) VALUES (?, ?, ?, ?, ?, 1)",
+            [
+                (f"Tarefa {i}", f"Descrição da tarefa {i}", "pending", ("low", "medium", "high")[i % 3],
+                 (date.today() + timedelta(days=i % 365)).isoformat())
+                for i in range(rows)
+            ],
+        )
+        cursor.executemany(
+            "INSERT INTO comments (task_id, user_id, content, created_at) VALUES (1, 1, ?, CURRENT_TIMESTAMP)",
+            [(f"Comentário {i} sobre o andamento da tarefa",) for i in range(rows)],
+        )
+        raw.commit()
+    finally:
+        raw.close()
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], result
+
+def compare(name, serializer, items, repeat):
+    json_loads = fast_json.orjson.loads if fast_json.orjson is not None else json.loads
+    json_ms, json_body = timed(lambda: serializer.dumps(items), repeat)
+    pack_ms, pack_body = timed(lambda: packb(serializer.rows(items)), repeat)
+    json_decode_ms, decoded = timed(lambda: json_loads(json_body), repeat)
+    stdlib_decode_ms, _ = timed(lambda: json.loads(json_body), repeat)
+    pack_decode_ms, unpacked = timed(lambda: msgpack.unpackb(pack_body), repeat)
+    assert decoded == unpacked, "conteúdos diferentes"
+    print(f"\n{name}: {len(items)} itens")
+    print(f"{'formato':<12}{'bytes':>10}{'codificar ms':>14}{'decodificar ms':>16}")
+    print(f"{'JSON':<12}{len(json_body):>10}{json_ms:>14.2f}{json_decode_ms:>16.2f}")
+    print(f"{'  (json.loads da biblioteca padrão)':<36}{stdlib_decode_ms:>16.2f}")
+    print(f"{'MessagePack':<12}{len(pack_body):>10}{pack_ms:>14.2f}{pack_decode_ms:>16.2f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    if msgpack is None:
+        raise SystemExit("Instale o pacote msgpack para rodar este benchmark")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run_migrations(url)
+        engine = create_db_engine(url)
+        seed(engine, args.rows)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            tasks = list_tasks_filtered(db, limit=args.rows, rows=True)
+            comments = list_comments(1, db, limit=args.rows, rows=True)
+        engine.dispose()
+    encoder = "orjson" if fast_json.orjson is not None else "json (stdlib)"
+    print(f"JSON via {encoder}")
+    compare("GET /tasks/", TASK_ROWS, tasks, args.repeat)
+    compare("GET /tasks/{id}/comments", COMMENT_ROWS, comments, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from logging.config import fileConfig
+from alembic import context
+from src.database import Base, engine, create_db_engine
+# importa os models para registrar as tabelas no metadata
+from src.models import user_model, task_model, comment_model, stats_model, change_log_model, archive_model, version_model  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logging", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url") or str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    # conexão explícita (ex.: testes) > sqlalchemy.url > engine da aplicação
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    url = config.get_main_option("sqlalchemy.url")
+    db_engine = create_db_engine(url) if url else engine
+    with db_engine.connect() as conn:
+        _run(conn)
+
+def _run(connection):
+    # render_as_batch: SQLite só altera tabelas recriando-as
+    context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
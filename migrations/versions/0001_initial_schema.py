@@ -0,0 +1,57 @@
+"""Esquema inicial (users, tasks, comments)
+
+Bancos criados antes das migrações (via create_all) já têm essas tabelas;
+nesse caso a revisão apenas marca o esquema como versionado.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("name", sa.String, nullable=False),
+            sa.Column("email", sa.String),
+            sa.Column("hashed_password", sa.String, nullable=False),
+            sa.Column("is_active", sa.Boolean),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("title", sa.String, nullable=False),
+            sa.Column("description", sa.String),
+            sa.Column("status", sa.String),
+            sa.Column("priority", sa.String),
+            sa.Column("due_date", sa.Date),
+            sa.Column("assigned_to", sa.Integer, sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+    if "comments" not in existing:
+        op.create_table(
+            "comments",
+            sa.Column("id", sa.Integer, primary_key=True),
+            sa.Column("content", sa.String, nullable=False),
+            sa.Column("task_id", sa.Integer, sa.ForeignKey("tasks.id"), nullable=False),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime),
+        )
+        op.create_index("ix_comments_id", "comments", ["id"])
+
+def downgrade():
+    op.drop_table("comments")
+    op.drop_table("tasks")
+    op.drop_table("users")
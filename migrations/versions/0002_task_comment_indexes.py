@@ -0,0 +1,28 @@
+"""Índices compostos para os filtros de tarefas e listagem de comentários
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_tasks_due_date", "tasks", ["due_date"])
+    op.create_index("ix_tasks_assigned_to_due_date", "tasks", ["assigned_to", "due_date"])
+    op.create_index("ix_tasks_status_due_date", "tasks", ["status", "due_date"])
+    op.create_index("ix_tasks_priority_due_date", "tasks", ["priority", "due_date"])
+    op.create_index("ix_tasks_status_priority_due_date", "tasks", ["status", "priority", "due_date"])
+    op.create_index("ix_comments_task_id_created_at", "comments", ["task_id", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_comments_task_id_created_at", table_name="comments")
+    op.drop_index("ix_tasks_status_priority_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_priority_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_status_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_assigned_to_due_date", table_name="tasks")
+    op.drop_index("ix_tasks_due_date", table_name="tasks")
@@ -0,0 +1,32 @@
+"""Tabela de contadores de tarefas (GET /tasks/stats)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "task_counters",
+        sa.Column("dimension", sa.String, primary_key=True),
+        sa.Column("value", sa.String, primary_key=True),
+        sa.Column("count", sa.Integer, nullable=False),
+    )
+    # popula a partir das tarefas existentes
+    op.execute("INSERT INTO task_counters (dimension, value, count) SELECT 'total', '', COUNT(*) FROM tasks")
+    for dimension, column in (("status", "status"), ("priority", "priority"), ("assigned_to", "assigned_to")):
+        op.execute(
+            "INSERT INTO task_counters (dimension, value, count) "
+            f"SELECT '{dimension}', COALESCE(CAST({column} AS VARCHAR), 'none'), COUNT(*) "
+            f"FROM tasks GROUP BY {column}"
+        )
+
+def downgrade():
+    op.drop_table("task_counters")
@@ -0,0 +1,27 @@
+"""Coluna version em tasks e comments (ETags)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("tasks", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+    op.add_column("comments", sa.Column("version", sa.Integer, nullable=False, server_default="1"))
+    op.create_index("ix_tasks_version", "tasks", ["version"])
+    op.create_index("ix_comments_version", "comments", ["version"])
+
+def downgrade():
+    op.drop_index("ix_comments_version", table_name="comments")
+    op.drop_index("ix_tasks_version", table_name="tasks")
+    with op.batch_alter_table("comments") as batch:
+        batch.drop_column("version")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("version")
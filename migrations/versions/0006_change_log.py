@@ -0,0 +1,36 @@
+"""Log de alterações para sincronização incremental (GET /sync/changes)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "change_log",
+        sa.Column("seq", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String, nullable=False),
+        sa.Column("entity_id", sa.Integer, nullable=False),
+        sa.Column("op", sa.String, nullable=False),
+        sa.Column("changed_at", sa.DateTime, nullable=False),
+        sa.Column("payload", sa.Text),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_change_log_changed_at", "change_log", ["changed_at"])
+    op.create_table(
+        "sync_state",
+        sa.Column("key", sa.String, primary_key=True),
+        sa.Column("value", sa.Integer, nullable=False),
+    )
+
+def downgrade():
+    op.drop_table("sync_state")
+    op.drop_index("ix_change_log_changed_at", table_name="change_log")
+    op.drop_table("change_log")
@@ -0,0 +1,59 @@
+"""Arquivamento de tarefas concluídas (tasks_archive/comments_archive)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("tasks", sa.Column("completed_at", sa.DateTime, nullable=True))
+    # tarefas já concluídas contam a idade a partir da migração
+    op.execute("UPDATE tasks SET completed_at = CURRENT_TIMESTAMP WHERE status = 'done'")
+    op.create_index("ix_tasks_status_completed_at", "tasks", ["status", "completed_at"])
+
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column("title", sa.String, nullable=False),
+        sa.Column("description", sa.String),
+        sa.Column("status", sa.String),
+        sa.Column("priority", sa.String),
+        sa.Column("due_date", sa.Date, nullable=True),
+        sa.Column("assigned_to", sa.Integer),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("completed_at", sa.DateTime, nullable=True),
+        sa.Column("archived_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_tasks_archive_due_date", "tasks_archive", ["due_date"])
+    op.create_index("ix_tasks_archive_assigned_to_due_date", "tasks_archive", ["assigned_to", "due_date"])
+    op.create_index("ix_tasks_archive_version", "tasks_archive", ["version"])
+
+    op.create_table(
+        "comments_archive",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column("content", sa.String, nullable=False),
+        sa.Column("task_id", sa.Integer, nullable=False),
+        sa.Column("user_id", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("version", sa.Integer, nullable=False),
+        sa.Column("archived_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_comments_archive_task_id_created_at", "comments_archive", ["task_id", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_comments_archive_task_id_created_at", table_name="comments_archive")
+    op.drop_table("comments_archive")
+    op.drop_index("ix_tasks_archive_version", table_name="tasks_archive")
+    op.drop_index("ix_tasks_archive_assigned_to_due_date", table_name="tasks_archive")
+    op.drop_index("ix_tasks_archive_due_date", table_name="tasks_archive")
+    op.drop_table("tasks_archive")
+    op.drop_index("ix_tasks_status_completed_at", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("completed_at")
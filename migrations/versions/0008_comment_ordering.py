@@ -0,0 +1,34 @@
+"""Ordem estável dos comentários: índice (task_id, created_at, id) e backfill de created_at
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Até aqui created_at era fixado no início de cada processo: comentários antigos têm
+    # carimbos repetidos e fora da ordem de inserção. O id reflete a ordem real, então
+    # cada created_at vira o maior valor entre os comentários de id menor ou igual
+    # (não decrescente em id), preservando os carimbos já coerentes.
+    op.execute(
+        """
+        UPDATE comments SET created_at = ordered.fixed
+        FROM (
+            SELECT id, MAX(created_at) OVER (ORDER BY id ROWS UNBOUNDED PRECEDING) AS fixed
+            FROM comments
+        ) AS ordered
+        WHERE ordered.id = comments.id AND ordered.fixed <> comments.created_at
+        """
+    )
+    op.drop_index("ix_comments_task_id_created_at", table_name="comments")
+    op.create_index("ix_comments_task_id_created_at_id", "comments", ["task_id", "created_at", "id"])
+
+def downgrade():
+    op.drop_index("ix_comments_task_id_created_at_id", table_name="comments")
+    op.create_index("ix_comments_task_id_created_at", "comments", ["task_id", "created_at"])
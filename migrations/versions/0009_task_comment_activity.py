@@ -0,0 +1,36 @@
+"""comment_count/last_activity_at desnormalizados em tasks (e tasks_archive)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+BACKFILL = """
+UPDATE {tasks} SET
+    comment_count = (SELECT COUNT(*) FROM {comments} c WHERE c.task_id = {tasks}.id),
+    last_activity_at = (SELECT MAX(c.created_at) FROM {comments} c WHERE c.task_id = {tasks}.id)
+"""
+
+def upgrade():
+    for table, comments in (("tasks", "comments"), ("tasks_archive", "comments_archive")):
+        op.add_column(table, sa.Column("comment_count", sa.Integer, nullable=False, server_default="0"))
+        op.add_column(table, sa.Column("last_activity_at", sa.DateTime, nullable=True))
+        # cada subconsulta é uma busca no índice (task_id, created_at) dos comentários
+        op.execute(BACKFILL.format(tasks=table, comments=comments))
+    op.create_index("ix_tasks_last_activity_at", "tasks", ["last_activity_at"])
+    op.create_index("ix_tasks_comment_count", "tasks", ["comment_count"])
+
+def downgrade():
+    op.drop_index("ix_tasks_comment_count", table_name="tasks")
+    op.drop_index("ix_tasks_last_activity_at", table_name="tasks")
+    for table in ("tasks_archive", "tasks"):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("last_activity_at")
+            batch.drop_column("comment_count")
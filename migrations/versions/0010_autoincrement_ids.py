@@ -0,0 +1,76 @@
+"""AUTOINCREMENT em tasks/comments: ids nunca são reutilizados
+
+Sem AUTOINCREMENT o SQLite atribui MAX(id) + 1, então remover a linha de maior id
+(exclusão ou arquivamento) faz o próximo INSERT repetir um id que já pode existir em
+tasks_archive/comments_archive. As tabelas são recriadas com AUTOINCREMENT e a
+sqlite_sequence parte do maior id já usado, somando o arquivo. Em outros bancos as
+chaves já vêm de sequências, que não voltam atrás.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+# a recriação de tasks descarta os triggers da busca textual (0004)
+TASK_SEARCH_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+SEED_SEQUENCE = """
+INSERT INTO sqlite_sequence (name, seq)
+SELECT '{table}', MAX(id) FROM (SELECT id FROM {table} UNION ALL SELECT id FROM {archive})
+HAVING MAX(id) IS NOT NULL
+"""
+
+def _rebuild(autoincrement: bool):
+    # Bancos criados antes da validação de assigned_to podem ter responsáveis e comentários
+    # órfãos: com foreign_keys=ON a cópia das linhas para as tabelas recriadas falharia e a
+    # migração pararia em 0009. A recriação roda sem checagem de FK (o PRAGMA só tem efeito
+    # fora de transação, como o modo batch do Alembic espera) e os órfãos são reportados.
+    bind = op.get_bind()
+    enforced = bind.exec_driver_sql("PRAGMA foreign_keys").scalar()
+    bind.exec_driver_sql("PRAGMA foreign_keys=OFF")
+    if bind.exec_driver_sql("PRAGMA foreign_keys").scalar():
+        raise RuntimeError("PRAGMA foreign_keys=OFF ignorado: a migração 0010 precisa rodar fora de transação")
+    try:
+        # sem checagem de FK o DROP de tasks na recriação não esbarra nos comentários
+        for table in ("tasks", "comments"):
+            with op.batch_alter_table(table, recreate="always", table_kwargs={"sqlite_autoincrement": autoincrement}):
+                pass
+        for statement in TASK_SEARCH_TRIGGERS:
+            op.execute(statement)
+    finally:
+        bind.exec_driver_sql(f"PRAGMA foreign_keys={'ON' if enforced else 'OFF'}")
+    for table, rowid, parent, _ in bind.exec_driver_sql("PRAGMA foreign_key_check").all():
+        logger.warning("Linha órfã mantida: %s rowid=%s referencia %s inexistente", table, rowid, parent)
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild(autoincrement=True)
+    for table, archive in (("tasks", "tasks_archive"), ("comments", "comments_archive")):
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(SEED_SEQUENCE.format(table=table, archive=archive))
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _rebuild(autoincrement=False)
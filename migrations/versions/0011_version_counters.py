@@ -0,0 +1,36 @@
+"""Contadores de versão (version_counters) para os ETags
+
+MAX(version) + 1 voltava atrás quando a linha de maior versão era removida, e o
+ETag de uma representação antiga podia ser reaproveitado. Os contadores partem da
+maior versão já usada, somando o arquivo.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+SEED = """
+INSERT INTO version_counters (name, value)
+SELECT '{table}', COALESCE(MAX(version), 0) FROM (
+    SELECT version FROM {table} UNION ALL SELECT version FROM {archive}
+) AS versions
+"""
+
+def upgrade():
+    op.create_table(
+        "version_counters",
+        sa.Column("name", sa.String, primary_key=True),
+        sa.Column("value", sa.Integer, nullable=False),
+    )
+    for table, archive in (("tasks", "tasks_archive"), ("comments", "comments_archive")):
+        op.execute(SEED.format(table=table, archive=archive))
+
+def downgrade():
+    op.drop_table("version_counters")
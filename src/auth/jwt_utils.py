@@ -6,7 +6,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from src.models.user_model import User
-from src.controllers.utils import get_db
+from src.controllers.utils import get_route_db, run_db
+from src.auth.principal_cache import Principal, principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,20 +15,42 @@ SECRET_KEY = os.getenv("JWT_SECRET", "supersecret")
 ALGORITHM = "HS256"
 bearer_scheme = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db)
-):
+def _load_active_user(user_id: int, db: Session):
+    return db.query(User).filter(User.id == user_id, User.is_active == True).first()
+
+async def _authenticate(credentials: HTTPAuthorizationCredentials, db):
     logger.debug("Decodificando JWT token")
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = int(payload.get("sub"))
+        exp = payload.get("exp")
     except (jwt.PyJWTError, ValueError):
         logger.warning("Token inválido ou expirado")
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido ou expirado")
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    principal = principal_cache.get(user_id, exp)
+    if principal is not None:
+        logger.debug("Principal em cache para usuário ID=%d", user_id)
+        return principal
+    user = await run_db(db, _load_active_user, user_id)
     if not user:
         logger.warning("Token válido mas usuário não encontrado ou inativo: ID=%d", user_id)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuário não autenticado")
     logger.debug("Token válido para usuário ID=%d", user_id)
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(user_id, exp, principal)
+    return principal
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db=Depends(get_route_db)
+):
+    return await _authenticate(credentials, db)
+
+async def get_stream_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db=Depends(get_route_db, scope="function")
+):
+    # Rotas de streaming (SSE): a sessão da autenticação fecha quando a função da rota retorna,
+    # antes do corpo. Com o escopo da requisição cada assinante seguraria uma conexão do pool
+    # durante todo o stream.
+    return await _authenticate(credentials, db)
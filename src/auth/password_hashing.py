@@ -0,0 +1,114 @@
+import os
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from fastapi import HTTPException, status
+from passlib.hash import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Custo do bcrypt (log2 das iterações); hashes com custo diferente são refeitos no login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# "thread" (bcrypt libera o GIL) ou "process"
+PASSWORD_POOL_KIND = os.getenv("PASSWORD_POOL_KIND", "thread")
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", "4"))
+# Quantas operações podem aguardar na fila além das que estão executando
+PASSWORD_POOL_QUEUE_LIMIT = int(os.getenv("PASSWORD_POOL_QUEUE_LIMIT", "16"))
+PASSWORD_POOL_RETRY_AFTER = int(os.getenv("PASSWORD_POOL_RETRY_AFTER", "1"))
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_POOL_WORKERS + PASSWORD_POOL_QUEUE_LIMIT)
+_counters_lock = threading.Lock()
+_in_flight = 0
+_rejected = 0
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.using(rounds=rounds).hash(password)
+
+def _verify(password: str, hashed: str) -> bool:
+    return bcrypt.verify(password, hashed)
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if PASSWORD_POOL_KIND == "process":
+                    _executor = ProcessPoolExecutor(max_workers=PASSWORD_POOL_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=PASSWORD_POOL_WORKERS, thread_name_prefix="password"
+                    )
+                logger.info(
+                    "Pool de senhas iniciado: tipo=%s workers=%d fila=%d",
+                    PASSWORD_POOL_KIND, PASSWORD_POOL_WORKERS, PASSWORD_POOL_QUEUE_LIMIT
+                )
+    return _executor
+
+@contextmanager
+def _admitted():
+    global _in_flight, _rejected
+    # controle de admissão: pool saturado responde 503 em vez de enfileirar sem limite
+    if not _slots.acquire(blocking=False):
+        with _counters_lock:
+            _rejected += 1
+        logger.warning("Pool de senhas saturado, requisição rejeitada")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Serviço de autenticação sobrecarregado, tente novamente",
+            headers={"Retry-After": str(PASSWORD_POOL_RETRY_AFTER)},
+        )
+    with _counters_lock:
+        _in_flight += 1
+    try:
+        yield
+    finally:
+        with _counters_lock:
+            _in_flight -= 1
+        _slots.release()
+
+def _run(fn, *args):
+    # chamadores síncronos (scripts, seed, testes): bloqueia até o pool responder
+    with _admitted():
+        return _get_executor().submit(fn, *args).result()
+
+async def _run_async(fn, *args):
+    # rotas async: o event loop aguarda o future do pool, sem prender uma thread do threadpool
+    with _admitted():
+        return await asyncio.wrap_future(_get_executor().submit(fn, *args))
+
+def hash_password(password: str) -> str:
+    return _run(_hash, password, BCRYPT_ROUNDS)
+
+def verify_password(password: str, hashed: str) -> bool:
+    return _run(_verify, password, hashed)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_async(_hash, password, BCRYPT_ROUNDS)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run_async(_verify, password, hashed)
+
+def needs_rehash(hashed: str) -> bool:
+    return bcrypt.using(rounds=BCRYPT_ROUNDS).needs_update(hashed)
+
+def stats():
+    with _counters_lock:
+        return {
+            "kind": PASSWORD_POOL_KIND,
+            "workers": PASSWORD_POOL_WORKERS,
+            "queue_limit": PASSWORD_POOL_QUEUE_LIMIT,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "in_flight": _in_flight,
+            "rejected": _rejected,
+        }
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
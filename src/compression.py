@@ -0,0 +1,251 @@
+import os
+import time
+import zlib
+import logging
+import threading
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Codificações oferecidas, em ordem de preferência do servidor (vazio = compressão desligada);
+# br e zstd só entram se os pacotes brotli/zstandard estiverem instalados
+COMPRESSION_ENCODINGS = [
+    name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if name.strip()
+]
+# Corpos menores que isso saem sem compressão (o ganho não paga a CPU nem o cabeçalho)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# Níveis por codificação (escalas diferentes: gzip 1-9, brotli 0-11, zstd 1-22)
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BR_QUALITY = int(os.getenv("COMPRESSION_BR_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+# Respostas em streaming (/tasks/export): 1 comprime cada bloco com flush; o SSE nunca é comprimido
+COMPRESSION_STREAMING = os.getenv("COMPRESSION_STREAMING", "0") == "1"
+# Corpos acima disso são comprimidos no threadpool em vez de bloquear o event loop
+THREADPOOL_MIN_SIZE = 256 * 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/csv", "text/plain", "text/html")
+
+# Cada codificador devolve (compress, flush, finish): flush fecha um bloco decodificável
+# sem encerrar o fluxo (streaming); finish encerra
+def _gzip_encoder():
+    encoder = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 = formato gzip
+    return encoder.compress, lambda: encoder.flush(zlib.Z_SYNC_FLUSH), encoder.flush
+
+def _brotli_encoder():
+    encoder = brotli.Compressor(quality=COMPRESSION_BR_QUALITY)
+    return encoder.process, encoder.flush, encoder.finish
+
+def _zstd_encoder():
+    encoder = zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compressobj()
+    return encoder.compress, lambda: encoder.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), encoder.flush
+
+ENCODERS = {"gzip": _gzip_encoder}
+if brotli is not None:
+    ENCODERS["br"] = _brotli_encoder
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd_encoder
+
+def available_encodings(names=COMPRESSION_ENCODINGS):
+    missing = [name for name in names if name not in ENCODERS]
+    if missing:
+        logger.debug("Codificações indisponíveis (pacote não instalado): %s", ", ".join(missing))
+    return [name for name in names if name in ENCODERS]
+
+def negotiate(accept_encoding: Optional[str], encodings) -> Optional[str]:
+    # maior q aceito pelo cliente; empates seguem a ordem de preferência do servidor
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[token.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for name in encodings:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+def compress(encoding: str, body: bytes):
+    # devolve (corpo comprimido, segundos de CPU da thread que comprimiu)
+    started = time.thread_time()
+    encode, _, finish = ENCODERS[encoding]()
+    data = encode(body) + finish()
+    return data, time.thread_time() - started
+
+def _compressible(headers: Headers) -> bool:
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES or media_type.endswith("+json")
+
+class CompressionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._encodings = {}  # codificação -> respostas, bytes e CPU
+        self._skipped = {}    # motivo -> respostas enviadas sem compressão
+
+    def clear(self):
+        with self._lock:
+            self._encodings.clear()
+            self._skipped.clear()
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float):
+        with self._lock:
+            entry = self._encodings.setdefault(
+                encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+            )
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["cpu_seconds"] += cpu_seconds
+
+    def skip(self, reason: str):
+        with self._lock:
+            self._skipped[reason] = self._skipped.get(reason, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            encodings = {name: dict(entry) for name, entry in self._encodings.items()}
+            skipped = dict(self._skipped)
+        bytes_in = sum(entry["bytes_in"] for entry in encodings.values())
+        bytes_out = sum(entry["bytes_out"] for entry in encodings.values())
+        return {
+            "encodings": available_encodings(),
+            "min_size": COMPRESSION_MIN_SIZE,
+            "streaming": COMPRESSION_STREAMING,
+            "compressed": encodings,
+            "skipped": skipped,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "bytes_saved": bytes_in - bytes_out,
+            "ratio": round(bytes_out / bytes_in, 4) if bytes_in else 0.0,
+            "cpu_seconds": sum(entry["cpu_seconds"] for entry in encodings.values()),
+        }
+
+compression_stats = CompressionStats()
+
+# Middleware ASGI: negocia a codificação pelo Accept-Encoding e comprime o corpo da resposta.
+# Respostas pequenas, já codificadas, de tipos não compressíveis ou em streaming
+# (salvo COMPRESSION_STREAMING=1) passam intactas; cada decisão é contada em compression_stats.
+class CompressionMiddleware:
+    def __init__(self, app, encodings=None, minimum_size: int = COMPRESSION_MIN_SIZE,
+                 streaming: bool = COMPRESSION_STREAMING, stats: CompressionStats = compression_stats):
+        self.app = app
+        self.encodings = available_encodings() if encodings is None else available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.streaming = streaming
+        self.stats = stats
+        logger.info("Compressão de respostas: %s", ", ".join(self.encodings) or "desligada")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+class _CompressingSend:
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start = None
+        self.passthrough = False
+        self.stream = None  # (compress, flush, finish) de uma resposta em streaming
+        self.bytes_in = self.bytes_out = 0
+        self.cpu_seconds = 0.0
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            # o início só é enviado quando o primeiro bloco do corpo decide a codificação
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        if self.stream is not None:
+            await self._stream_chunk(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        reason = self._skip_reason(headers, body, more_body)
+        if reason is not None:
+            if reason not in ("encoded", "content_type"):
+                headers.add_vary_header("Accept-Encoding")
+            self.middleware.stats.skip(reason)
+            self.passthrough = True
+            await self.send(self.start)
+            await self.send(message)
+            return
+
+        self._set_encoding_headers(headers)
+        if more_body:
+            del headers["content-length"]
+            self.stream = ENCODERS[self.encoding]()
+            await self.send(self.start)
+            await self._stream_chunk(message)
+            return
+        if len(body) >= THREADPOOL_MIN_SIZE:
+            data, cpu_seconds = await run_in_threadpool(compress, self.encoding, body)
+        else:
+            data, cpu_seconds = compress(self.encoding, body)
+        self.middleware.stats.record(self.encoding, len(body), len(data), cpu_seconds)
+        headers["content-length"] = str(len(data))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data})
+
+    def _skip_reason(self, headers: MutableHeaders, body: bytes, more_body: bool) -> Optional[str]:
+        if "content-encoding" in headers:
+            return "encoded"
+        if not _compressible(headers):
+            return "content_type"
+        if self.encoding is None:
+            return "not_accepted"
+        if more_body:
+            return None if self.middleware.streaming else "streaming"
+        if len(body) < self.middleware.minimum_size:
+            return "too_small"
+        return None
+
+    def _set_encoding_headers(self, headers: MutableHeaders):
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # a representação comprimida não é idêntica byte a byte: ETag forte vira fraco
+        # (If-None-Match usa comparação fraca, então o 304 continua funcionando)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+
+    async def _stream_chunk(self, message):
+        encode, flush, finish = self.stream
+        more_body = message.get("more_body", False)
+        body = message.get("body", b"")
+        started = time.thread_time()
+        data = encode(body) + (flush() if more_body else finish())
+        self.cpu_seconds += time.thread_time() - started
+        self.bytes_in += len(body)
+        self.bytes_out += len(data)
+        if not more_body:
+            self.middleware.stats.record(self.encoding, self.bytes_in, self.bytes_out, self.cpu_seconds)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
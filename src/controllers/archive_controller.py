@@ -0,0 +1,138 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, UTC
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func, delete, insert
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.task_model import Task
+from src.models.comment_model import Comment
+from src.models.archive_model import ArchivedTask, ArchivedComment
+from src.controllers.list_cache import list_cache, task_filter_fields
+
+logger = logging.getLogger(__name__)
+
+# Tarefas concluídas há mais que isso vão para tasks_archive
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+# Tarefas movidas por transação: cada lote segura o lock de escrita por pouco tempo
+ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "500"))
+# Pausa entre lotes, para as escritas da API entrarem entre um lote e outro
+ARCHIVE_CHUNK_PAUSE_SECONDS = float(os.getenv("ARCHIVE_CHUNK_PAUSE_SECONDS", "0.05"))
+# Execução periódica dentro da aplicação (0 = só via python -m src.manage archive-tasks)
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "0"))
+
+TASK_COLUMNS = [c.name for c in ArchivedTask.__table__.c if c.name != "archived_at"]
+COMMENT_COLUMNS = [c.name for c in ArchivedComment.__table__.c if c.name != "archived_at"]
+
+_last_run = {}
+_last_run_lock = threading.Lock()
+
+def _now():
+    return datetime.now(UTC).replace(tzinfo=None)
+
+def _archivable(cutoff: datetime):
+    # Tarefas concluídas antes do corte. Ids (AUTOINCREMENT) e versões (version_counters)
+    # nunca são reutilizados, então qualquer uma pode sair da tabela quente
+    return Task.status == "done", Task.completed_at < cutoff
+
+def _candidates(db: Session, cutoff: datetime, limit: int):
+    # FOR UPDATE (Postgres) trava o lote até o commit; o SQLite ignora a cláusula e
+    # serializa as escritas a partir do primeiro DELETE
+    query = select(Task.id).where(*_archivable(cutoff)).limit(limit).with_for_update(skip_locked=True)
+    return db.execute(query).scalars().all()
+
+def archive_chunk(db: Session, cutoff: datetime, chunk_size: int = ARCHIVE_CHUNK_SIZE):
+    # Move um lote (tarefas + comentários) numa transação curta; devolve (tarefas, comentários).
+    # A leitura dos candidatos é só um palpite: os DELETEs repetem o filtro e o que vai para o
+    # arquivo é o que eles devolvem (RETURNING), então uma tarefa reaberta ou alterada entre a
+    # leitura e a movimentação continua na tabela quente
+    ids = _candidates(db, cutoff, chunk_size)
+    if not ids:
+        return 0, 0
+    archivable = (Task.id.in_(ids), *_archivable(cutoff))
+    archived_at = _now()
+    comments = db.execute(
+        delete(Comment)
+        .where(Comment.task_id.in_(select(Task.id).where(*archivable)))
+        .returning(*(Comment.__table__.c[name] for name in COMMENT_COLUMNS))
+    ).mappings().all()
+    tasks = db.execute(
+        delete(Task).where(*archivable).returning(*(Task.__table__.c[name] for name in TASK_COLUMNS))
+    ).mappings().all()
+    if not tasks:
+        db.rollback()
+        return 0, 0
+    db.execute(insert(ArchivedTask), [{**row, "archived_at": archived_at} for row in tasks])
+    if comments:
+        db.execute(insert(ArchivedComment), [{**row, "archived_at": archived_at} for row in comments])
+    db.commit()
+    # as tarefas saem das listagens quentes; contadores de /tasks/stats e o log de sync
+    # não mudam (a tarefa continua existindo, só mudou de tabela)
+    list_cache.invalidate_rows([task_filter_fields(dict(row)) for row in tasks])
+    return len(tasks), len(comments)
+
+def hot_table_size(db: Session) -> int:
+    return db.execute(select(func.count()).select_from(Task)).scalar_one()
+
+def archive_done_tasks(
+    db: Session,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    pause: float = ARCHIVE_CHUNK_PAUSE_SECONDS,
+    max_chunks: Optional[int] = None,
+):
+    logger.info("archive_done_tasks called (older_than_days=%s, chunk_size=%s)", older_than_days, chunk_size)
+    cutoff = _now() - timedelta(days=older_than_days)
+    started = time.perf_counter()
+    summary = {"hot_tasks_before": hot_table_size(db), "archived_tasks": 0, "archived_comments": 0, "chunks": 0}
+    while max_chunks is None or summary["chunks"] < max_chunks:
+        tasks, comments = archive_chunk(db, cutoff, chunk_size)
+        if not tasks:
+            break
+        summary["archived_tasks"] += tasks
+        summary["archived_comments"] += comments
+        summary["chunks"] += 1
+        logger.debug("Lote arquivado: %d tarefas, %d comentários", tasks, comments)
+        if pause > 0:
+            time.sleep(pause)
+    summary["hot_tasks_after"] = hot_table_size(db)
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["finished_at"] = _now()
+    with _last_run_lock:
+        _last_run.clear()
+        _last_run.update(summary)
+    logger.info(
+        "Arquivamento concluído: %d tarefas e %d comentários em %d lotes (tabela quente: %d -> %d)",
+        summary["archived_tasks"], summary["archived_comments"], summary["chunks"],
+        summary["hot_tasks_before"], summary["hot_tasks_after"],
+    )
+    return summary
+
+def archive_stats(db: Session):
+    with _last_run_lock:
+        last_run = dict(_last_run) or None
+    return {
+        "hot_tasks": hot_table_size(db),
+        "archived_tasks": db.execute(select(func.count()).select_from(ArchivedTask)).scalar_one(),
+        "archive_after_days": ARCHIVE_AFTER_DAYS,
+        "chunk_size": ARCHIVE_CHUNK_SIZE,
+        "last_run": last_run,
+    }
+
+def _archive_once():
+    with SessionLocal() as db:
+        return archive_done_tasks(db)
+
+async def run_archiver(interval: float = ARCHIVE_INTERVAL_SECONDS):
+    # laço do event loop: o arquivamento roda no threadpool, um lote por transação
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_archive_once)
+        except Exception:
+            logger.exception("Falha no arquivamento periódico de tarefas")
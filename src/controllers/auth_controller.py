@@ -3,10 +3,13 @@ import logging
 from datetime import datetime, timedelta, UTC
 import jwt
 from fastapi import HTTPException, status, Depends
-from passlib.hash import bcrypt
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from src.models.user_model import UserLogin, User
-from src.controllers.utils import get_db  # dependency para a sessão
+from src.controllers.utils import get_db, run_db  # dependency para a sessão
+from src.auth.password_hashing import (
+    hash_password, verify_password, hash_password_async, verify_password_async, needs_rehash,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,26 +17,65 @@ SECRET_KEY = os.getenv("JWT_SECRET", "supersecret")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 2
 
+def _find_user(email: str, db: Session):
+    # busca o usuário pelo email
+    return db.query(User).filter(User.email == email).first()
+
+def _invalid_credentials(email: str):
+    logger.warning("Falha de autenticação para email=%s", email)
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Credenciais inválidas"
+    )
+
+def _save_rehash(user_id: int, hashed: str, db: Session):
+    db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed))
+    db.commit()
+    logger.info("Hash de senha atualizado para o custo atual: user_id=%s", user_id)
+
+def _issue_token(user_id: int):
+    # gera payload e token
+    expire = datetime.now(UTC) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
+    payload = {"sub": str(user_id), "exp": expire}
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    return {"access_token": token, "token_type": "bearer"}
+
 def login_user(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
+    # versão síncrona (scripts, planos de consulta); a rota usa login_user_async
     logger.info("Login attempt for email=%s", credentials.email)
-    # busca o usuário pelo email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = _find_user(credentials.email, db)
     # compara senha em texto plano vs hash do banco
-    if not user or not bcrypt.verify(credentials.password, user.hashed_password):
-        logger.warning("Falha de autenticação para email=%s", credentials.email)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Credenciais inválidas"
-        )
+    if not user or not verify_password(credentials.password, user.hashed_password):
+        raise _invalid_credentials(credentials.email)
     logger.info("Autenticação bem-sucedida para user_id=%s", user.id)
-    # gera payload e token
-    expire = datetime.now(UTC) + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
-    payload = {"sub": str(user.id), "exp": expire}
-    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    return {"access_token": token, "token_type": "bearer"}
+    # refaz o hash quando o custo do bcrypt configurado mudou
+    if needs_rehash(user.hashed_password):
+        try:
+            _save_rehash(user.id, hash_password(credentials.password), db)
+        except HTTPException:
+            # pool saturado: o login já foi validado, tenta de novo no próximo
+            logger.warning("Rehash adiado por saturação do pool: user_id=%s", user.id)
+    return _issue_token(user.id)
+
+async def login_user_async(credentials: UserLogin, db):
+    # mesmo fluxo de login_user, com o bcrypt aguardado pelo event loop (pool de senhas)
+    # e as consultas via run_db (threadpool ou AsyncSession)
+    logger.info("Login attempt for email=%s", credentials.email)
+    user = await run_db(db, _find_user, credentials.email)
+    if not user or not await verify_password_async(credentials.password, user.hashed_password):
+        raise _invalid_credentials(credentials.email)
+    logger.info("Autenticação bem-sucedida para user_id=%s", user.id)
+    if needs_rehash(user.hashed_password):
+        try:
+            hashed = await hash_password_async(credentials.password)
+        except HTTPException:
+            logger.warning("Rehash adiado por saturação do pool: user_id=%s", user.id)
+        else:
+            await run_db(db, _save_rehash, user.id, hashed)
+    return _issue_token(user.id)
 
 def logout_user():
     logger.info("Logout called")
@@ -1,43 +1,170 @@
 import logging
+from datetime import datetime, UTC
+from typing import Optional
 from fastapi import HTTPException, status, Depends
+from sqlalchemy import select, func, case, insert, update, delete
 from sqlalchemy.orm import Session
-from src.models.comment_model import Comment, CommentCreate
+from src.models.comment_model import Comment, CommentCreate, CommentOut
 from src.models.task_model import Task
 from src.controllers.utils import get_db
+from src.controllers.pagination import paginate, encode_cursor, cursor_key
+from src.controllers.etag import next_version, list_etag
+from src.controllers.list_cache import list_cache, task_filter_fields
+from src.controllers.event_broker import event_broker
+from src.controllers.sync_controller import record_change, record_changes, comment_payload, task_payload
+from src.controllers.due_scheduler import due_scheduler
+from src.controllers.fast_json import COMMENT_ROWS
 
 logger = logging.getLogger(__name__)
 
+# Escritas devolvem as linhas gravadas via RETURNING (sem SELECT/refresh depois do commit)
+COMMENT_COLUMNS = tuple(Comment.__table__.c)
+TASK_COLUMNS = tuple(Task.__table__.c)
+
+def _latest_comment_at(task_id):
+    # busca no índice (task_id, created_at, id): O(log n)
+    return select(func.max(Comment.created_at)).where(Comment.task_id == task_id).scalar_subquery()
+
+def _touch_task(db: Session, task_id: int, delta: int, last_activity_at):
+    # atualiza comment_count/last_activity_at e a versão da tarefa na transação do comentário:
+    # os campos aparecem em TaskOut, então ETags, cache de listagens e sync precisam ver a mudança.
+    # UPDATE ... RETURNING: None se a tarefa não existe.
+    return db.execute(
+        update(Task).where(Task.id == task_id)
+        .values(comment_count=Task.comment_count + delta, last_activity_at=last_activity_at, version=next_version(db, Task))
+        .returning(*TASK_COLUMNS).execution_options(synchronize_session=False)
+    ).one_or_none()
+
+def _after_task_touched(task):
+    list_cache.invalidate_rows([task_filter_fields(task)])
+    due_scheduler.track(task)
+
 def create_comment(task_id: int, user_id: int, comment_data: CommentCreate, db: Session = Depends(get_db)):
     logger.info("Criando comentário na tarefa ID=%d por usuário ID=%d", task_id, user_id)
-    if not db.query(Task).filter(Task.id == task_id).first():
+    now = datetime.now(UTC)
+    # o UPDATE da tarefa substitui a verificação de existência: nenhuma linha = 404
+    task = _touch_task(db, task_id, 1, case((Task.last_activity_at > now, Task.last_activity_at), else_=now))
+    if task is None:
+        db.rollback()
         logger.warning("Tarefa não encontrada para comentário ID=%d", task_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
-    comment = Comment(content=comment_data.content, task_id=task_id, user_id=user_id)
-    db.add(comment)
+    comment = db.execute(
+        insert(Comment).values(
+            content=comment_data.content, task_id=task_id, user_id=user_id, created_at=now, version=next_version(db, Comment)
+        ).returning(*COMMENT_COLUMNS)
+    ).one()
+    record_change(db, "comment", comment.id, comment_payload(comment))
+    record_change(db, "task", task.id, task_payload(task))
     db.commit()
     logger.info("Comentário criado ID=%d na tarefa ID=%d", comment.id, task_id)
-    db.refresh(comment)
+    _after_task_touched(task)
+    if event_broker.subscribers:
+        event_broker.publish(
+            "comment.created",
+            {"task_id": task_id, "comment": CommentOut.model_validate(comment).model_dump(mode="json")},
+            [task_filter_fields(task)],
+        )
     return comment
 
-def list_comments(task_id: int, db: Session = Depends(get_db)):
-    logger.info("Listando comentários para tarefa ID=%d", task_id)
+def before_cursor(task_id: int, db: Session, before: Optional[int] = None, cursor: Optional[str] = None):
+    # `before` (ID de um comentário da tarefa) vira o cursor keyset equivalente:
+    # a página começa logo após ele na ordem (created_at desc, id desc)
+    if before is None:
+        return cursor
+    if cursor:
+        logger.warning("Parâmetros before e cursor usados juntos na tarefa ID=%d", task_id)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use before ou cursor, não ambos")
+    anchor = db.query(Comment.created_at).filter(Comment.id == before, Comment.task_id == task_id).first()
+    if anchor is None:
+        logger.warning("Comentário de referência ID=%d não encontrado na tarefa ID=%d", before, task_id)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Comentário de referência (before) não encontrado")
+    return encode_cursor(cursor_key(Comment.created_at), anchor.created_at, before)
+
+def list_comments(task_id: int, db: Session = Depends(get_db), limit: Optional[int] = None,
+                  cursor: Optional[str] = None, before: Optional[int] = None, rows: bool = False):
+    logger.info("Listando comentários para tarefa ID=%d (limit=%s, before=%s)", task_id, limit, before)
     if not db.query(Task).filter(Task.id == task_id).first():
         logger.warning("Tarefa não encontrada para listagem de comentários ID=%d", task_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
-    comments = db.query(Comment).filter(Comment.task_id == task_id).order_by(Comment.created_at.desc()).all()
+    cursor = before_cursor(task_id, db, before, cursor)
+    # rows=True: tuplas com as colunas de CommentOut (caminho FAST_JSON)
+    query = db.query(*COMMENT_ROWS.columns(Comment)) if rows else db.query(Comment)
+    query = query.filter(Comment.task_id == task_id)
+    if limit is not None:
+        # percorre ix_comments_task_id_created_at_id de trás para frente: O(página)
+        comments = paginate(query, Comment.created_at, Comment.id, limit, cursor, descending=True)
+    else:
+        comments = query.order_by(Comment.created_at.desc(), Comment.id.desc()).all()
     logger.debug("Total de comentários retornados: %d", len(comments))
     return comments
 
+def comments_etag(task_id: int, db: Session, limit: Optional[int] = None, cursor: Optional[str] = None,
+                  before: Optional[int] = None):
+    # ETag fraco da listagem de comentários, sem carregá-los
+    if not db.query(Task).filter(Task.id == task_id).first():
+        logger.warning("Tarefa não encontrada para listagem de comentários ID=%d", task_id)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tarefa não encontrada")
+    query = db.query(Comment).filter(Comment.task_id == task_id)
+    return list_etag(query, Comment.version, task_id, limit, cursor, before)
+
 def delete_comment(comment_id: int, user_id: int, db: Session = Depends(get_db)):
     logger.info("Removendo comentário ID=%d por usuário ID=%d", comment_id, user_id)
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
-    if not comment:
-        logger.warning("Comentário não encontrado: ID=%d", comment_id)
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comentário não encontrado")
-    if comment.user_id != user_id:
+    # a autoria entra no WHERE; só quando nada é removido uma consulta distingue 404 de 403
+    task_id = db.execute(
+        delete(Comment).where(Comment.id == comment_id, Comment.user_id == user_id)
+        .returning(Comment.task_id).execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if task_id is None:
+        db.rollback()
+        if db.execute(select(Comment.id).where(Comment.id == comment_id)).first() is None:
+            logger.warning("Comentário não encontrado: ID=%d", comment_id)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comentário não encontrado")
         logger.warning("Permissão negada para deleção de comentário ID=%d pelo usuário ID=%d", comment_id, user_id)
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Permissão negada")
-    db.delete(comment)
+    record_change(db, "comment", comment_id, None)
+    task = _touch_task(db, task_id, -1, _latest_comment_at(task_id))
+    if task is not None:
+        record_change(db, "task", task.id, task_payload(task))
     db.commit()
     logger.info("Comentário removido com sucesso ID=%d", comment_id)
+    if task is not None:
+        _after_task_touched(task)
+    if event_broker.subscribers:
+        # filtros dos assinantes se aplicam à tarefa do comentário
+        event_broker.publish(
+            "comment.deleted",
+            {"task_id": task_id, "comment_id": comment_id},
+            [task_filter_fields(task)] if task is not None else [],
+        )
     return {"message": "Comentário removido com sucesso"}
+
+def reconcile_comment_activity(db: Session, apply: bool = True):
+    # Recalcula comment_count/last_activity_at a partir de comments; devolve a divergência
+    # como [(task_id, contagem armazenada, real, última atividade armazenada, real)]
+    # e, se apply, corrige as tarefas divergentes (com nova versão e entrada no log de sync).
+    logger.info("reconcile_comment_activity called (apply=%s)", apply)
+    actual = (
+        select(Comment.task_id, func.count().label("count"), func.max(Comment.created_at).label("last"))
+        .group_by(Comment.task_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Task.id, Task.comment_count, func.coalesce(actual.c.count, 0), Task.last_activity_at, actual.c.last)
+        .outerjoin(actual, actual.c.task_id == Task.id)
+        .order_by(Task.id)
+    ).all()
+    drift = [tuple(row) for row in rows if row[1] != row[2] or row[3] != row[4]]
+    if drift:
+        logger.warning("Divergência em comment_count/last_activity_at: %d tarefas", len(drift))
+    if apply and drift:
+        tasks = db.query(Task).filter(Task.id.in_([row[0] for row in drift])).all()
+        fixes = {row[0]: row for row in drift}
+        for task in tasks:
+            task.comment_count = fixes[task.id][2]
+            task.last_activity_at = fixes[task.id][4]
+            task.version = next_version(db, Task)
+        db.flush()
+        record_changes(db, "task", ((task.id, task_payload(task)) for task in tasks))
+        db.commit()
+        list_cache.invalidate_rows([task_filter_fields(task) for task in tasks])
+    return drift
@@ -0,0 +1,193 @@
+import os
+import heapq
+import asyncio
+import logging
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database import SessionLocal
+from src.models.task_model import Task, TaskOut
+from src.controllers.list_cache import task_filter_fields
+from src.controllers.event_broker import event_broker
+
+logger = logging.getLogger(__name__)
+
+# Janela de "vence em breve" (GET /tasks/due-soon e lembrete task.due_soon)
+DUE_SOON_HOURS = float(os.getenv("DUE_SOON_HOURS", "24"))
+# Intervalo máximo entre verificações dos lembretes
+DUE_SCHEDULER_TICK_SECONDS = float(os.getenv("DUE_SCHEDULER_TICK_SECONDS", "60"))
+LOAD_BATCH_SIZE = 1000
+
+def deadline(due_date: date) -> datetime:
+    # a tarefa vence ao fim do dia de due_date (hora local, como os filtros por data)
+    return datetime.combine(due_date + timedelta(days=1), time.min)
+
+def _is_open(task: TaskOut) -> bool:
+    return task.due_date is not None and task.status != "done"
+
+# Agenda em memória das tarefas abertas com data limite:
+# - _order: lista ordenada de (due_date, id) que atende /overdue e /due-soon por bisect
+# - _timers: min-heap de (disparo, id, geração, tipo) dos lembretes; cada tick só
+#   desempilha o que venceu, então o custo não cresce com o total de tarefas.
+# Entradas do heap de uma tarefa alterada/removida ficam obsoletas (geração antiga)
+# e são descartadas ao sair do heap.
+class DueScheduler:
+    def __init__(self, due_soon_hours: float = DUE_SOON_HOURS):
+        self.due_soon_window = timedelta(hours=due_soon_hours)
+        self._tasks = {}      # id -> (TaskOut, geração)
+        self._order = []      # [(due_date, id)] ordenada
+        self._timers = []     # heap [(disparo, id, geração, tipo)]
+        self._generation = 0
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self.fired = 0
+        self.stale_timers = 0
+
+    def add_callback(self, callback):
+        # callback(kind, task): kind é "due_soon" ou "overdue"
+        self._callbacks.append(callback)
+
+    def track(self, task, now: Optional[datetime] = None):
+        # registra (ou atualiza) uma tarefa após a escrita; concluídas/sem data saem da agenda
+        snapshot = TaskOut.model_validate(task)
+        now = now or datetime.now()
+        with self._lock:
+            self._remove(snapshot.id)
+            if not _is_open(snapshot):
+                return
+            self._generation += 1
+            self._tasks[snapshot.id] = (snapshot, self._generation)
+            insort(self._order, (snapshot.due_date, snapshot.id))
+            # só lembretes futuros: recarregar a agenda não repete avisos já vencidos
+            due_at = deadline(snapshot.due_date)
+            for kind, fire_at in (("due_soon", due_at - self.due_soon_window), ("overdue", due_at)):
+                if fire_at > now:
+                    heapq.heappush(self._timers, (fire_at, snapshot.id, self._generation, kind))
+            self._compact_timers()
+
+    def untrack(self, task_id: int):
+        with self._lock:
+            self._remove(task_id)
+
+    def _remove(self, task_id: int):
+        entry = self._tasks.pop(task_id, None)
+        if entry is None:
+            return
+        key = (entry[0].due_date, task_id)
+        index = bisect_left(self._order, key)
+        if index < len(self._order) and self._order[index] == key:
+            del self._order[index]
+
+    def _compact_timers(self):
+        # muitas entradas obsoletas (tarefas reescritas): reconstrói o heap, custo amortizado nas escritas
+        if len(self._timers) > 4 * len(self._tasks) + 64:
+            live = [t for t in self._timers if self._tasks.get(t[1], (None, None))[1] == t[2]]
+            self.stale_timers += len(self._timers) - len(live)
+            heapq.heapify(live)
+            self._timers = live
+
+    def load(self, db: Session, now: Optional[datetime] = None) -> int:
+        # carga inicial: tarefas abertas com data limite, lidas em lotes pelo índice de due_date
+        logger.info("Carregando agenda de vencimentos")
+        self.clear()
+        query = (
+            select(Task)
+            .where(Task.due_date.isnot(None), Task.status != "done")
+            .order_by(Task.due_date, Task.id)  # insort vira append: carga O(n log n)
+            .execution_options(yield_per=LOAD_BATCH_SIZE)
+        )
+        total = 0
+        for task in db.execute(query).scalars():
+            self.track(task, now)
+            total += 1
+        logger.info("Agenda de vencimentos carregada: %d tarefas abertas", total)
+        return total
+
+    def tick(self, now: Optional[datetime] = None) -> int:
+        # dispara os lembretes vencidos; O(k log n) para k lembretes, independente do total
+        now = now or datetime.now()
+        ready = []
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                _, task_id, generation, kind = heapq.heappop(self._timers)
+                entry = self._tasks.get(task_id)
+                if entry is None or entry[1] != generation:
+                    self.stale_timers += 1
+                    continue
+                ready.append((kind, entry[0]))
+            self.fired += len(ready)
+        for kind, task in ready:
+            for callback in self._callbacks:
+                try:
+                    callback(kind, task)
+                except Exception:
+                    logger.exception("Falha no lembrete %s da tarefa %s", kind, task.id)
+        return len(ready)
+
+    def next_fire_at(self) -> Optional[datetime]:
+        with self._lock:
+            return self._timers[0][0] if self._timers else None
+
+    def overdue(self, limit: Optional[int] = None, now: Optional[datetime] = None):
+        # vencidas: due_date anterior a hoje, das mais antigas para as mais recentes
+        today = (now or datetime.now()).date()
+        with self._lock:
+            end = bisect_left(self._order, (today,))
+            if limit is not None:
+                end = min(end, limit)
+            return [self._tasks[task_id][0] for _, task_id in self._order[:end]]
+
+    def due_soon(self, hours: Optional[float] = None, limit: Optional[int] = None,
+                 now: Optional[datetime] = None):
+        # ainda não vencidas cujo prazo (fim do dia) cai nas próximas `hours` horas
+        now = now or datetime.now()
+        window = self.due_soon_window if hours is None else timedelta(hours=hours)
+        with self._lock:
+            start = bisect_left(self._order, (now.date(),))
+            end = bisect_left(self._order, ((now + window).date(),))
+            if limit is not None:
+                end = min(end, start + limit)
+            return [self._tasks[task_id][0] for _, task_id in self._order[start:end]]
+
+    async def run(self, interval: float = DUE_SCHEDULER_TICK_SECONDS):
+        # laço do event loop: acorda no próximo lembrete ou a cada `interval` segundos
+        while True:
+            self.tick()
+            next_at = self.next_fire_at()
+            delay = interval if next_at is None else (next_at - datetime.now()).total_seconds()
+            await asyncio.sleep(min(interval, max(delay, 0.01)))
+
+    def clear(self):
+        with self._lock:
+            self._tasks.clear()
+            self._order.clear()
+            self._timers.clear()
+            self.fired = self.stale_timers = 0
+
+    def stats(self):
+        with self._lock:
+            next_at = self._timers[0][0] if self._timers else None
+            return {
+                "tracked": len(self._tasks),
+                "timers": len(self._timers),
+                "fired": self.fired,
+                "stale_timers": self.stale_timers,
+                "next_fire_at": next_at,
+                "due_soon_hours": self.due_soon_window.total_seconds() / 3600,
+            }
+
+def publish_reminder(kind: str, task: TaskOut):
+    # lembrete padrão: log + evento task.due_soon/task.overdue no feed SSE
+    logger.info("Lembrete %s: tarefa %s (vence em %s)", kind, task.id, task.due_date)
+    event_broker.publish(f"task.{kind}", task.model_dump(mode="json"), [task_filter_fields(task)])
+
+def load_due_scheduler() -> int:
+    with SessionLocal() as db:
+        return due_scheduler.load(db)
+
+due_scheduler = DueScheduler()
+due_scheduler.add_callback(publish_reminder)
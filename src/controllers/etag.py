@@ -0,0 +1,65 @@
+import hashlib
+import logging
+from typing import Optional
+from fastapi import Response, status
+from sqlalchemy import select, func
+
+from src.models.version_model import VersionCounter
+
+logger = logging.getLogger(__name__)
+
+def next_version(db, model, count: int = 1) -> int:
+    # Reserva `count` versões consecutivas da tabela e devolve a última. Um único
+    # INSERT ... ON CONFLICT DO UPDATE ... RETURNING na transação da escrita: o lock da
+    # linha do contador serializa as escritas concorrentes (inclusive no Postgres) e um
+    # rollback devolve as versões reservadas. Sem a linha (banco criado por create_all),
+    # o contador parte da maior versão da tabela.
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = VersionCounter.__table__
+    stmt = insert(table).values(
+        name=model.__tablename__,
+        value=select(func.coalesce(func.max(model.version), 0) + count).scalar_subquery(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.name], set_={"value": table.c.value + count},
+    ).returning(table.c.value)
+    return db.execute(stmt).scalar_one()
+
+def strong_etag(resource) -> str:
+    return f'"{resource.id}-{resource.version}"'
+
+def weak_etag(count: int, max_version: Optional[int], *params) -> str:
+    # listas: quantidade + maior versão do conjunto filtrado; os parâmetros
+    # (filtros, limit, cursor) diferenciam páginas e consultas distintas
+    digest = hashlib.sha1(repr(params).encode()).hexdigest()[:12]
+    return f'W/"{count}-{max_version or 0}-{digest}"'
+
+def list_etag(query, version_column, *params) -> str:
+    count, max_version = query.with_entities(func.count(), func.max(version_column)).order_by(None).one()
+    return weak_etag(count, max_version, *params)
+
+def _opaque(tag: str) -> str:
+    # If-None-Match usa comparação fraca: W/"x" equivale a "x"
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+def not_modified(if_none_match: Optional[str], etag: str, response: Optional[Response] = None) -> Optional[Response]:
+    # 304 sem corpo quando o cliente já tem a representação atual; repete o Vary
+    # da resposta da rota (ex.: Accept), como o 200 faria
+    if etag_matches(if_none_match, etag):
+        logger.debug("ETag %s inalterado, respondendo 304", etag)
+        headers = {"ETag": etag}
+        if response is not None and "vary" in response.headers:
+            headers["Vary"] = response.headers["vary"]
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
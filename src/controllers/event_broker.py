@@ -0,0 +1,165 @@
+import os
+import json
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Eventos pendentes por assinante; acima disso o assinante é desconectado (consumidor lento)
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+# Intervalo do comentário de keep-alive do SSE quando não há eventos
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Evento já serializado no formato SSE: a mensagem é montada uma única vez,
+# independentemente do número de assinantes
+class ChangeEvent:
+    __slots__ = ("type", "rows", "message")
+
+    def __init__(self, event_type: str, payload: dict, rows):
+        self.type = event_type
+        # estados da tarefa (antes/depois) usados pelos filtros dos assinantes
+        self.rows = [row for row in rows if row is not None]
+        data = json.dumps(payload, default=str, separators=(",", ":"))
+        self.message = f"event: {event_type}\ndata: {data}\n\n"
+
+class Subscriber:
+    __slots__ = ("assigned_to", "status", "max_queue", "queue", "wakeup", "closed", "reason")
+
+    def __init__(self, assigned_to: Optional[int] = None, status: Optional[str] = None,
+                 max_queue: int = EVENTS_QUEUE_SIZE):
+        self.assigned_to = assigned_to
+        self.status = status
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.wakeup = asyncio.Event()
+        self.closed = False
+        self.reason = None
+
+    def matches(self, event: ChangeEvent) -> bool:
+        return any(
+            (self.assigned_to is None or row.get("assigned_to") == self.assigned_to)
+            and (self.status is None or row.get("status") == self.status)
+            for row in event.rows
+        )
+
+    def offer(self, event: ChangeEvent) -> bool:
+        # False = fila cheia: o assinante é encerrado em vez de acumular eventos
+        if len(self.queue) >= self.max_queue:
+            self.close("slow_consumer")
+            return False
+        self.queue.append(event)
+        self.wakeup.set()
+        return True
+
+    def close(self, reason: str):
+        self.closed = True
+        self.reason = reason
+        self.queue.clear()
+        self.wakeup.set()
+
+    async def next(self, timeout: float) -> Optional[ChangeEvent]:
+        # próximo evento, ou None após `timeout` segundos sem eventos
+        if not self.queue and not self.closed:
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.queue.popleft() if self.queue else None
+
+# Distribui eventos publicados pelos controllers (em qualquer thread) aos assinantes,
+# que vivem no event loop. Assinantes são indexados por responsável: um evento só
+# visita quem filtra por esse responsável ou não filtra por responsável.
+class EventBroker:
+    def __init__(self):
+        self._by_assignee = {}  # assigned_to (None = todos) -> set de Subscriber
+        self._loop = None
+        self._lock = threading.Lock()
+        self.subscribers = 0
+        self.published = 0
+        self.delivered = 0
+        self.disconnected = 0
+
+    def subscribe(self, assigned_to: Optional[int] = None, status: Optional[str] = None,
+                  max_queue: int = EVENTS_QUEUE_SIZE) -> Subscriber:
+        subscriber = Subscriber(assigned_to, status, max_queue)
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._by_assignee.setdefault(assigned_to, set()).add(subscriber)
+            self.subscribers += 1
+        logger.debug("Assinante de eventos conectado (assigned_to=%s, status=%s)", assigned_to, status)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            group = self._by_assignee.get(subscriber.assigned_to)
+            if group is not None and subscriber in group:
+                group.discard(subscriber)
+                if not group:
+                    del self._by_assignee[subscriber.assigned_to]
+                self.subscribers -= 1
+        logger.debug("Assinante de eventos desconectado (%s)", subscriber.reason or "cliente")
+
+    def publish(self, event_type: str, payload: dict, rows):
+        # chamado pelos controllers após o commit; sem assinantes não custa nada
+        if not self.subscribers:
+            return
+        event = ChangeEvent(event_type, payload, rows)
+        with self._lock:
+            self.published += 1
+            loop = self._loop
+        try:
+            loop.call_soon_threadsafe(self._fanout, event)
+        except RuntimeError:
+            # event loop encerrado (shutdown)
+            logger.debug("Evento %s descartado: event loop encerrado", event_type)
+
+    def _fanout(self, event: ChangeEvent):
+        with self._lock:
+            candidates = set(self._by_assignee.get(None, ()))
+            for assigned_to in {row.get("assigned_to") for row in event.rows}:
+                if assigned_to is not None:
+                    candidates.update(self._by_assignee.get(assigned_to, ()))
+        delivered = dropped = 0
+        for subscriber in candidates:
+            if subscriber.closed or not subscriber.matches(event):
+                continue
+            if subscriber.offer(event):
+                delivered += 1
+            else:
+                dropped += 1
+                self.unsubscribe(subscriber)
+        with self._lock:
+            self.delivered += delivered
+            self.disconnected += dropped
+        if dropped:
+            logger.warning("%d assinante(s) desconectado(s) por fila cheia", dropped)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": self.subscribers,
+                "published": self.published,
+                "delivered": self.delivered,
+                "disconnected_slow_consumers": self.disconnected,
+                "queue_size": EVENTS_QUEUE_SIZE,
+            }
+
+async def event_stream(subscriber: Subscriber, heartbeat: float = EVENTS_HEARTBEAT_SECONDS):
+    # Gera o corpo SSE de um assinante até o cliente desconectar ou a fila estourar
+    try:
+        yield ": conectado\n\n"
+        while True:
+            event = await subscriber.next(heartbeat)
+            if subscriber.closed:
+                data = json.dumps({"reason": subscriber.reason})
+                yield f"event: disconnect\ndata: {data}\n\n"
+                return
+            yield event.message if event is not None else ": ping\n\n"
+    finally:
+        event_broker.unsubscribe(subscriber)
+
+event_broker = EventBroker()
@@ -0,0 +1,72 @@
+import os
+import json
+import logging
+from datetime import date
+from operator import attrgetter
+from fastapi import Response
+
+from src.models.task_model import TaskOut
+from src.models.comment_model import CommentOut
+from src.models.user_model import UserOut
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Caminho rápido das listagens (opt-in): colunas lidas como tuplas e serializadas direto,
+# sem instanciar ORM nem revalidar cada linha no schema de saída
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+
+if FAST_JSON and orjson is None:
+    logger.warning("Pacote orjson não instalado; FAST_JSON usando json da biblioteca padrão")
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def dumps(value) -> bytes:
+    # mesmo JSON compacto do JSONResponse; OPT_UTC_Z escreve UTC como "Z", igual ao Pydantic
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+# Serializador pré-compilado de um schema de saída: os campos (na ordem do schema) são
+# lidos com um único attrgetter de linhas (Row), objetos ORM ou instâncias do próprio schema
+class RowSerializer:
+    def __init__(self, schema):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self._get = attrgetter(*self.fields)
+
+    def columns(self, model):
+        # colunas do model na ordem do schema, para select/db.query de tuplas
+        return [getattr(model, field) for field in self.fields]
+
+    def row(self, item) -> dict:
+        return dict(zip(self.fields, self._get(item)))
+
+    def rows(self, items) -> list:
+        fields, get = self.fields, self._get
+        return [dict(zip(fields, get(item))) for item in items]
+
+    def dumps(self, items) -> bytes:
+        return dumps(self.rows(items))
+
+TASK_ROWS = RowSerializer(TaskOut)
+COMMENT_ROWS = RowSerializer(CommentOut)
+USER_ROWS = RowSerializer(UserOut)
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+def response_headers(response: Response) -> dict:
+    # devolver um Response ignora o response_model (o schema do OpenAPI continua o declarado
+    # na rota) e os cabeçalhos do `response` injetado; ETag/X-Next-Cursor são copiados
+    return {k: v for k, v in response.headers.items() if k not in ("content-length", "content-type")}
+
+def fast_response(serializer: RowSerializer, items, response: Response) -> Response:
+    return FastJSONResponse(serializer.dumps(items), headers=response_headers(response))
@@ -0,0 +1,74 @@
+import os
+import logging
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, aliased
+
+from src.models.task_model import TaskExpandedOut
+from src.models.user_model import User, UserOut
+from src.models.comment_model import Comment, CommentOut
+from src.models.archive_model import ArchivedTask, ArchivedComment
+from src.controllers.pagination import Page
+
+logger = logging.getLogger(__name__)
+
+INCLUDE_OPTIONS = ("assignee", "comments")
+# Comentários embutidos por tarefa (os mais recentes)
+INCLUDE_COMMENTS_LIMIT = int(os.getenv("INCLUDE_COMMENTS_LIMIT", "5"))
+
+def parse_include(include: Optional[str]) -> set:
+    requested = {part.strip() for part in (include or "").split(",") if part.strip()}
+    invalid = requested - set(INCLUDE_OPTIONS)
+    if invalid:
+        logger.warning("Include inválido: %s", ", ".join(sorted(invalid)))
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Include inválido: '{', '.join(sorted(invalid))}'. Use: {', '.join(INCLUDE_OPTIONS)}."
+        )
+    return requested
+
+def _assignees(db: Session, user_ids) -> dict:
+    if not user_ids:
+        return {}
+    users = db.execute(select(User).where(User.id.in_(user_ids))).scalars()
+    return {user.id: UserOut.model_validate(user) for user in users}
+
+def _latest_comments(db: Session, task_ids, limit: int, model=Comment) -> dict:
+    # uma consulta para todas as tarefas: ROW_NUMBER por tarefa limita a `limit` comentários cada
+    if not task_ids:
+        return {}
+    position = func.row_number().over(
+        partition_by=model.task_id, order_by=(model.created_at.desc(), model.id.desc())
+    ).label("position")
+    ranked = select(model, position).where(model.task_id.in_(task_ids)).subquery()
+    latest = aliased(model, ranked)
+    rows = db.execute(
+        select(latest).where(ranked.c.position <= limit).order_by(ranked.c.task_id, ranked.c.position)
+    ).scalars()
+    grouped = {task_id: [] for task_id in task_ids}
+    for comment in rows:
+        grouped[comment.task_id].append(CommentOut.model_validate(comment))
+    return grouped
+
+def expand_tasks(tasks, include: set, db: Session, comments_limit: int = INCLUDE_COMMENTS_LIMIT):
+    # Embute as relações pedidas com uma consulta por relação (IN sobre os IDs da página),
+    # independentemente do tamanho da página. Preserva o cursor de páginas paginadas.
+    logger.info("expand_tasks called for %d tarefas (include=%s)", len(tasks), ",".join(sorted(include)))
+    expanded = [TaskExpandedOut.model_validate(task) for task in tasks]
+    archived = {task.id for task in tasks if isinstance(task, ArchivedTask)}
+    if "assignee" in include:
+        users = _assignees(db, list({t.assigned_to for t in expanded if t.assigned_to is not None}))
+        for task in expanded:
+            task.assignee = users.get(task.assigned_to)
+    if "comments" in include:
+        comments = _latest_comments(db, [t.id for t in expanded if t.id not in archived], comments_limit)
+        # tarefas arquivadas (archived=true ou GET de uma arquivada): comentários em comments_archive
+        comments.update(_latest_comments(db, sorted(archived), comments_limit, ArchivedComment))
+        for task in expanded:
+            task.comments = comments.get(task.id, [])
+    next_cursor = getattr(tasks, "next_cursor", None)
+    return Page(expanded, next_cursor) if isinstance(tasks, Page) else expanded
+
+def expand_task(task, include: set, db: Session):
+    return expand_tasks([task], include, db)[0]
@@ -0,0 +1,318 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional
+from sqlalchemy.engine import Row
+
+from src.models.task_model import TaskOut
+from src.controllers.pagination import Page
+
+logger = logging.getLogger(__name__)
+
+LIST_CACHE_SIZE = int(os.getenv("LIST_CACHE_SIZE", "512"))
+LIST_CACHE_TTL_SECONDS = float(os.getenv("LIST_CACHE_TTL_SECONDS", "30"))
+# "memory" (por processo) ou "shared" (Redis em LIST_CACHE_REDIS_URL, compartilhado entre workers)
+LIST_CACHE_BACKEND = os.getenv("LIST_CACHE_BACKEND", "memory")
+LIST_CACHE_REDIS_URL = os.getenv("LIST_CACHE_REDIS_URL")
+
+# Campos da tarefa usados pelos filtros de list_tasks_filtered
+FILTER_FIELDS = ("status", "priority", "due_date", "assigned_to")
+
+# Backend em memória: LRU com TTL, no próprio processo
+class MemoryBackend:
+    def __init__(self, max_size: int = LIST_CACHE_SIZE, ttl: float = LIST_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # chave -> (valor, expires_at)
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.evictions = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self):
+        with self._lock:
+            self._generation += 1
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.evictions = 0
+
+# Stand-in local do Redis: o subconjunto de comandos usado por SharedBackend,
+# para desenvolvimento e testes sem um servidor (não é compartilhado entre processos)
+class LocalStore:
+    def __init__(self):
+        self._values = {}   # chave -> (valor, expires_at)
+        self._zsets = {}    # chave -> {membro: score}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self._values.pop(key, None)
+                return None
+            return entry[0]
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + ex if ex else float("inf"))
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+                self._zsets.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._values.get(key)
+            value = int(entry[0]) + 1 if entry is not None else 1
+            self._values[key] = (value, float("inf"))
+            return value
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            self._zsets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        with self._lock:
+            zset = self._zsets.get(key, {})
+            for member in members:
+                zset.pop(member, None)
+
+    def zcard(self, key):
+        with self._lock:
+            return len(self._zsets.get(key, {}))
+
+    def zrange(self, key, start, end):
+        with self._lock:
+            members = sorted(self._zsets.get(key, {}).items(), key=lambda item: item[1])
+            end = len(members) if end == -1 else end + 1
+            return [member for member, _ in members[start:end]]
+
+# Backend compartilhado: valores JSON com expiração (SET EX), um sorted set
+# (chave -> último acesso) para a evicção LRU entre workers e a geração das
+# invalidações (INCR), vista por todos os workers
+class SharedBackend:
+    def __init__(self, store, max_size: int = LIST_CACHE_SIZE, ttl: float = LIST_CACHE_TTL_SECONDS,
+                 prefix: str = "tasks:list-cache"):
+        self.store = store
+        self.max_size = max_size
+        self.ttl = ttl
+        self.prefix = prefix
+        self._index = f"{prefix}:index"
+        self._generation_key = f"{prefix}:generation"
+        self.evictions = 0
+
+    def generation(self) -> int:
+        return int(self.store.get(self._generation_key) or 0)
+
+    def bump_generation(self):
+        self.store.incr(self._generation_key)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def get(self, key: str):
+        raw = self.store.get(self._key(key))
+        if raw is None:
+            self.store.zrem(self._index, key)
+            return None
+        self.store.zadd(self._index, {key: time.time()})
+        return _decode_page(raw)
+
+    def set(self, key: str, value):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        self.store.set(self._key(key), _encode_page(value), ex=max(1, int(self.ttl)))
+        self.store.zadd(self._index, {key: time.time()})
+        overflow = self.store.zcard(self._index) - self.max_size
+        if overflow > 0:
+            oldest = [k.decode() if isinstance(k, bytes) else k for k in self.store.zrange(self._index, 0, overflow - 1)]
+            self.delete(oldest)
+            self.evictions += len(oldest)
+
+    def delete(self, keys):
+        keys = list(keys)
+        if keys:
+            self.store.delete(*(self._key(k) for k in keys))
+            self.store.zrem(self._index, *keys)
+
+    def keys(self):
+        return [k.decode() if isinstance(k, bytes) else k for k in self.store.zrange(self._index, 0, -1)]
+
+    def size(self) -> int:
+        return self.store.zcard(self._index)
+
+    def clear(self):
+        self.delete(self.keys())
+        self.evictions = 0
+
+def _encode_page(page) -> str:
+    return json.dumps({
+        "items": [TaskOut.model_validate(item).model_dump(mode="json") for item in page],
+        "next_cursor": getattr(page, "next_cursor", None),
+        "etag": getattr(page, "etag", None),
+    })
+
+def _decode_page(raw):
+    data = json.loads(raw)
+    return Page([TaskOut.model_validate(item) for item in data["items"]], data["next_cursor"], data.get("etag"))
+
+def filters_key(status_filter=None, priority=None, due_before=None, user_id=None, limit=None, cursor=None,
+                sort=None, scope=None) -> str:
+    # tupla normalizada dos filtros (user_id=0 equivale a sem filtro, como em build_filters);
+    # scope separa listagens com os mesmos filtros e outro ETag (ex.: "user" para /tasks/user/{id})
+    return json.dumps([
+        status_filter or None, priority or None,
+        due_before.isoformat() if due_before else None,
+        user_id or None, limit, cursor or None, sort or None,
+    ] + ([scope] if scope else []))
+
+def _could_match(key: str, row: dict) -> bool:
+    status_filter, priority, due_before, user_id = json.loads(key)[:4]
+    if status_filter is not None and row["status"] != status_filter:
+        return False
+    if priority is not None and row["priority"] != priority:
+        return False
+    if due_before is not None and (row["due_date"] is None or row["due_date"] >= date.fromisoformat(due_before)):
+        return False
+    if user_id is not None and row["assigned_to"] != user_id:
+        return False
+    return True
+
+def task_filter_fields(task) -> dict:
+    # campos filtráveis de uma tarefa ORM, linha ou dict
+    if isinstance(task, dict):
+        return {field: task.get(field) for field in FILTER_FIELDS}
+    return {field: getattr(task, field) for field in FILTER_FIELDS}
+
+# Cache de resultados de list_tasks_filtered com invalidação pelas escritas
+class ListCache:
+    def __init__(self, backend):
+        self.backend = backend
+        # serializa put (conferência da geração + gravação) com as invalidações
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        return self.backend.generation()
+
+    def get(self, key: str):
+        page = self.backend.get(key)
+        with self._lock:
+            if page is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Page(page, page.next_cursor, page.etag)
+
+    def put(self, key: str, items, generation: int, etag: Optional[str] = None):
+        # devolve o snapshot armazenado, com o ETag do resultado (lido na mesma geração);
+        # um resultado lido antes de uma invalidação concorrente não é armazenado. Tuplas (Row) já são imutáveis e são guardadas
+        # como vieram; objetos ORM viram TaskOut. Conferência e gravação ficam sob o lock
+        # das invalidações; entre workers (SharedBackend) resta a janela entre o GET da
+        # geração e o SET da entrada, limitada pelo TTL.
+        snapshot = Page(
+            [item if isinstance(item, (TaskOut, Row)) else TaskOut.model_validate(item) for item in items],
+            getattr(items, "next_cursor", None),
+            etag,
+        )
+        with self._lock:
+            if generation == self.backend.generation():
+                self.backend.set(key, snapshot)
+        return snapshot
+
+    def invalidate_rows(self, rows):
+        # descarta só as entradas cujos filtros aceitariam alguma das linhas (antes ou depois da escrita)
+        rows = [row for row in rows if row is not None]
+        if not rows:
+            return
+        with self._lock:
+            self.backend.bump_generation()
+            stale = [key for key in self.backend.keys() if any(_could_match(key, row) for row in rows)]
+            self.backend.delete(stale)
+            self.invalidations += len(stale)
+        logger.debug("Cache de listagens: %d entradas invalidadas", len(stale))
+
+    def clear(self):
+        with self._lock:
+            self.backend.bump_generation()
+            self.backend.clear()
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "size": self.backend.size(),
+                "max_size": self.backend.max_size,
+                "ttl_seconds": self.backend.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                # cada hit evita uma consulta no banco (a do ETag ou a da listagem)
+                "saved_queries": self.hits,
+                "invalidations": self.invalidations,
+                "evictions": self.backend.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            }
+
+def create_backend(kind: str = LIST_CACHE_BACKEND, redis_url: Optional[str] = LIST_CACHE_REDIS_URL):
+    if kind == "shared":
+        if redis_url:
+            try:
+                import redis
+            except ImportError:
+                logger.warning("Pacote redis não instalado; cache de listagens usando stand-in local")
+            else:
+                return SharedBackend(redis.Redis.from_url(redis_url))
+        else:
+            logger.warning("LIST_CACHE_REDIS_URL não definido; cache de listagens usando stand-in local")
+        return SharedBackend(LocalStore())
+    return MemoryBackend()
+
+list_cache = ListCache(create_backend())
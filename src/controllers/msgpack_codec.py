@@ -0,0 +1,119 @@
+import json
+import logging
+from datetime import date, datetime
+from typing import Optional
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+
+from src.controllers.fast_json import response_headers
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# variantes usadas por clientes antigos, aceitas tanto em Accept quanto em Content-Type
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+def _media_type(value: Optional[str]) -> str:
+    return (value or "").split(";")[0].strip().lower()
+
+def _qualities(accept: str) -> dict:
+    qualities = {}
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[media_type.strip().lower()] = quality
+    return qualities
+
+def prefers_msgpack(accept: Optional[str]) -> bool:
+    # MessagePack só quando pedido explicitamente, com q maior ou igual ao do JSON;
+    # */* e a ausência de Accept continuam recebendo JSON
+    if msgpack is None or not accept:
+        return False
+    qualities = _qualities(accept)
+    q_msgpack = max(qualities.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    q_json = max(qualities.get(media_type, 0.0) for media_type in ("application/json", "application/*", "*/*"))
+    return q_msgpack > 0 and q_msgpack >= q_json
+
+def accepts_msgpack(request: Request, response: Response) -> bool:
+    # dependência das rotas negociadas: a representação depende do Accept
+    response.headers["Vary"] = "Accept"
+    return prefers_msgpack(request.headers.get("accept"))
+
+def representation_etag(etag: str, as_msgpack: bool) -> str:
+    # cada representação tem o próprio ETag ("...-mp" para MessagePack): um ETag
+    # recebido em JSON não gera 304 para um pedido em MessagePack, e vice-versa
+    return f'{etag[:-1]}-mp"' if as_msgpack else etag
+
+def _default(value):
+    # datas como texto ISO, iguais às do JSON (UTC com "Z", como o Pydantic)
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def packb(value) -> bytes:
+    return msgpack.packb(value, default=_default, datetime=False)
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+def msgpack_response(content, response: Response, status_code: int = status.HTTP_200_OK) -> Response:
+    # content: dicts montados direto das tuplas (RowSerializer.row/rows), sem passar por JSON
+    return MsgPackResponse(packb(content), status_code=status_code, headers=response_headers(response))
+
+async def _as_json_request(request: Request) -> Request:
+    if msgpack is None:
+        logger.warning("Corpo MessagePack recebido sem o pacote msgpack instalado")
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="MessagePack indisponível neste servidor; envie JSON.",
+        )
+    body = await request.body()
+    if not body:
+        return request
+    try:
+        payload = json.dumps(msgpack.unpackb(body), default=_default).encode()
+    except (ValueError, TypeError, msgpack.UnpackException):
+        logger.warning("Corpo MessagePack inválido em %s", request.url.path)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Corpo MessagePack inválido")
+    # o FastAPI só lê corpos JSON: o valor decodificado é entregue como JSON pelo canal
+    # receive do ASGI, numa requisição nova, e a validação (TaskCreate, CommentCreate, ...)
+    # é a mesma dos clientes JSON
+    replayed = False
+
+    async def receive():
+        nonlocal replayed
+        if replayed:
+            return await request.receive()
+        replayed = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    headers = [(k, v) for k, v in request.scope["headers"] if k not in (b"content-type", b"content-length")]
+    headers += [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+    return Request({**request.scope, "headers": headers}, receive)
+
+# Rotas que aceitam corpos em MessagePack (Content-Type: application/msgpack) além de JSON
+class MsgPackRoute(APIRoute):
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if _media_type(request.headers.get("content-type")) in MSGPACK_MEDIA_TYPES:
+                request = await _as_json_request(request)
+            return await handler(request)
+
+        return route_handler
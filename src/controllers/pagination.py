@@ -0,0 +1,122 @@
+import os
+import json
+import base64
+import logging
+from datetime import date, datetime
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+# Cabeçalho com o cursor opaco da próxima página; o corpo continua sendo a lista
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Lista com o cursor da próxima página (None na última página) e, no cache de
+# listagens, o ETag do resultado
+class Page(list):
+    def __init__(self, items, next_cursor=None, etag=None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+        self.etag = etag
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+def cursor_key(column) -> str:
+    # ordenação a que o cursor pertence (ex.: "tasks.due_date", "comments.created_at")
+    return f"{column.table.name}.{column.key}"
+
+def encode_cursor(key: str, *values) -> str:
+    raw = json.dumps([key, *(_encode_value(v) for v in values)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _matches(value, expected) -> bool:
+    # date/datetime pelo tipo exato (datetime é subclasse de date); bool não conta como número
+    if isinstance(expected, tuple):
+        return any(_matches(value, option) for option in expected)
+    if expected is type(None):
+        return value is None
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    if expected is int:
+        return isinstance(value, int)
+    return type(value) is expected
+
+def decode_cursor(cursor: str, key: str, *types) -> list:
+    # types: tipo esperado de cada valor (uma tupla aceita qualquer um deles). Cursores de outra
+    # ordenação ou rota, ou com valores do tipo errado, são rejeitados com 400 em vez de chegar
+    # à consulta
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types) + 1 or values[0] != key:
+            raise ValueError(cursor)
+        values = [_decode_value(v) for v in values[1:]]
+        if not all(_matches(value, expected) for value, expected in zip(values, types)):
+            raise ValueError(cursor)
+        return values
+    except (ValueError, TypeError):
+        logger.warning("Cursor de paginação inválido para %s: %s", key, cursor)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+def _after(column, value, id_column, last_id, descending):
+    # (column, id) estritamente depois de (value, last_id) na ordenação;
+    # escrito como range + desempate para que o índice seja usado.
+    if descending:
+        return and_(column <= value, or_(column < value, id_column < last_id))
+    return and_(column >= value, or_(column > value, id_column > last_id))
+
+def paginate(query, column, id_column, limit: int, cursor: str | None = None, descending: bool = False):
+    # Paginação por chave (keyset) ordenada por (column, id): o custo de
+    # qualquer página é o mesmo da primeira, sem OFFSET.
+    key = cursor_key(column)
+    if cursor:
+        value, last_id = decode_cursor(cursor, key, (column.type.python_type, type(None)), int)
+        if value is None:
+            # NULLs vêm primeiro na ordem ascendente e por último na descendente
+            if descending:
+                condition = and_(column.is_(None), id_column < last_id)
+            else:
+                condition = or_(and_(column.is_(None), id_column > last_id), column.isnot(None))
+        else:
+            condition = _after(column, value, id_column, last_id, descending)
+            if descending:
+                # na ordem descendente os NULLs vêm depois de qualquer valor
+                condition = or_(condition, column.is_(None))
+        query = query.filter(condition)
+    # posição dos NULLs explícita, igual à do filtro do cursor: é o padrão do SQLite,
+    # mas o Postgres faz o contrário (NULLs por último na ascendente)
+    if descending:
+        query = query.order_by(column.desc().nulls_last(), id_column.desc())
+    else:
+        query = query.order_by(column.asc().nulls_first(), id_column)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(key, getattr(last, column.key), getattr(last, id_column.key))
+    return Page(rows, next_cursor)
+
+def set_next_cursor(response, page):
+    next_cursor = getattr(page, "next_cursor", None)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
@@ -0,0 +1,73 @@
+import re
+import logging
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, table, column, literal_column, text
+from sqlalchemy.orm import Session
+
+from src.models.task_model import Task
+from src.controllers.pagination import Page, encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Tabela virtual FTS5 (ver TASK_SEARCH_DDL em task_model); rank = bm25, menor é melhor
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"))
+# Cursores da busca: (rank, id); no fallback com LIKE o rank é sempre 0
+SEARCH_CURSOR_KEY = "tasks_fts.rank"
+
+def build_match_expression(q: str) -> str:
+    # Cada palavra vira um termo entre aspas com prefixo (“auten” encontra “autenticação”);
+    # a sintaxe do FTS5 (AND, NEAR, aspas...) digitada pelo usuário não é interpretada.
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        logger.warning("Busca sem termos válidos: %r", q)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Informe ao menos um termo de busca.")
+    return " ".join(f'"{term}"*' for term in terms)
+
+def _page(rows, limit: int):
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        task, rank = rows[-1]
+        next_cursor = encode_cursor(SEARCH_CURSOR_KEY, rank, task.id)
+    return Page([task for task, _ in rows], next_cursor)
+
+def _search_like(q: str, db: Session, limit: int, cursor: Optional[str]):
+    # bancos sem FTS5: varredura com LIKE, sem ranking (ordem por id)
+    # %, _ e \ digitados pelo usuário são literais, não curingas
+    pattern = "%" + re.sub(r"([\\%_])", r"\\\1", q) + "%"
+    rank = literal_column("0")
+    query = db.query(Task, rank).filter(or_(
+        Task.title.ilike(pattern, escape="\\"), Task.description.ilike(pattern, escape="\\"),
+    ))
+    if cursor:
+        _, last_id = decode_cursor(cursor, SEARCH_CURSOR_KEY, float, int)
+        query = query.filter(Task.id > last_id)
+    return _page(query.order_by(Task.id).limit(limit + 1).all(), limit)
+
+def search_tasks(q: str, db: Session, limit: int, cursor: Optional[str] = None):
+    logger.info("search_tasks called with q=%r (limit=%s)", q, limit)
+    expression = build_match_expression(q)
+    if db.get_bind().dialect.name != "sqlite":
+        return _search_like(q, db, limit, cursor)
+
+    rank = tasks_fts.c.rank
+    query = (
+        db.query(Task, rank)
+        .join(tasks_fts, tasks_fts.c.rowid == Task.id)
+        .filter(literal_column("tasks_fts").op("MATCH")(expression))
+    )
+    if cursor:
+        # keyset sobre (rank, id)
+        last_rank, last_id = decode_cursor(cursor, SEARCH_CURSOR_KEY, float, int)
+        query = query.filter(or_(rank > last_rank, and_(rank == last_rank, Task.id > last_id)))
+    page = _page(query.order_by(rank, Task.id).limit(limit + 1).all(), limit)
+    logger.debug("Busca retornou %d tarefas", len(page))
+    return page
+
+def rebuild_search_index(db: Session):
+    # Reindexa todas as tarefas (bancos anteriores ao índice ou após escrita fora dos triggers)
+    logger.info("rebuild_search_index called")
+    db.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')"))
+    db.commit()
+    return db.execute(text("SELECT COUNT(*) FROM tasks")).scalar_one()
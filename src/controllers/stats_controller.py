@@ -0,0 +1,111 @@
+import logging
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import select, func, delete
+from sqlalchemy.orm import Session
+
+from src.models.task_model import Task
+from src.models.stats_model import TaskCounter
+from src.models.archive_model import ArchivedTask
+
+logger = logging.getLogger(__name__)
+
+# Colunas de Task contadas por grupo (dimension -> coluna)
+COUNTED_COLUMNS = {"status": Task.status, "priority": Task.priority, "assigned_to": Task.assigned_to}
+NULL_VALUE = "none"
+
+def _value(value) -> str:
+    return NULL_VALUE if value is None else str(value)
+
+def task_snapshot(task) -> Tuple:
+    # (status, priority, assigned_to) de uma tarefa ORM, linha ou dict
+    if isinstance(task, dict):
+        return (task["status"], task["priority"], task["assigned_to"])
+    return (task.status, task.priority, task.assigned_to)
+
+def _keys(snapshot: Tuple):
+    yield ("total", "")
+    for dimension, value in zip(COUNTED_COLUMNS, snapshot):
+        yield (dimension, _value(value))
+
+def _upsert(db: Session, rows: list):
+    # count = count + delta no próprio banco: escritas concorrentes não perdem incrementos
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    table = TaskCounter.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.dimension, table.c.value],
+        set_={"count": table.c.count + stmt.excluded.count},
+    )
+    db.execute(stmt, rows)
+
+def record_task_changes(db: Session, changes: Iterable[Tuple[Optional[Tuple], Optional[Tuple]]]):
+    # changes: pares (antes, depois); None = tarefa inexistente (criação/remoção).
+    # Não faz commit: os contadores entram na transação da escrita da tarefa.
+    deltas = Counter()
+    for old, new in changes:
+        if old is not None:
+            for key in _keys(old):
+                deltas[key] -= 1
+        if new is not None:
+            for key in _keys(new):
+                deltas[key] += 1
+    rows = [{"dimension": d, "value": v, "count": c} for (d, v), c in deltas.items() if c != 0]
+    if rows:
+        _upsert(db, rows)
+    logger.debug("Contadores de tarefas ajustados: %d grupos", len(rows))
+
+def record_task_change(db: Session, old: Optional[Tuple], new: Optional[Tuple]):
+    record_task_changes(db, [(old, new)])
+
+def get_task_stats(db: Session):
+    logger.info("get_task_stats called")
+    stats = {"total": 0, "by_status": {}, "by_priority": {}, "by_assignee": []}
+    for counter in db.execute(select(TaskCounter).where(TaskCounter.count != 0)).scalars():
+        if counter.dimension == "total":
+            stats["total"] = counter.count
+        elif counter.dimension == "status":
+            stats["by_status"][counter.value] = counter.count
+        elif counter.dimension == "priority":
+            stats["by_priority"][counter.value] = counter.count
+        elif counter.dimension == "assigned_to":
+            assigned_to = None if counter.value == NULL_VALUE else int(counter.value)
+            stats["by_assignee"].append({"assigned_to": assigned_to, "count": counter.count})
+    stats["by_assignee"].sort(key=lambda item: (item["assigned_to"] is None, item["assigned_to"] or 0))
+    return stats
+
+def _actual_counts(db: Session) -> dict:
+    # tarefas arquivadas continuam contando (o arquivamento só muda a tabela)
+    actual = Counter()
+    for model in (Task, ArchivedTask):
+        actual[("total", "")] += db.execute(select(func.count(model.id))).scalar_one()
+        for dimension in COUNTED_COLUMNS:
+            column = getattr(model, dimension)
+            for value, count in db.execute(select(column, func.count(model.id)).group_by(column)):
+                actual[(dimension, _value(value))] += count
+    return dict(actual)
+
+def reconcile_task_stats(db: Session, apply: bool = True):
+    # Recalcula os contadores a partir de tasks; devolve a divergência encontrada
+    # como [(dimension, value, armazenado, real)] e, se apply, regrava a tabela.
+    logger.info("reconcile_task_stats called (apply=%s)", apply)
+    actual = _actual_counts(db)
+    stored = {(c.dimension, c.value): c.count for c in db.execute(select(TaskCounter)).scalars()}
+    drift = sorted(
+        (dimension, value, stored.get((dimension, value), 0), actual.get((dimension, value), 0))
+        for dimension, value in set(actual) | set(stored)
+        if stored.get((dimension, value), 0) != actual.get((dimension, value), 0)
+    )
+    if drift:
+        logger.warning("Divergência nos contadores de tarefas: %d grupos", len(drift))
+    if apply:
+        db.execute(delete(TaskCounter))
+        db.execute(
+            TaskCounter.__table__.insert(),
+            [{"dimension": d, "value": v, "count": c} for (d, v), c in actual.items()],
+        )
+        db.commit()
+    return drift
@@ -0,0 +1,135 @@
+import os
+import json
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Iterable, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, delete, insert
+from sqlalchemy.orm import Session
+
+from src.models.change_log_model import ChangeLog, SyncState
+from src.models.task_model import TaskOut
+from src.models.comment_model import CommentOut
+from src.models.user_model import UserOut
+
+logger = logging.getLogger(__name__)
+
+SYNC_DEFAULT_LIMIT = int(os.getenv("SYNC_DEFAULT_LIMIT", "500"))
+SYNC_MAX_LIMIT = int(os.getenv("SYNC_MAX_LIMIT", "5000"))
+# Alterações mais antigas que isso são removidas pela compactação
+SYNC_RETENTION_DAYS = int(os.getenv("SYNC_RETENTION_DAYS", "30"))
+COMPACTED_THROUGH = "compacted_through"
+# Chave do advisory lock (Postgres) que serializa as transações que gravam no change_log
+CHANGE_LOG_LOCK = 0x73796E63
+
+def _now():
+    return datetime.now(UTC).replace(tzinfo=None)
+
+def task_payload(task) -> dict:
+    return TaskOut.model_validate(task).model_dump(mode="json")
+
+def comment_payload(comment) -> dict:
+    return {**CommentOut.model_validate(comment).model_dump(mode="json"), "task_id": comment.task_id}
+
+def user_payload(user) -> dict:
+    return UserOut.model_validate(user).model_dump(mode="json")
+
+def record_changes(db: Session, entity: str, changes: Iterable):
+    # changes: pares (entity_id, payload); payload None = remoção (tombstone).
+    # Não faz commit: a entrada entra na transação da própria escrita.
+    now = _now()
+    rows = [
+        {
+            "entity": entity,
+            "entity_id": entity_id,
+            "op": "delete" if payload is None else "upsert",
+            "changed_at": now,
+            "payload": None if payload is None else json.dumps(payload, separators=(",", ":")),
+        }
+        for entity_id, payload in changes
+    ]
+    if rows:
+        _serialize_change_log(db)
+        db.execute(insert(ChangeLog), rows)
+
+def _serialize_change_log(db: Session):
+    # O seq sai da sequência no INSERT, mas o cliente só vê a linha no commit: no Postgres
+    # uma transação com seq menor pode commitar depois de outra com seq maior, e um cliente
+    # que já avançou o cursor além dela nunca a receberia. O lock vai até o commit, então
+    # quem grava no log pega o próximo seq só depois que o anterior commitou (ordem de seq =
+    # ordem de commit). No SQLite as escritas já são serializadas pelo lock do banco.
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK)))
+
+def record_change(db: Session, entity: str, entity_id: int, payload: Optional[dict]):
+    record_changes(db, entity, [(entity_id, payload)])
+
+def _compacted_through(db: Session) -> int:
+    value = db.execute(select(SyncState.value).where(SyncState.key == COMPACTED_THROUGH)).scalar_one_or_none()
+    return value or 0
+
+def current_cursor(db: Session) -> int:
+    head = db.execute(select(func.max(ChangeLog.seq))).scalar_one()
+    return max(head or 0, _compacted_through(db))
+
+def parse_since(since: Optional[str]) -> Optional[int]:
+    if since is None:
+        return None
+    try:
+        value = int(since)
+        if value < 0:
+            raise ValueError(since)
+        return value
+    except ValueError:
+        logger.warning("Cursor de sincronização inválido: %s", since)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+def list_changes(db: Session, since: Optional[str] = None, limit: int = SYNC_DEFAULT_LIMIT):
+    logger.info("list_changes called since=%s limit=%s", since, limit)
+    position = parse_since(since)
+    if position is None:
+        # sem cursor: devolve só a posição atual (ponto de partida após uma carga completa)
+        return {"changes": [], "next_cursor": str(current_cursor(db)), "has_more": False}
+    if position < _compacted_through(db):
+        logger.warning("Cursor %s anterior à compactação do log; exige sincronização completa", position)
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor expirado: faça uma sincronização completa e recomece a partir do cursor atual.",
+        )
+    rows = db.execute(
+        select(ChangeLog).where(ChangeLog.seq > position).order_by(ChangeLog.seq).limit(limit + 1)
+    ).scalars().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        {
+            "seq": row.seq,
+            "entity": row.entity,
+            "entity_id": row.entity_id,
+            "op": row.op,
+            "changed_at": row.changed_at,
+            "data": json.loads(row.payload) if row.payload is not None else None,
+        }
+        for row in rows
+    ]
+    next_cursor = rows[-1].seq if rows else position
+    logger.debug("Sync: %d alterações após %s", len(changes), position)
+    return {"changes": changes, "next_cursor": str(next_cursor), "has_more": has_more}
+
+def compact_change_log(db: Session, retention_days: int = SYNC_RETENTION_DAYS):
+    # Remove as entradas além da janela de retenção; cursores anteriores ao
+    # maior seq removido passam a receber 410 (sincronização completa)
+    cutoff = _now() - timedelta(days=retention_days)
+    logger.info("compact_change_log called (antes de %s)", cutoff)
+    through = db.execute(select(func.max(ChangeLog.seq)).where(ChangeLog.changed_at < cutoff)).scalar_one()
+    if through is None:
+        return 0
+    removed = db.execute(delete(ChangeLog).where(ChangeLog.seq <= through)).rowcount
+    state = db.get(SyncState, COMPACTED_THROUGH)
+    if state is None:
+        db.add(SyncState(key=COMPACTED_THROUGH, value=through))
+    else:
+        state.value = max(state.value, through)
+    db.commit()
+    logger.info("Log de alterações compactado: %d entradas removidas (até seq=%d)", removed, through)
+    return removed
@@ -0,0 +1,214 @@
+import os
+import logging
+from typing import List
+from fastapi import HTTPException, status
+from sqlalchemy import insert, update, delete, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.task_model import Task, TaskCreate, TaskBulkUpdate
+from src.models.user_model import User
+from src.models.comment_model import Comment
+from src.controllers.task_controller import validate_task_fields, completed_at_for
+from src.controllers.stats_controller import record_task_changes, task_snapshot
+from src.controllers.etag import next_version
+from src.controllers.list_cache import list_cache, task_filter_fields
+from src.controllers.event_broker import event_broker
+from src.controllers.sync_controller import record_changes, task_payload
+from src.controllers.due_scheduler import due_scheduler
+
+logger = logging.getLogger(__name__)
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+DEFAULT_STATUS = "pending"
+
+def _check_size(size: int):
+    if size > BULK_MAX_ITEMS:
+        logger.warning("Lote acima do limite: %d itens (máximo %d)", size, BULK_MAX_ITEMS)
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Lote com {size} itens excede o máximo de {BULK_MAX_ITEMS}."
+        )
+
+def _active_user_ids(db: Session, ids: set) -> set:
+    # uma única consulta IN (...) para todos os responsáveis do lote
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set(db.execute(select(User.id).where(User.id.in_(ids), User.is_active)).scalars())
+
+def _existing_tasks(db: Session, ids: set) -> dict:
+    # id -> linha com os campos de task_counters, dos filtros e a versão lida, numa única consulta IN (...)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Task.id, Task.status, Task.priority, Task.assigned_to, Task.due_date, Task.version)
+        .where(Task.id.in_(ids))
+    )
+    return {row.id: row for row in rows}
+
+def _claim_unchanged(db: Session, existing: dict, ids: list) -> set:
+    # Marca com a nova versão só as tarefas que ainda estão na versão lida e devolve esses ids.
+    # A linha fica travada até o commit: o estado lido, base do delta dos contadores, é o que
+    # o UPDATE substitui. Tarefas alteradas por outra escrita no meio ficam de fora.
+    return set(db.execute(
+        update(Task)
+        .where(Task.id.in_(ids), tuple_(Task.id, Task.version).in_([(i, existing[i].version) for i in ids]))
+        .values(version=next_version(db, Task))
+        .returning(Task.id).execution_options(synchronize_session=False)
+    ).scalars())
+
+def _error(index: int, detail: str, task_id=None) -> dict:
+    return {"index": index, "id": task_id, "ok": False, "error": detail}
+
+def _commit(db: Session):
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        logger.error("Erro de integridade ao gravar lote de tarefas")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao gravar lote")
+
+def _publish(event_type: str, task_ids: List[int], rows: List[dict]):
+    # um evento por lote (e não por item), para não estourar a fila dos assinantes
+    event_broker.publish(event_type, {"task_ids": task_ids}, rows)
+
+def _summary(results: List[dict]) -> dict:
+    succeeded = sum(1 for r in results if r["ok"])
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+def bulk_create_tasks(tasks: List[TaskCreate], db: Session):
+    logger.info("bulk_create_tasks called with %d itens", len(tasks))
+    _check_size(len(tasks))
+    payloads = [task.model_dump() for task in tasks]
+    active_users = _active_user_ids(db, {p["assigned_to"] for p in payloads})
+
+    results, rows, positions = [None] * len(payloads), [], []
+    for index, payload in enumerate(payloads):
+        try:
+            validate_task_fields(payload)
+        except HTTPException as exc:
+            results[index] = _error(index, exc.detail)
+            continue
+        if payload["assigned_to"] is not None and payload["assigned_to"] not in active_users:
+            results[index] = _error(index, f"Usuário responsável (ID={payload['assigned_to']}) não encontrado.")
+            continue
+        if payload["status"] is None:
+            payload["status"] = DEFAULT_STATUS
+        payload["completed_at"] = completed_at_for(payload["status"])
+        rows.append(payload)
+        positions.append(index)
+
+    if rows:
+        # versões consecutivas reservadas de uma vez no contador da tabela
+        base_version = next_version(db, Task, len(rows)) - len(rows)
+        for offset, row in enumerate(rows, start=1):
+            row["version"] = base_version + offset
+        # INSERT em lote (executemany/insertmanyvalues) numa única transação
+        ids = db.execute(insert(Task).returning(Task.id, sort_by_parameter_order=True), rows).scalars().all()
+        record_task_changes(db, ((None, (r["status"], r["priority"], r["assigned_to"])) for r in rows))
+        record_changes(db, "task", ((task_id, task_payload({**row, "id": task_id})) for task_id, row in zip(ids, rows)))
+        _commit(db)
+        list_cache.invalidate_rows(task_filter_fields(row) for row in rows)
+        for task_id, row in zip(ids, rows):
+            due_scheduler.track({**row, "id": task_id})
+        _publish("task.bulk_created", ids, [task_filter_fields(row) for row in rows])
+        for index, task_id in zip(positions, ids):
+            results[index] = {"index": index, "id": task_id, "ok": True, "error": None}
+    logger.info("Lote de criação: %d gravadas, %d rejeitadas", len(rows), len(payloads) - len(rows))
+    return _summary(results)
+
+def bulk_update_tasks(items: List[TaskBulkUpdate], db: Session):
+    logger.info("bulk_update_tasks called with %d itens", len(items))
+    _check_size(len(items))
+    payloads = [item.model_dump(exclude_unset=True) for item in items]
+    existing = _existing_tasks(db, {p["id"] for p in payloads})
+    active_users = _active_user_ids(db, {p["assigned_to"] for p in payloads if "assigned_to" in p})
+
+    results, rows, current = [None] * len(payloads), [], {}
+    for index, payload in enumerate(payloads):
+        task_id = payload["id"]
+        if task_id not in existing:
+            results[index] = _error(index, f"Tarefa (ID={task_id}) não encontrada.", task_id)
+            continue
+        try:
+            validate_task_fields(payload, partial=True)
+        except HTTPException as exc:
+            results[index] = _error(index, exc.detail, task_id)
+            continue
+        if "assigned_to" in payload and payload["assigned_to"] not in active_users:
+            results[index] = _error(index, f"Usuário responsável (ID={payload['assigned_to']}) não encontrado.", task_id)
+            continue
+        if len(payload) > 1:
+            # estado resultante (um mesmo id pode aparecer mais de uma vez no lote)
+            old = current.get(task_id) or task_filter_fields(existing[task_id])
+            if "status" in payload and payload["status"] != old["status"]:
+                payload["completed_at"] = completed_at_for(payload["status"], old["status"])
+            rows.append(payload)
+            current[task_id] = {field: payload.get(field, value) for field, value in old.items()}
+        results[index] = {"index": index, "id": task_id, "ok": True, "error": None}
+
+    if rows:
+        claimed = _claim_unchanged(db, existing, list(current))
+        conflicted = set(current) - claimed
+        if conflicted:
+            logger.warning("Tarefas alteradas por outra escrita durante o lote: %s", sorted(conflicted))
+            for index, result in enumerate(results):
+                if result["ok"] and result["id"] in conflicted:
+                    results[index] = _error(
+                        index, f"Tarefa (ID={result['id']}) alterada por outra requisição; tente novamente.", result["id"]
+                    )
+            rows = [row for row in rows if row["id"] in claimed]
+            current = {task_id: fields for task_id, fields in current.items() if task_id in claimed}
+    if rows:
+        # UPDATE em lote por chave primária (agrupado por conjunto de colunas)
+        db.execute(update(Task), rows)
+        record_task_changes(db, ((task_snapshot(existing[i]), task_snapshot(new)) for i, new in current.items()))
+        updated = [dict(row) for row in db.execute(select(Task.__table__).where(Task.id.in_(list(current)))).mappings()]
+        record_changes(db, "task", ((row["id"], task_payload(row)) for row in updated))
+        _commit(db)
+        changed_rows = [task_filter_fields(existing[i]) for i in current] + list(current.values())
+        list_cache.invalidate_rows(changed_rows)
+        for row in updated:
+            due_scheduler.track(row)
+        _publish("task.bulk_updated", list(current), changed_rows)
+    logger.info("Lote de atualização: %d aplicadas", sum(1 for r in results if r["ok"]))
+    return _summary(results)
+
+def bulk_delete_tasks(ids: List[int], db: Session):
+    logger.info("bulk_delete_tasks called with %d itens", len(ids))
+    _check_size(len(ids))
+    # DELETE ... RETURNING: o estado removido (base dos contadores) é o da linha apagada,
+    # não o de uma leitura anterior que outra escrita pode ter tornado obsoleta
+    comment_ids = db.execute(
+        delete(Comment).where(Comment.task_id.in_(set(ids))).returning(Comment.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    existing = {
+        row.id: row for row in db.execute(
+            delete(Task).where(Task.id.in_(set(ids)))
+            .returning(Task.id, Task.status, Task.priority, Task.assigned_to, Task.due_date)
+            .execution_options(synchronize_session=False)
+        )
+    }
+
+    if existing:
+        record_task_changes(db, ((task_snapshot(row), None) for row in existing.values()))
+        record_changes(db, "comment", ((comment_id, None) for comment_id in comment_ids))
+        record_changes(db, "task", ((task_id, None) for task_id in existing))
+        _commit(db)
+        deleted_rows = [task_filter_fields(row) for row in existing.values()]
+        list_cache.invalidate_rows(deleted_rows)
+        for task_id in existing:
+            due_scheduler.untrack(task_id)
+        _publish("task.bulk_deleted", list(existing), deleted_rows)
+    else:
+        db.rollback()
+
+    results = [
+        {"index": index, "id": task_id, "ok": True, "error": None} if task_id in existing
+        else _error(index, f"Tarefa (ID={task_id}) não encontrada.", task_id)
+        for index, task_id in enumerate(ids)
+    ]
+    logger.info("Lote de remoção: %d tarefas removidas", len(existing))
+    return _summary(results)
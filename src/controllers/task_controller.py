@@ -1,11 +1,27 @@
+import os
+import io
+import csv
+import json
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from datetime import date
-from sqlalchemy import and_
+from datetime import date, datetime, UTC
+from sqlalchemy import and_, select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
 from typing import Optional
 
-from src.models.task_model import Task, TaskCreate, TaskUpdate
+from src.database import SessionLocal
+from src.models.task_model import Task, TaskCreate, TaskUpdate, TaskOut
 from src.models.user_model import User
+from src.models.comment_model import Comment
+from src.models.archive_model import ArchivedTask
+from src.controllers.pagination import paginate
+from src.controllers.stats_controller import record_task_change, task_snapshot
+from src.controllers.etag import next_version, list_etag
+from src.controllers.list_cache import list_cache, filters_key, task_filter_fields
+from src.controllers.event_broker import event_broker
+from src.controllers.sync_controller import record_change, record_changes, task_payload
+from src.controllers.due_scheduler import due_scheduler
+from src.controllers.fast_json import TASK_ROWS
 
 import logging
 logger = logging.getLogger(__name__)
@@ -13,48 +29,130 @@ logger = logging.getLogger(__name__)
 # Valores válidos para status e prioridade
 ALLOWED_STATUS = {"pending", "in_progress", "done"}
 ALLOWED_PRIORITY = {"low", "medium", "high"}
+# Ordenações de list_tasks_filtered: coluna e sentido (o id desempata no mesmo sentido)
+SORT_OPTIONS = {
+    "due_date": ("due_date", False),
+    "activity": ("last_activity_at", True),   # atividade mais recente primeiro
+    "comments": ("comment_count", True),      # mais comentadas primeiro
+}
+DEFAULT_SORT = "due_date"
 
-def create_task(task: TaskCreate, db: Session):
-    logger.info("create_task called with task: %s", task)
-    # validações de negócio
-    logger.debug("Validando prioridade: %s", task.priority)
-    if task.priority not in ALLOWED_PRIORITY:
-        logger.warning("Prioridade inválida: %s", task.priority)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Prioridade inválida: '{task.priority}'. "
-                f"Use um dos valores: {', '.join(sorted(ALLOWED_PRIORITY))}."
+# Exportação em streaming: colunas de TaskOut, lidas em lotes
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_COLUMNS = list(TaskOut.model_fields)
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# Escritas devolvem a linha gravada via RETURNING (sem SELECT/refresh depois do commit)
+TASK_COLUMNS = tuple(Task.__table__.c)
+# Campos de update_task que não afetam contadores, filtros nem completed_at
+PLAIN_FIELDS = {"title", "description"}
+# Nome da FK tasks.assigned_to -> users.id (convenção padrão do Postgres)
+ASSIGNEE_FK = "tasks_assigned_to_fkey"
+FOREIGN_KEY_VIOLATION = "23503"
+# Releituras de update_task quando outra escrita altera a tarefa entre a leitura e o UPDATE
+UPDATE_ATTEMPTS = int(os.getenv("TASK_UPDATE_ATTEMPTS", "3"))
+
+def validate_task_fields(payload: dict, partial: bool = False):
+    # partial=True (update): só valida os campos enviados; status nulo não é aceito
+    if "priority" in payload:
+        logger.debug("Validando prioridade: %s", payload["priority"])
+        if payload["priority"] not in ALLOWED_PRIORITY:
+            logger.warning("Prioridade inválida: %s", payload["priority"])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Prioridade inválida: '{payload['priority']}'. "
+                    f"Use um dos valores: {', '.join(sorted(ALLOWED_PRIORITY))}."
+                )
             )
-        )
-    logger.debug("Validando status: %s", task.status)
-    if task.status is not None and task.status not in ALLOWED_STATUS:
-        logger.warning("Status inválido: %s", task.status)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f"Status inválido: '{task.status}'. "
-                f"Use um dos valores: {', '.join(sorted(ALLOWED_STATUS))}."
+    if "status" in payload and (partial or payload["status"] is not None):
+        logger.debug("Validando status: %s", payload["status"])
+        if payload["status"] not in ALLOWED_STATUS:
+            logger.warning("Status inválido: %s", payload["status"])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Status inválido: '{payload['status']}'. "
+                    f"Use um dos valores: {', '.join(sorted(ALLOWED_STATUS))}."
+                )
             )
+    if payload.get("due_date") is not None:
+        logger.debug("Validando due_date: %s", payload["due_date"])
+        if payload["due_date"] < date.today():
+            logger.warning("due_date anterior: %s", payload["due_date"])
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="due_date não pode ser anterior à data atual."
+            )
+
+def completed_at_for(new_status: Optional[str], old_status: Optional[str] = None, current=None):
+    # completed_at acompanha a transição para/de done (base do arquivamento)
+    if new_status == old_status:
+        return current
+    return datetime.now(UTC).replace(tzinfo=None) if new_status == "done" else None
+
+def publish_task_event(event_type: str, task_id: int, task=None, rows=()):
+    # notifica o feed de eventos após o commit; só serializa se houver assinantes
+    if not event_broker.subscribers:
+        return
+    data = TaskOut.model_validate(task).model_dump(mode="json") if task is not None else None
+    event_broker.publish(event_type, {"task_id": task_id, "task": data}, rows)
+
+def _is_assignee_violation(exc: IntegrityError) -> bool:
+    # foreign_keys=ON: responsável inexistente viola a FK tasks.assigned_to. No Postgres vale o
+    # SQLSTATE (23503) mais o nome da restrição: psycopg expõe `sqlstate`/`pgcode` e `diag`; o
+    # adaptador do asyncpg (DB_MODE=async) expõe `sqlstate` e guarda a exceção do asyncpg,
+    # com `constraint_name`, em __cause__. O SQLite só diz "FOREIGN KEY constraint failed", e
+    # assigned_to é a única FK das linhas gravadas na criação.
+    orig = exc.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if sqlstate is not None:
+        constraint = (
+            getattr(getattr(orig, "diag", None), "constraint_name", None)
+            or getattr(orig.__cause__, "constraint_name", None)
         )
-    logger.debug("Validando due_date: %s", task.due_date)
-    if task.due_date and task.due_date < date.today():
-        logger.warning("due_date anterior: %s", task.due_date)
+        return sqlstate == FOREIGN_KEY_VIOLATION and constraint == ASSIGNEE_FK
+    return "FOREIGN KEY constraint failed" in str(orig)
+
+def create_task(task: TaskCreate, db: Session):
+    logger.info("create_task called (title=%r, assigned_to=%s)", task.title, task.assigned_to)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("create_task payload: %s", task.model_dump(exclude_unset=True))
+    # validações de negócio
+    validate_task_fields(task.model_dump())
+
+    values = task.model_dump()
+    if values["status"] is None:
+        values.pop("status")  # default da coluna (pending)
+    values["completed_at"] = completed_at_for(values.get("status"))
+    try:
+        # INSERT ... RETURNING: a linha volta com id e defaults, sem refresh
+        stmt = insert(Task).values(**values, version=next_version(db, Task)).returning(*TASK_COLUMNS)
+        db_task = db.execute(stmt).one()
+        record_task_change(db, None, task_snapshot(db_task))
+        record_change(db, "task", db_task.id, task_payload(db_task))
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not _is_assignee_violation(exc):
+            logger.error("Erro de integridade na criação de tarefa: %s", exc.orig)
+            raise
+        logger.warning("Usuário responsável não encontrado na criação: ID=%s", task.assigned_to)
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="due_date não pode ser anterior à data atual."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Usuário responsável (ID={task.assigned_to}) não encontrado."
         )
-
-    db_task = Task(**task.model_dump())
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    list_cache.invalidate_rows([task_filter_fields(db_task)])
+    due_scheduler.track(db_task)
+    publish_task_event("task.created", db_task.id, db_task, [task_filter_fields(db_task)])
     logger.info("Tarefa criada com sucesso: ID=%s", db_task.id)
     return db_task
 
 def get_task(task_id: int, db: Session):
     logger.info("get_task called for ID: %s", task_id)
     task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        # tarefas arquivadas continuam legíveis (somente leitura)
+        task = db.get(ArchivedTask, task_id)
     if not task:
         logger.warning("Tarefa não encontrada: ID=%s", task_id)
         raise HTTPException(
@@ -64,9 +162,7 @@ def get_task(task_id: int, db: Session):
     logger.debug("Tarefa recuperada com sucesso: ID=%s", task_id)
     return task
 
-def list_tasks_by_user(user_id: int, db: Session):
-    logger.info("list_tasks_by_user called for user ID: %s", user_id)
-    # valida existência do usuário antes de listar tarefas
+def _ensure_active_user(user_id: int, db: Session):
     user = db.query(User).filter(User.id == user_id, User.is_active).first()
     if not user:
         logger.warning("Usuário não encontrado para listagem de tarefas: ID=%s", user_id)
@@ -74,98 +170,133 @@ def list_tasks_by_user(user_id: int, db: Session):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Usuário (ID={user_id}) não encontrado."
         )
-    tasks = db.query(Task).filter(Task.assigned_to == user_id).all()
+
+def _task_query(db: Session, model, rows: bool):
+    # rows=True: tuplas com as colunas de TaskOut (caminho FAST_JSON), sem instanciar o ORM
+    return db.query(*TASK_ROWS.columns(model)) if rows else db.query(model)
+
+def list_tasks_by_user(
+    user_id: int, db: Session, limit: Optional[int] = None, cursor: Optional[str] = None, rows: bool = False,
+):
+    logger.info("list_tasks_by_user called for user ID: %s (limit=%s)", user_id, limit)
+    # valida existência do usuário antes de listar tarefas
+    _ensure_active_user(user_id, db)
+    # mesmo cache (e mesma invalidação por responsável) de list_tasks_filtered, com o ETag desta rota
+    cache_key = filters_key(user_id=user_id, limit=limit, cursor=cursor, scope="user")
+    cached = list_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Tarefas do usuário %s servidas do cache: %d", user_id, len(cached))
+        return cached
+    generation = list_cache.generation()
+    query = _task_query(db, Task, rows).filter(Task.assigned_to == user_id)
+    if limit is not None:
+        tasks = paginate(query, Task.due_date, Task.id, limit, cursor)
+    else:
+        tasks = query.order_by(Task.due_date, Task.id).all()
     logger.debug("Total de tarefas retornadas para usuário %s: %d", user_id, len(tasks))
-    return tasks
+    return list_cache.put(cache_key, tasks, generation, _by_user_etag(db, user_id, limit, cursor))
 
-def update_task(task_id: int, data: TaskUpdate, db: Session):
-    logger.info("update_task called for ID: %s with data: %s", task_id, data)
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        logger.warning("Tarefa não encontrada para atualização: ID=%s", task_id)
+def _task_not_found(task_id: int, action: str):
+    logger.warning("Tarefa não encontrada para %s: ID=%s", action, task_id)
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Tarefa (ID={task_id}) não encontrada."
+    )
+
+def _current_task(db: Session, task_id: int, payload: dict):
+    # estado anterior (contadores, cache e completed_at) e, se houver troca de responsável,
+    # a verificação de usuário ativo na mesma consulta
+    columns = list(TASK_COLUMNS)
+    if "assigned_to" in payload:
+        active = select(User.id).where(User.id == payload["assigned_to"], User.is_active).exists()
+        columns.append(active.label("assignee_active"))
+    current = db.execute(select(*columns).where(Task.id == task_id)).one_or_none()
+    if current is None:
+        raise _task_not_found(task_id, "atualização")
+    if "assigned_to" in payload and not current.assignee_active:
+        logger.warning("Usuário responsável não encontrado no update: ID=%s", payload["assigned_to"])
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tarefa (ID={task_id}) não encontrada."
+            detail=f"Usuário responsável (ID={payload['assigned_to']}) não encontrado."
         )
+    return current
 
+def update_task(task_id: int, data: TaskUpdate, db: Session):
     payload = data.model_dump(exclude_unset=True)
+    # só os nomes dos campos no INFO; os valores (título/descrição inteiros) ficam no DEBUG
+    logger.info("update_task called for ID: %s (campos: %s)", task_id, ",".join(payload))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("update_task payload: %s", payload)
 
     # validações de negócio
-    if "priority" in payload:
-        logger.debug("Validando prioridade no payload de update: %s", payload["priority"])
-        if payload["priority"] not in ALLOWED_PRIORITY:
-            logger.warning("Prioridade inválida no update: %s", payload["priority"])
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Prioridade inválida: '{payload['priority']}'. "
-                    f"Use um dos valores: {', '.join(sorted(ALLOWED_PRIORITY))}."
-                )
-            )
-    if "status" in payload:
-        logger.debug("Validando status no payload de update: %s", payload["status"])
-        if payload["status"] not in ALLOWED_STATUS:
-            logger.warning("Status inválido no update: %s", payload["status"])
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Status inválido: '{payload['status']}'. "
-                    f"Use um dos valores: {', '.join(sorted(ALLOWED_STATUS))}."
-                )
-            )
-    if "due_date" in payload:
-        logger.debug("Validando due_date no payload de update: %s", payload["due_date"])
-        if payload["due_date"] < date.today():
-            logger.warning("due_date inválido no update: %s", payload["due_date"])
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="due_date não pode ser anterior à data atual."
-            )
-    if "assigned_to" in payload:
-        logger.debug("Validando assigned_to no payload de update: %s", payload["assigned_to"])
-        assigned_id = payload["assigned_to"]
-        user = db.query(User).filter(User.id == assigned_id, User.is_active).first()
-        if not user:
-            logger.warning("Usuário responsável não encontrado no update: ID=%s", assigned_id)
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Usuário responsável (ID={assigned_id}) não encontrado."
-            )
-
-    for attr, value in payload.items():
-        setattr(task, attr, value)
-
+    validate_task_fields(payload, partial=True)
+    for _ in range(UPDATE_ATTEMPTS):
+        values = dict(payload)
+        # só título/descrição: nada depende do estado anterior, basta o UPDATE (rowcount 0 = 404)
+        current = None if set(payload) <= PLAIN_FIELDS else _current_task(db, task_id, payload)
+        stmt = update(Task).where(Task.id == task_id)
+        if current is not None:
+            if "status" in payload:
+                values["completed_at"] = completed_at_for(payload["status"], current.status, current.completed_at)
+            # o estado lido só vale se ninguém escreveu na linha antes deste UPDATE:
+            # senão o delta dos contadores sairia de um "antes" que já não existe
+            stmt = stmt.where(Task.version == current.version)
+        stmt = (
+            stmt.values(**values, version=next_version(db, Task))
+            .returning(*TASK_COLUMNS).execution_options(synchronize_session=False)
+        )
+        task = db.execute(stmt).one_or_none()
+        if task is not None or current is None:
+            break
+        logger.warning("Tarefa alterada por outra escrita durante a atualização, relendo: ID=%s", task_id)
+    else:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Tarefa (ID={task_id}) alterada por outra requisição; tente novamente."
+        )
+    if task is None:
+        db.rollback()
+        raise _task_not_found(task_id, "atualização")
+    if current is not None:
+        record_task_change(db, task_snapshot(current), task_snapshot(task))
+    record_change(db, "task", task.id, task_payload(task))
     db.commit()
-    db.refresh(task)
+
+    old_fields = task_filter_fields(current if current is not None else task)
+    list_cache.invalidate_rows([old_fields, task_filter_fields(task)])
+    due_scheduler.track(task)
+    publish_task_event("task.updated", task.id, task, [old_fields, task_filter_fields(task)])
     logger.info("Tarefa atualizada com sucesso: ID=%s", task_id)
     return task
 
 def delete_task(task_id: int, db: Session):
     logger.info("delete_task called for ID: %s", task_id)
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
-        logger.warning("Tarefa não encontrada para deleção: ID=%s", task_id)
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Tarefa (ID={task_id}) não encontrada."
-        )
-    db.delete(task)
+    # remove os comentários junto, já que comments.task_id referencia a tarefa;
+    # DELETE ... RETURNING devolve o que foi removido (log de sync e contadores)
+    comment_ids = db.execute(
+        delete(Comment).where(Comment.task_id == task_id).returning(Comment.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    task = db.execute(
+        delete(Task).where(Task.id == task_id).returning(*TASK_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if task is None:
+        db.rollback()
+        raise _task_not_found(task_id, "deleção")
+    record_changes(db, "comment", ((comment_id, None) for comment_id in comment_ids))
+    record_change(db, "task", task_id, None)
+    record_task_change(db, task_snapshot(task), None)
     db.commit()
+    old_fields = task_filter_fields(task)
+    list_cache.invalidate_rows([old_fields])
+    due_scheduler.untrack(task_id)
+    publish_task_event("task.deleted", task_id, rows=[old_fields])
     logger.info("Tarefa removida com sucesso: ID=%s", task_id)
     return {"message": "Tarefa removida com sucesso"}
 
-def list_tasks_filtered(
-    db: Session,
-    status_filter: Optional[str] = None,
-    priority: Optional[str] = None,
-    due_before: Optional[date] = None,
-    user_id: Optional[int] = None,
-):
-    logger.info(
-        "list_tasks_filtered called with "
-        "status_filter=%s, priority=%s, due_before=%s, user_id=%s",
-        status_filter, priority, due_before, user_id
-    )
+def validate_filters(status_filter: Optional[str], priority: Optional[str]):
     # validação de query params
     if priority is not None and priority not in ALLOWED_PRIORITY:
         logger.warning("Prioridade inválida no filtro: %s", priority)
@@ -185,21 +316,186 @@ def list_tasks_filtered(
                 f"Use um dos valores: {', '.join(sorted(ALLOWED_STATUS))}."
             )
         )
-    query = db.query(Task)
+
+def validate_sort(sort: Optional[str]) -> str:
+    sort = sort or DEFAULT_SORT
+    if sort not in SORT_OPTIONS:
+        logger.warning("Ordenação inválida: %s", sort)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ordenação inválida: '{sort}'. Use um dos valores: {', '.join(sorted(SORT_OPTIONS))}."
+        )
+    return sort
+
+def _ordered(query, model, sort: str, limit: Optional[int], cursor: Optional[str]):
+    name, descending = SORT_OPTIONS[sort]
+    column = getattr(model, name)
+    if limit is not None:
+        return paginate(query, column, model.id, limit, cursor, descending=descending)
+    if descending:
+        return query.order_by(column.desc(), model.id.desc()).all()
+    return query.order_by(column, model.id).all()
+
+def build_filters(
+    status_filter: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[date] = None,
+    user_id: Optional[int] = None,
+    model=Task,
+):
+    # model: Task (tabela quente) ou ArchivedTask (archived=true), mesmas colunas
     filters = []
     if status_filter:
-        filters.append(Task.status == status_filter)
+        filters.append(model.status == status_filter)
     if priority:
-        filters.append(Task.priority == priority)
+        filters.append(model.priority == priority)
     if due_before:
-        filters.append(Task.due_date != None)
-        filters.append(Task.due_date < due_before)
+        filters.append(model.due_date != None)
+        filters.append(model.due_date < due_before)
     if user_id:
-        filters.append(Task.assigned_to == user_id)
+        filters.append(model.assigned_to == user_id)
+    return filters
+
+def list_tasks_filtered(
+    db: Session,
+    status_filter: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[date] = None,
+    user_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    archived: bool = False,
+    sort: Optional[str] = None,
+    rows: bool = False,
+):
+    logger.info(
+        "list_tasks_filtered called with "
+        "status_filter=%s, priority=%s, due_before=%s, user_id=%s, limit=%s, archived=%s, sort=%s",
+        status_filter, priority, due_before, user_id, limit, archived, sort
+    )
+    validate_filters(status_filter, priority)
+    sort = validate_sort(sort)
+    if archived:
+        return _list_archived(db, status_filter, priority, due_before, user_id, limit, cursor, sort, rows)
+    # combinações de filtros repetidas são servidas do cache (invalidado pelas escritas)
+    cache_key = filters_key(status_filter, priority, due_before, user_id, limit, cursor, sort)
+    cached = list_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Listagem servida do cache: %d tarefas", len(cached))
+        return cached
+    generation = list_cache.generation()
 
+    query = _task_query(db, Task, rows)
+    filters = build_filters(status_filter, priority, due_before, user_id)
     if filters:
         query = query.filter(and_(*filters))
 
-    result = query.order_by(Task.due_date).all()
+    result = _ordered(query, Task, sort, limit, cursor)
     logger.debug("Total de tarefas após filtros: %d", len(result))
-    return result
+    # o ETag vai na mesma entrada: com o cache quente, ETag e página saem sem SQL
+    etag = _filtered_etag(db, Task, status_filter, priority, due_before, user_id, limit, cursor, sort)
+    return list_cache.put(cache_key, result, generation, etag)
+
+def _list_archived(db: Session, status_filter, priority, due_before, user_id, limit, cursor, sort=DEFAULT_SORT,
+                   rows=False):
+    # tabela fria: lida direto, fora do cache de listagens (só o arquivamento a altera)
+    query = _task_query(db, ArchivedTask, rows)
+    filters = build_filters(status_filter, priority, due_before, user_id, model=ArchivedTask)
+    if filters:
+        query = query.filter(and_(*filters))
+    return _ordered(query, ArchivedTask, sort, limit, cursor)
+
+def _filtered_etag(db: Session, model, status_filter, priority, due_before, user_id, limit, cursor, sort) -> str:
+    query = db.query(model)
+    filters = build_filters(status_filter, priority, due_before, user_id, model=model)
+    if filters:
+        query = query.filter(and_(*filters))
+    params = (status_filter, priority, due_before, user_id, limit, cursor) + ((True,) if model is ArchivedTask else ())
+    if sort != DEFAULT_SORT:
+        params += (sort,)
+    return list_etag(query, model.version, *params)
+
+def _by_user_etag(db: Session, user_id: int, limit, cursor) -> str:
+    return list_etag(db.query(Task).filter(Task.assigned_to == user_id), Task.version, user_id, limit, cursor)
+
+def tasks_filtered_etag(
+    db: Session,
+    status_filter: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[date] = None,
+    user_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    archived: bool = False,
+    sort: Optional[str] = None,
+):
+    # ETag fraco da listagem filtrada, sem carregar as tarefas. Com a listagem em cache o ETag
+    # vem da mesma entrada, sem consulta; senão COUNT + MAX(version) sobre o conjunto filtrado
+    validate_filters(status_filter, priority)
+    sort = validate_sort(sort)
+    if not archived:
+        cached = list_cache.get(filters_key(status_filter, priority, due_before, user_id, limit, cursor, sort))
+        if cached is not None and cached.etag is not None:
+            return cached.etag
+    model = ArchivedTask if archived else Task
+    return _filtered_etag(db, model, status_filter, priority, due_before, user_id, limit, cursor, sort)
+
+def tasks_by_user_etag(user_id: int, db: Session, limit: Optional[int] = None, cursor: Optional[str] = None):
+    _ensure_active_user(user_id, db)
+    cached = list_cache.get(filters_key(user_id=user_id, limit=limit, cursor=cursor, scope="user"))
+    if cached is not None and cached.etag is not None:
+        return cached.etag
+    return _by_user_etag(db, user_id, limit, cursor)
+
+def export_tasks(
+    fmt: str = "ndjson",
+    status_filter: Optional[str] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[date] = None,
+    user_id: Optional[int] = None,
+    session_factory=SessionLocal,
+):
+    logger.info(
+        "export_tasks called with fmt=%s, status_filter=%s, priority=%s, due_before=%s, user_id=%s",
+        fmt, status_filter, priority, due_before, user_id
+    )
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato inválido: '{fmt}'. Use um dos valores: {', '.join(sorted(EXPORT_FORMATS))}."
+        )
+    # valida antes de começar a transmitir, para ainda poder responder 400
+    validate_filters(status_filter, priority)
+    filters = build_filters(status_filter, priority, due_before, user_id)
+    return _stream_rows(fmt, filters, session_factory)
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+def _encode_batch(fmt: str, rows) -> str:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def _stream_rows(fmt: str, filters, session_factory):
+    # Sessão própria: o gerador vive além da dependency get_db da requisição
+    if fmt == "csv":
+        yield _encode_batch("csv", [EXPORT_COLUMNS])
+    db = session_factory()
+    total = 0
+    try:
+        stmt = select(*(getattr(Task, column) for column in EXPORT_COLUMNS)).where(*filters).order_by(Task.id)
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            total += len(batch)
+            yield _encode_batch(fmt, batch)
+    finally:
+        db.close()
+        logger.info("Exportação concluída: %d tarefas (%s)", total, fmt)
@@ -1,29 +1,37 @@
 import logging
+from typing import Optional
 from fastapi import HTTPException, status, Depends
+from sqlalchemy import insert, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from passlib.hash import bcrypt
 from src.models.user_model import User, UserCreate, UserUpdate
-from src.controllers.utils import get_db
+from src.controllers.utils import get_db, run_db
+from src.auth.principal_cache import principal_cache
+from src.auth.password_hashing import hash_password, hash_password_async
+from src.controllers.sync_controller import record_change, user_payload
 
 logger = logging.getLogger(__name__)
 
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+# Escritas devolvem a linha gravada via RETURNING (sem SELECT/refresh depois do commit)
+USER_COLUMNS = tuple(User.__table__.c)
+
+def create_user(user: UserCreate, db: Session = Depends(get_db), hashed_password: Optional[str] = None):
     logger.info("Tentando criar usuário email=%s", user.email)
-    if db.query(User).filter(User.email == user.email).first():
-        logger.warning("Email já existente: %s", user.email)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já cadastrado")
-    hashed_pw = bcrypt.hash(user.password)
-    db_user = User(name=user.name, email=user.email, hashed_password=hashed_pw)
-    db.add(db_user)
+    # hashed_password: hash já calculado pela rota (create_user_async)
+    hashed_pw = hashed_password or hash_password(user.password)
     try:
+        # o índice único de email substitui a consulta prévia: duplicado = IntegrityError
+        db_user = db.execute(
+            insert(User).values(name=user.name, email=user.email, hashed_password=hashed_pw)
+            .returning(*USER_COLUMNS)
+        ).one()
+        record_change(db, "user", db_user.id, user_payload(db_user))
         db.commit()
         logger.info("Usuário criado com ID=%d", db_user.id)
     except IntegrityError:
         db.rollback()
-        logger.error("Erro de integridade ao criar usuário: email=%s", user.email)
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Falha ao criar usuário")
-    db.refresh(db_user)
+        logger.warning("Email já existente: %s", user.email)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já cadastrado")
     return db_user
 
 def get_user(user_id: int, db: Session = Depends(get_db)):
@@ -34,33 +42,73 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
     return user
 
-def update_user(user_id: int, data: UserUpdate, db: Session = Depends(get_db)):
+def _user_not_found(user_id: int, message: str):
+    logger.warning(message, user_id)
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
+
+def update_user(
+    user_id: int, data: UserUpdate, db: Session = Depends(get_db), hashed_password: Optional[str] = None,
+):
     logger.info("Atualizando usuário ID=%d", user_id)
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
-    if not user:
-        logger.warning("Tentativa de atualização de usuário inválido/inativo: ID=%d", user_id)
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
+    values = {}
     if data.name:
-        user.name = data.name
+        values["name"] = data.name
     if data.email:
-        if db.query(User).filter(User.email == data.email, User.id != user_id).first():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já em uso")
-        user.email = data.email
+        values["email"] = data.email
     if data.password:
         logger.info("Atualizando senha do usuário ID=%d", user_id)
-        user.hashed_password = bcrypt.hash(data.password)
+        if hashed_password is None:
+            # usuário inexistente/inativo responde 404 sem pagar o bcrypt
+            get_user(user_id, db)
+            hashed_password = hash_password(data.password)
+        values["hashed_password"] = hashed_password
+    if not values:
+        return get_user(user_id, db)
+    try:
+        # UPDATE ... RETURNING: nenhuma linha = usuário inexistente/inativo; email repetido viola o índice único
+        user = db.execute(
+            update(User).where(User.id == user_id, User.is_active == True).values(**values)
+            .returning(*USER_COLUMNS).execution_options(synchronize_session=False)
+        ).one_or_none()
+    except IntegrityError:
+        db.rollback()
+        logger.warning("Email já em uso: %s", data.email)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email já em uso")
+    if user is None:
+        db.rollback()
+        raise _user_not_found(user_id, "Tentativa de atualização de usuário inválido/inativo: ID=%d")
+    record_change(db, "user", user.id, user_payload(user))
     db.commit()
+    principal_cache.invalidate(user_id)
     logger.info("Usuário atualizado: ID=%d", user_id)
-    db.refresh(user)
     return user
 
+async def create_user_async(user: UserCreate, db):
+    # rota: bcrypt aguardado pelo event loop no pool de senhas, INSERT via run_db
+    hashed = await hash_password_async(user.password)
+    return await run_db(db, create_user, user, hashed_password=hashed)
+
+async def update_user_async(user_id: int, data: UserUpdate, db):
+    hashed = None
+    if data.password:
+        # existência verificada antes do bcrypt: usuário inexistente responde 404 sem custo de hash
+        await run_db(db, get_user, user_id)
+        hashed = await hash_password_async(data.password)
+    return await run_db(db, update_user, user_id, data, hashed_password=hashed)
+
 def delete_user(user_id: int, db: Session = Depends(get_db)):
     logger.info("Deletando usuário ID=%d", user_id)
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        logger.warning("Usuário não encontrado para deleção: ID=%d", user_id)
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Usuário não encontrado")
-    user.is_active = False
+    deleted = db.execute(
+        update(User).where(User.id == user_id).values(is_active=False)
+        .returning(User.id).execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if deleted is None:
+        db.rollback()
+        raise _user_not_found(user_id, "Usuário não encontrado para deleção: ID=%d")
+    # usuário desativado some das listagens: para o sync é uma remoção
+    record_change(db, "user", user_id, None)
     db.commit()
+    # derruba sessões em cache para que o usuário perca acesso imediatamente
+    principal_cache.invalidate(user_id)
     logger.info("Usuário desativado (soft-delete): ID=%d", user_id)
     return {"message": "Usuário desativado com sucesso"}
@@ -1,5 +1,7 @@
 import logging
-from src.database import SessionLocal
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.database import SessionLocal, AsyncSessionLocal, ASYNC_MODE
 
 logger = logging.getLogger(__name__)
 
@@ -11,3 +13,20 @@ def get_db():
     finally:
         db.close()
         logger.debug("Sessão de DB fechada")
+
+async def get_async_db():
+    logger.debug("Abrindo sessão assíncrona de DB")
+    async with AsyncSessionLocal() as db:
+        yield db
+    logger.debug("Sessão assíncrona de DB fechada")
+
+# Dependency das rotas assíncronas: escolhida na inicialização via DB_MODE
+get_route_db = get_async_db if ASYNC_MODE else get_db
+
+async def run_db(db, fn, *args, **kwargs):
+    # Executa um controller síncrono sem bloquear o event loop:
+    # - AsyncSession: roda no greenlet da sessão, com I/O assíncrono real
+    # - Session: roda no threadpool, como uma rota `def` faria
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(*args, db=session, **kwargs))
+    return await run_in_threadpool(fn, *args, db=db, **kwargs)
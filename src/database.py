@@ -1,22 +1,157 @@
 # app/database.py
-from sqlalchemy import create_engine
+import os
+import time
+import logging
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 
-# URL para SQLite (arquivo local)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./sql_app.db"
+from src.sql_profiler import SQL_PROFILING, sql_profiler
 
-# Para SQLite, precisa dessa flag para permitir múltiplas threads
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+logger = logging.getLogger(__name__)
+
+# URL de conexão (padrão: SQLite em arquivo local)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
+
+# Modo de acesso ao banco nas rotas: "sync" (threadpool) ou "async" (AsyncSession)
+DB_MODE = os.getenv("DB_MODE", "sync")
+ASYNC_MODE = DB_MODE == "async"
+
+# Drivers assíncronos usados quando ASYNC_DATABASE_URL não é informado
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        # backend sem driver conhecido: informe ASYNC_DATABASE_URL explicitamente
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+# Pool de conexões (ignorado para SQLite em memória, que usa uma conexão única)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# PRAGMAs aplicados em cada nova conexão SQLite. WAL permite leitores
+# concorrentes a um escritor; synchronous=NORMAL é seguro em WAL e evita
+# um fsync por commit.
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),  # negativo = KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "foreign_keys": os.getenv("SQLITE_FOREIGN_KEYS", "ON"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def _engine_kwargs(parsed) -> dict:
+    kwargs = {"pool_pre_ping": True}
+    if parsed.get_backend_name() == "sqlite":
+        # Para SQLite, precisa dessa flag para permitir múltiplas threads
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(parsed):
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return kwargs
+
+def _install_sqlite_pragmas(sync_engine, sqlite_pragmas: dict):
+    @event.listens_for(sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in sqlite_pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def _install_query_profiling(sync_engine):
+    # duração de cada comando, atribuída à requisição corrente pelo sql_profiler
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            sql_profiler.record(statement, time.perf_counter() - started)
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, sqlite_pragmas: dict | None = SQLITE_PRAGMAS):
+    parsed = make_url(url)
+    db_engine = create_engine(url, **_engine_kwargs(parsed))
+    if parsed.get_backend_name() == "sqlite" and sqlite_pragmas:
+        _install_sqlite_pragmas(db_engine, sqlite_pragmas)
+    if SQL_PROFILING:
+        _install_query_profiling(db_engine)
+    logger.info("Engine de banco criada para %s", parsed.render_as_string(hide_password=True))
+    return db_engine
+
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, sqlite_pragmas: dict | None = SQLITE_PRAGMAS):
+    parsed = make_url(url)
+    db_engine = create_async_engine(url, **_engine_kwargs(parsed))
+    if parsed.get_backend_name() == "sqlite" and sqlite_pragmas:
+        # eventos de conexão ficam na engine síncrona subjacente
+        _install_sqlite_pragmas(db_engine.sync_engine, sqlite_pragmas)
+    if SQL_PROFILING:
+        _install_query_profiling(db_engine.sync_engine)
+    logger.info("Engine assíncrona criada para %s", parsed.render_as_string(hide_password=True))
+    return db_engine
+
+# A engine síncrona existe nos dois modos (criação de tabelas, seed, scripts)
+engine = create_db_engine()
 
 # Factory de sessões
 SessionLocal = sessionmaker(
-    autocommit=False, 
-    autoflush=False, 
+    autocommit=False,
+    autoflush=False,
     bind=engine
 )
 
+# Engine/sessões assíncronas, criadas apenas com DB_MODE=async (requer aiosqlite/asyncpg)
+async_engine = None
+AsyncSessionLocal = None
+if ASYNC_MODE:
+    async_engine = create_async_db_engine()
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        # objetos retornados são serializados fora da sessão; evita lazy-load após commit
+        expire_on_commit=False,
+    )
+
 # Classe base para os models
 Base = declarative_base()
+
+# Diretório das migrações Alembic (raiz do repositório)
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+def run_migrations(url: str | None = None, revision: str = "head"):
+    # Aplica as migrações pendentes; substitui o Base.metadata.create_all da inicialização
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    if url:
+        cfg.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    logger.info("Aplicando migrações até %s", revision)
+    command.upgrade(cfg, revision)
+
+def pool_stats(db_engine=None):
+    pool = (db_engine or engine).pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        stats[name] = method() if callable(method) else None
+    return stats
@@ -0,0 +1,135 @@
+import os
+import queue
+import atexit
+import random
+import logging
+import logging.config
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+logger = logging.getLogger(__name__)
+
+# Nível do logger raiz; INFO desliga o DEBUG na origem (os guards isEnabledFor pulam a formatação)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG").upper()
+# Registros pendentes entre as requisições e a thread de escrita (0 = handlers síncronos, sem fila)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Fração dos registros DEBUG mantidos (1 = todos); INFO e acima nunca são amostrados
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1"))
+
+class PipelineStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = {}  # nível -> registros descartados com a fila cheia
+        self.sampled_out = 0
+
+    def clear(self):
+        with self._lock:
+            self.enqueued = self.sampled_out = 0
+            self.dropped.clear()
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def drop(self, level: str):
+        with self._lock:
+            self.dropped[level] = self.dropped.get(level, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"enqueued": self.enqueued, "dropped": dict(self.dropped), "sampled_out": self.sampled_out}
+
+pipeline_stats = PipelineStats()
+
+class DebugSampler(logging.Filter):
+    # roda antes da formatação: registros DEBUG descartados não custam o %-format nem a fila
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE, stats: PipelineStats = pipeline_stats):
+        super().__init__()
+        self.rate = rate
+        self.stats = stats
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate:
+            return True
+        self.stats.count("sampled_out")
+        return False
+
+class DroppingQueueHandler(QueueHandler):
+    # fila limitada: com a thread de escrita atrasada (disco lento), a requisição
+    # descarta o registro e segue, em vez de esperar pelo disco
+    def __init__(self, log_queue: queue.Queue, stats: PipelineStats = pipeline_stats):
+        super().__init__(log_queue)
+        self.stats = stats
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.stats.drop(record.levelname)
+        else:
+            self.stats.count("enqueued")
+
+class BlockingStopListener(QueueListener):
+    def enqueue_sentinel(self):
+        # no encerramento espera espaço na fila: os registros pendentes são escritos antes de parar
+        self.queue.put(self._sentinel)
+
+_listener = None
+_queue = None
+_sampler = DebugSampler()
+
+def setup_logging(config: dict, queue_size: int = LOG_QUEUE_SIZE, sample_rate: float = LOG_DEBUG_SAMPLE_RATE):
+    # Aplica o dictConfig e move os handlers do logger raiz para uma thread de escrita:
+    # a requisição só formata a mensagem e a enfileira (QueueHandler)
+    global _listener, _queue
+    stop_logging()
+    logging.config.dictConfig(config)
+    root = logging.getLogger()
+    _sampler.rate = sample_rate
+    if queue_size <= 0:
+        for handler in root.handlers:
+            handler.addFilter(_sampler)
+        return None
+    handlers = list(root.handlers)
+    for handler in handlers:
+        root.removeHandler(handler)
+    _queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(_queue)
+    queue_handler.addFilter(_sampler)
+    root.addHandler(queue_handler)
+    _listener = BlockingStopListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def stop_logging():
+    # esvazia a fila e encerra a thread de escrita (shutdown do app e atexit); os handlers
+    # voltam ao logger raiz, síncronos, para os registros emitidos depois do encerramento
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.addFilter(_sampler)
+        root.addHandler(handler)
+
+def logging_stats():
+    counters = pipeline_stats.snapshot()
+    return {
+        "level": logging.getLevelName(logging.getLogger().level),
+        "queued": _listener is not None,
+        "queue_size": _queue.maxsize if _listener is not None else 0,
+        "pending": _queue.qsize() if _listener is not None else 0,
+        "enqueued": counters["enqueued"],
+        "dropped": counters["dropped"],
+        "dropped_total": sum(counters["dropped"].values()),
+        "debug_sample_rate": _sampler.rate,
+        "sampled_out": counters["sampled_out"],
+    }
+
+atexit.register(stop_logging)
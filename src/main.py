@@ -1,14 +1,22 @@
 import os
-import logging.config
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import uvicorn
 
-from src.database import Base, engine
+from src.compression import CompressionMiddleware
+from src.sql_profiler import SQL_PROFILING, SQLProfilingMiddleware
+from src.logging_pipeline import LOG_LEVEL, setup_logging, stop_logging
+from src.database import async_engine, run_migrations
 from src.controllers.utils import get_db
 from src.models.user_model import User
-from passlib.hash import bcrypt
-from src.views import user_routes, task_routes, auth_routes, comment_routes
+from src.auth import password_hashing
+from src.controllers.due_scheduler import due_scheduler, load_due_scheduler
+from src.controllers.archive_controller import run_archiver, ARCHIVE_INTERVAL_SECONDS
+from src.views import user_routes, task_routes, auth_routes, comment_routes, admin_routes, sync_routes
 
 # Garante que a pasta de logs exista antes de criar o handler de arquivo
 os.makedirs("logs", exist_ok=True)
@@ -39,21 +47,43 @@ LOGGING_CONFIG = {
         },
     },
     "root": {
-        "level": "DEBUG",
+        "level": LOG_LEVEL,
         "handlers": ["console", "file"],
     },
 }
 
-logging.config.dictConfig(LOGGING_CONFIG)
+# console e arquivo são escritos por uma thread dedicada (QueueHandler + QueueListener):
+# a latência das requisições não depende da velocidade do disco de logs/app.log
+setup_logging(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 logger.info("Configuração de logging aplicada")
 # --------------------------------------------------------
 
-app = FastAPI(title="Gestão de Tarefas")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(load_due_scheduler)
+    scheduler_task = asyncio.create_task(due_scheduler.run())
+    archiver_task = asyncio.create_task(run_archiver()) if ARCHIVE_INTERVAL_SECONDS > 0 else None
+    yield
+    logger.info("Encerrando agenda de vencimentos")
+    scheduler_task.cancel()
+    if archiver_task is not None:
+        archiver_task.cancel()
+    logger.info("Encerrando pool de senhas")
+    password_hashing.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    logger.info("Encerrando fila de logs")
+    stop_logging()
+
+app = FastAPI(title="Gestão de Tarefas", lifespan=lifespan)
 logger.info("FastAPI app instanciada")
+app.add_middleware(CompressionMiddleware)
+if SQL_PROFILING:
+    app.add_middleware(SQLProfilingMiddleware)
 
-logger.info("Criando tabelas no banco de dados")
-Base.metadata.create_all(bind=engine)
+logger.info("Atualizando esquema do banco de dados")
+run_migrations()
 
 logger.info("Registrando rotas de usuário")
 app.include_router(user_routes.router, prefix="/users", tags=["Users"])
@@ -63,12 +93,16 @@ logger.info("Registrando rotas de autenticação")
 app.include_router(auth_routes.router, prefix="/auth", tags=["Auth"])
 logger.info("Registrando rotas de comentários")
 app.include_router(comment_routes.router, tags=["Comments"])
+logger.info("Registrando rotas administrativas")
+app.include_router(admin_routes.router, prefix="/admin", tags=["Admin"])
+logger.info("Registrando rotas de sincronização")
+app.include_router(sync_routes.router, prefix="/sync", tags=["Sync"])
 
 # Cria usuário inicial se não existir
 db: Session = next(get_db())
 if db.query(User).filter_by(email="root@root.com").count() < 1:
     logger.info("Criando usuário inicial 'root@root.com'")
-    db_user = User(name="root", email="root@root.com", hashed_password=bcrypt.hash("root"))
+    db_user = User(name="root", email="root@root.com", hashed_password=password_hashing.hash_password("root"))
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
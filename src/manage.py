@@ -0,0 +1,131 @@
+# Comandos administrativos: python -m src.manage <comando>
+import sys
+import argparse
+import logging
+
+from src.database import run_migrations
+
+logger = logging.getLogger(__name__)
+
+def cmd_migrate(args):
+    run_migrations(args.url, args.revision)
+    print(f"Esquema atualizado até {args.revision}")
+    return 0
+
+def cmd_explain(args):
+    from src.query_plans import check_query_plans
+    violations, warnings = check_query_plans()
+    for name, statement, detail in warnings:
+        print(f"[aviso] {name}: {detail}\n    {' '.join(statement.split())}")
+    for name, statement, detail in violations:
+        print(f"[ERRO] {name}: {detail}\n    {' '.join(statement.split())}")
+    if violations:
+        print(f"{len(violations)} consulta(s) com varredura completa de tabela")
+        return 1
+    print("Todas as consultas dos controllers usam índices")
+    return 0
+
+def cmd_reconcile_stats(args):
+    from src.database import SessionLocal
+    from src.controllers.stats_controller import reconcile_task_stats
+    with SessionLocal() as db:
+        drift = reconcile_task_stats(db, apply=not args.dry_run)
+    for dimension, value, stored, actual in drift:
+        print(f"{dimension}={value}: armazenado={stored} real={actual}")
+    if not drift:
+        print("Contadores de tarefas consistentes")
+    elif args.dry_run:
+        print(f"{len(drift)} grupo(s) divergente(s); rode sem --dry-run para corrigir")
+    else:
+        print(f"{len(drift)} grupo(s) divergente(s) corrigido(s)")
+    return 1 if drift and args.dry_run else 0
+
+def cmd_reconcile_comments(args):
+    from src.database import SessionLocal
+    from src.controllers.comment_controller import reconcile_comment_activity
+    with SessionLocal() as db:
+        drift = reconcile_comment_activity(db, apply=not args.dry_run)
+    for task_id, stored_count, actual_count, stored_last, actual_last in drift:
+        print(f"tarefa {task_id}: comment_count {stored_count} -> {actual_count}, "
+              f"last_activity_at {stored_last} -> {actual_last}")
+    if not drift:
+        print("Contagem de comentários e última atividade consistentes")
+    elif args.dry_run:
+        print(f"{len(drift)} tarefa(s) divergente(s); rode sem --dry-run para corrigir")
+    else:
+        print(f"{len(drift)} tarefa(s) divergente(s) corrigida(s)")
+    return 1 if drift and args.dry_run else 0
+
+def cmd_rebuild_search(args):
+    from src.database import SessionLocal
+    from src.controllers.search_controller import rebuild_search_index
+    with SessionLocal() as db:
+        total = rebuild_search_index(db)
+    print(f"Índice de busca reconstruído: {total} tarefas")
+    return 0
+
+def cmd_compact_changes(args):
+    from src.database import SessionLocal
+    from src.controllers.sync_controller import compact_change_log, SYNC_RETENTION_DAYS
+    retention_days = SYNC_RETENTION_DAYS if args.retention_days is None else args.retention_days
+    with SessionLocal() as db:
+        removed = compact_change_log(db, retention_days)
+    print(f"Log de alterações compactado: {removed} entradas removidas")
+    return 0
+
+def cmd_archive_tasks(args):
+    from src.database import SessionLocal
+    from src.controllers.archive_controller import archive_done_tasks, ARCHIVE_AFTER_DAYS, ARCHIVE_CHUNK_SIZE
+    older_than = ARCHIVE_AFTER_DAYS if args.older_than_days is None else args.older_than_days
+    chunk_size = ARCHIVE_CHUNK_SIZE if args.chunk_size is None else args.chunk_size
+    with SessionLocal() as db:
+        summary = archive_done_tasks(db, older_than, chunk_size)
+    print(
+        f"{summary['archived_tasks']} tarefas e {summary['archived_comments']} comentários arquivados "
+        f"em {summary['chunks']} lotes ({summary['seconds']}s); "
+        f"tabela quente: {summary['hot_tasks_before']} -> {summary['hot_tasks_after']} tarefas"
+    )
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.manage")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="aplica as migrações pendentes")
+    migrate.add_argument("--url", default=None, help="URL do banco (padrão: DATABASE_URL)")
+    migrate.add_argument("--revision", default="head")
+    migrate.set_defaults(func=cmd_migrate)
+
+    explain = sub.add_parser("explain", help="EXPLAIN QUERY PLAN de todas as consultas; falha em varreduras")
+    explain.set_defaults(func=cmd_explain)
+
+    reconcile = sub.add_parser("reconcile-stats", help="recalcula os contadores de /tasks/stats e reporta divergências")
+    reconcile.add_argument("--dry-run", action="store_true", help="apenas reporta, sem regravar os contadores")
+    reconcile.set_defaults(func=cmd_reconcile_stats)
+
+    comments = sub.add_parser(
+        "reconcile-comments", help="recalcula comment_count/last_activity_at das tarefas e reporta divergências"
+    )
+    comments.add_argument("--dry-run", action="store_true", help="apenas reporta, sem corrigir as tarefas")
+    comments.set_defaults(func=cmd_reconcile_comments)
+
+    rebuild = sub.add_parser("rebuild-search", help="reindexa título/descrição de todas as tarefas (FTS5)")
+    rebuild.set_defaults(func=cmd_rebuild_search)
+
+    compact = sub.add_parser("compact-changes", help="remove do log de sincronização as alterações além da retenção")
+    compact.add_argument("--retention-days", type=int, default=None, help="padrão: SYNC_RETENTION_DAYS")
+    compact.set_defaults(func=cmd_compact_changes)
+
+    archive = sub.add_parser("archive-tasks", help="move tarefas concluídas antigas (e comentários) para as tabelas de arquivo")
+    archive.add_argument("--older-than-days", type=int, default=None, help="padrão: ARCHIVE_AFTER_DAYS")
+    archive.add_argument("--chunk-size", type=int, default=None, help="tarefas por transação (padrão: ARCHIVE_CHUNK_SIZE)")
+    archive.set_defaults(func=cmd_archive_tasks)
+    return parser
+
+def main(argv=None):
+    logging.basicConfig(level=logging.WARNING)
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from src.database import Base
+
+# SQLAlchemy Models
+# Tabelas frias: tarefas concluídas há mais de ARCHIVE_AFTER_DAYS e seus comentários,
+# movidas de tasks/comments pelo arquivamento. Mesmas colunas + archived_at.
+class ArchivedTask(Base):
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String, nullable=False)
+    description = Column(String)
+    status = Column(String)
+    priority = Column(String)
+    due_date = Column(Date, nullable=True)
+    assigned_to = Column(Integer)
+    version = Column(Integer, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    # listagem com archived=true: mesma ordenação (due_date, id) da tabela quente
+    __table_args__ = (
+        Index("ix_tasks_archive_due_date", "due_date"),
+        Index("ix_tasks_archive_assigned_to_due_date", "assigned_to", "due_date"),
+        Index("ix_tasks_archive_version", "version"),
+    )
+
+class ArchivedComment(Base):
+    __tablename__ = "comments_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    content = Column(String, nullable=False)
+    task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime)
+    version = Column(Integer, nullable=False)
+    archived_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_comments_archive_task_id_created_at", "task_id", "created_at"),
+    )
@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from src.database import Base
+
+# SQLAlchemy Models
+class ChangeLog(Base):
+    # Log append-only das escritas (gravado na mesma transação da alteração).
+    # AUTOINCREMENT: seq nunca é reutilizado, mesmo após a compactação.
+    __tablename__ = "change_log"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)      # task | comment | user
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)          # upsert | delete
+    changed_at = Column(DateTime, nullable=False)
+    payload = Column(Text)                       # JSON do estado após a escrita (nulo em delete)
+
+    __table_args__ = (
+        Index("ix_change_log_changed_at", "changed_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+class SyncState(Base):
+    # Valores globais do sync (ex.: compacted_through = maior seq removido pela compactação)
+    __tablename__ = "sync_state"
+
+    key = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False)
+
+# Pydantic Schemas
+class ChangeOut(BaseModel):
+    seq: int = Field(..., description="Posição da alteração no log")
+    entity: str = Field(..., description="Tipo do registro (task|comment|user)")
+    entity_id: int = Field(..., description="ID do registro alterado")
+    op: str = Field(..., description="upsert (criado/alterado) ou delete (tombstone)")
+    changed_at: datetime = Field(..., description="Momento da alteração")
+    data: Optional[Any] = Field(None, description="Estado atual do registro (nulo em delete)")
+
+class ChangesPageOut(BaseModel):
+    changes: List[ChangeOut] = Field(..., description="Alterações posteriores ao cursor, em ordem")
+    next_cursor: str = Field(..., description="Cursor para a próxima chamada (since)")
+    has_more: bool = Field(..., description="Há mais alterações além desta página")
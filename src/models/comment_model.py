@@ -1,7 +1,7 @@
 from datetime import datetime, UTC
 from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
 from src.database import Base
 
 # SQLAlchemy Model
@@ -12,7 +12,18 @@ class Comment(Base):
     content = Column(String, nullable=False)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    # callable: avaliado a cada INSERT (datetime.now(UTC) direto seria fixado no import)
+    created_at = Column(DateTime, default=lambda: datetime.now(UTC))
+    # versão monotônica na tabela (version_counters, a cada escrita), base dos ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # list_comments: filtro por task_id ordenado por (created_at, id), inclusive no desempate
+    __table_args__ = (
+        Index("ix_comments_task_id_created_at_id", "task_id", "created_at", "id"),
+        Index("ix_comments_version", "version"),
+        # ids nunca reutilizados: um comentário novo não colide com um já arquivado
+        {"sqlite_autoincrement": True},
+    )
 
 # Pydantic Schemas
 class CommentCreate(BaseModel):
@@ -0,0 +1,25 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from sqlalchemy import Column, Integer, String
+from src.database import Base
+
+# SQLAlchemy Model
+class TaskCounter(Base):
+    # Contadores de tarefas por dimensão, mantidos na mesma transação das escritas.
+    # dimension: total | status | priority | assigned_to; value: valor do grupo ("none" = nulo)
+    __tablename__ = "task_counters"
+
+    dimension = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+# Pydantic Schemas
+class AssigneeCount(BaseModel):
+    assigned_to: Optional[int] = Field(None, description="ID do usuário responsável (nulo = sem responsável)")
+    count: int = Field(..., description="Quantidade de tarefas")
+
+class TaskStatsOut(BaseModel):
+    total: int = Field(..., description="Total de tarefas")
+    by_status: Dict[str, int] = Field(..., description="Tarefas por status")
+    by_priority: Dict[str, int] = Field(..., description="Tarefas por prioridade")
+    by_assignee: List[AssigneeCount] = Field(..., description="Tarefas por responsável")
@@ -1,8 +1,10 @@
-from typing import Optional
-from datetime import date
+from typing import Optional, List
+from datetime import date, datetime
 from pydantic import BaseModel, Field, ConfigDict
-from sqlalchemy import Column, Integer, String, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Index, DDL, event
 from src.database import Base
+from src.models.user_model import UserOut
+from src.models.comment_model import CommentOut
 
 # SQLAlchemy Model
 class Task(Base):
@@ -15,6 +17,50 @@ class Task(Base):
     priority = Column(String, default="medium")  # low | medium | high
     due_date = Column(Date, nullable=True)
     assigned_to = Column(Integer, ForeignKey("users.id"))
+    # versão monotônica na tabela (version_counters, a cada escrita), base dos ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # momento em que a tarefa passou a done (nulo nos demais status); base do arquivamento
+    completed_at = Column(DateTime, nullable=True)
+    # desnormalizados, mantidos por create_comment/delete_comment na mesma transação:
+    # quantidade de comentários e created_at do mais recente (nulo sem comentários)
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(DateTime, nullable=True)
+
+    # Índices alinhados aos filtros e ordenações de list_tasks_filtered
+    __table_args__ = (
+        Index("ix_tasks_due_date", "due_date"),
+        Index("ix_tasks_assigned_to_due_date", "assigned_to", "due_date"),
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        Index("ix_tasks_priority_due_date", "priority", "due_date"),
+        Index("ix_tasks_status_priority_due_date", "status", "priority", "due_date"),
+        Index("ix_tasks_version", "version"),
+        Index("ix_tasks_status_completed_at", "status", "completed_at"),
+        Index("ix_tasks_last_activity_at", "last_activity_at"),
+        Index("ix_tasks_comment_count", "comment_count"),
+        # ids nunca reutilizados: uma tarefa nova não colide com uma já arquivada
+        {"sqlite_autoincrement": True},
+    )
+
+# Índice de busca textual (SQLite FTS5, external content) sobre title/description,
+# mantido em sincronia por triggers em qualquer escrita na tabela tasks.
+# A migração 0004 aplica o mesmo SQL; os eventos abaixo cobrem o create_all.
+TASK_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+for _statement in TASK_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Task.__table__, "after_drop", DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"))
 
 # Pydantic Schemas
 class TaskCreate(BaseModel):
@@ -89,5 +135,32 @@ class TaskOut(BaseModel):
     priority: str = Field(..., description="Prioridade da tarefa")
     due_date: Optional[date] = Field(None, description="Data limite para conclusão")
     assigned_to: Optional[int] = Field(None, description="ID do usuário responsável pela tarefa")
+    comment_count: int = Field(0, description="Quantidade de comentários da tarefa")
+    last_activity_at: Optional[datetime] = Field(None, description="Data do comentário mais recente")
 
     model_config = ConfigDict(from_attributes=True)
+
+# Tarefa com relações embutidas (?include=assignee,comments); campos não pedidos são omitidos
+class TaskExpandedOut(TaskOut):
+    assignee: Optional[UserOut] = Field(None, description="Usuário responsável (include=assignee)")
+    comments: Optional[List[CommentOut]] = Field(
+        None, description="Comentários mais recentes, do mais novo ao mais antigo (include=comments)"
+    )
+
+# Operações em lote
+class TaskBulkUpdate(TaskUpdate):
+    id: int = Field(..., description="ID da tarefa a atualizar", example=1)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., description="IDs das tarefas a remover", min_length=1, example=[1, 2, 3])
+
+class BulkItemResult(BaseModel):
+    index: int = Field(..., description="Posição do item no lote enviado")
+    id: Optional[int] = Field(None, description="ID da tarefa afetada")
+    ok: bool = Field(..., description="Indica se o item foi aplicado")
+    error: Optional[str] = Field(None, description="Motivo da rejeição do item")
+
+class BulkResultOut(BaseModel):
+    succeeded: int = Field(..., description="Itens aplicados")
+    failed: int = Field(..., description="Itens rejeitados na validação")
+    results: List[BulkItemResult] = Field(..., description="Resultado por item, na ordem do lote")
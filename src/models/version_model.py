@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String
+from src.database import Base
+
+# SQLAlchemy Model
+class VersionCounter(Base):
+    # Fonte monotônica das colunas version (ETags): uma linha por tabela, incrementada
+    # com INSERT ... ON CONFLICT DO UPDATE ... RETURNING na transação da escrita (sem a
+    # linha, o INSERT a cria a partir do MAX(version) da tabela). Nunca volta atrás, nem
+    # quando a linha de maior versão é removida ou arquivada.
+    __tablename__ = "version_counters"
+
+    name = Column(String, primary_key=True)   # nome da tabela (tasks | comments)
+    value = Column(Integer, nullable=False)
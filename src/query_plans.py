@@ -0,0 +1,205 @@
+import os
+import logging
+import tempfile
+from datetime import date, datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from src.database import create_db_engine, run_migrations
+from src.controllers import (
+    task_controller, task_bulk_controller, search_controller, comment_controller, user_controller, auth_controller,
+    sync_controller,
+)
+from src.controllers.due_scheduler import DueScheduler
+from src.controllers.includes import expand_tasks
+from src.controllers.archive_controller import archive_chunk
+from src.auth.jwt_utils import _load_active_user
+from src.auth.password_hashing import hash_password
+from src.controllers.pagination import DEFAULT_PAGE_SIZE, encode_cursor, cursor_key
+from src.controllers.list_cache import list_cache
+from src.models.task_model import Task, TaskCreate, TaskUpdate, TaskBulkUpdate
+from src.models.comment_model import Comment, CommentCreate
+from src.models.user_model import User, UserCreate, UserUpdate, UserLogin
+
+logger = logging.getLogger(__name__)
+
+TEMP_SORT = "USE TEMP B-TREE"
+SEED_TASKS = 200
+SEED_COMMENTS = 50
+# Consultas que agregam a tabela inteira por definição: aparecem como aviso, não como violação.
+# A reconciliação de comentários é um job de manutenção que relê todos os contadores. O ETag da
+# listagem sem filtros conta todas as tarefas (count/max sobre ix_tasks_version), mas só quando a
+# listagem não está no cache: a entrada guarda o ETag junto com a página.
+FULL_SCAN_ALLOWED = {"reconcile_comment_activity"}
+FULL_SCAN_ALLOWED_SQL = {"SELECT count(*) AS count_1, max(tasks.version) AS max_1 FROM tasks"}
+
+def derived_tables(plan) -> set:
+    # subconsultas avaliadas como co-rotina/materializadas ("CO-ROUTINE anon_1", "MATERIALIZE (subquery-2)")
+    return {
+        detail.split(" ", 1)[1] for detail in plan
+        if detail.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    }
+
+def is_full_scan(detail: str, derived=(), limited: bool = False) -> bool:
+    # Só "SEARCH ..." (busca por chave no índice) é aceito em qualquer consulta. "SCAN tasks USING INDEX"
+    # percorre o índice inteiro na ordem pedida: só é aceito com LIMIT, quando a leitura para na página.
+    # Tabelas virtuais (FTS5) resolvem o MATCH no próprio índice: "SCAN tasks_fts VIRTUAL TABLE INDEX ..."
+    # Percorrer o resultado de uma subconsulta (janela, agregação) ou uma lista de valores
+    # ("SCAN 2 CONSTANT ROWS", de um IN (VALUES ...)) não lê a tabela de novo.
+    if not detail.startswith("SCAN ") or " VIRTUAL TABLE " in detail or detail.endswith(" CONSTANT ROWS"):
+        return False
+    if " USING " in detail:
+        return not limited
+    return detail[len("SCAN "):] not in derived
+
+def has_limit(statement: str) -> bool:
+    return " LIMIT " in " ".join(statement.upper().split())
+
+def _filter_combinations():
+    soon = date.today() + timedelta(days=7)
+    for status in (None, "pending"):
+        for priority in (None, "high"):
+            for due_before in (None, soon):
+                for user_id in (None, 1):
+                    yield dict(status_filter=status, priority=priority, due_before=due_before, user_id=user_id)
+
+# Cenários que exercitam cada consulta dos controllers (e da autenticação)
+def _scenarios():
+    yield "get_task", lambda db: task_controller.get_task(1, db)
+    yield "list_tasks_by_user", lambda db: task_controller.list_tasks_by_user(1, db)
+    for filters in _filter_combinations():
+        label = ",".join(k for k, v in filters.items() if v is not None) or "sem filtros"
+        # as rotas sempre paginam: sem limit a listagem sem filtros percorreria o índice inteiro
+        yield f"list_tasks_filtered({label})", lambda db, f=filters: task_controller.list_tasks_filtered(
+            db, limit=DEFAULT_PAGE_SIZE, **f
+        )
+    cursor = encode_cursor(cursor_key(Task.due_date), date.today(), 1)
+    yield "list_tasks_filtered(página)", lambda db: task_controller.list_tasks_filtered(db, limit=2, cursor=cursor)
+    yield "list_tasks_filtered(status,página)", lambda db: task_controller.list_tasks_filtered(
+        db, status_filter="pending", limit=2, cursor=cursor
+    )
+    for sort in ("activity", "comments"):
+        yield f"list_tasks_filtered(sort={sort})", lambda db, s=sort: task_controller.list_tasks_filtered(
+            db, limit=2, sort=s
+        )
+    yield "list_tasks_by_user(página)", lambda db: task_controller.list_tasks_by_user(1, db, limit=2, cursor=cursor)
+    yield "tasks_filtered_etag", lambda db: task_controller.tasks_filtered_etag(db)
+    yield "tasks_filtered_etag(status)", lambda db: task_controller.tasks_filtered_etag(db, status_filter="pending")
+    yield "tasks_by_user_etag", lambda db: task_controller.tasks_by_user_etag(1, db)
+    yield "comments_etag", lambda db: comment_controller.comments_etag(1, db)
+    yield "expand_tasks", lambda db: expand_tasks(
+        task_controller.list_tasks_filtered(db, limit=2), {"assignee", "comments"}, db
+    )
+    yield "search_tasks", lambda db: search_controller.search_tasks("t1", db, limit=2)
+    yield "search_tasks(página)", lambda db: search_controller.search_tasks(
+        "t", db, limit=2, cursor=encode_cursor(search_controller.SEARCH_CURSOR_KEY, -1.0, 1)
+    )
+    yield "list_comments(página)", lambda db: comment_controller.list_comments(
+        1, db, limit=2, cursor=encode_cursor(cursor_key(Comment.created_at), datetime.now(), 1)
+    )
+    yield "list_comments(before)", lambda db: comment_controller.list_comments(1, db, limit=2, before=1)
+    yield "create_task", lambda db: task_controller.create_task(TaskCreate(title="plan", assigned_to=1), db)
+    yield "update_task", lambda db: task_controller.update_task(1, TaskUpdate(title="x", assigned_to=1), db)
+    yield "bulk_create_tasks", lambda db: task_bulk_controller.bulk_create_tasks(
+        [TaskCreate(title="lote", assigned_to=1), TaskCreate(title="lote", assigned_to=2)], db
+    )
+    yield "bulk_update_tasks", lambda db: task_bulk_controller.bulk_update_tasks(
+        [TaskBulkUpdate(id=1, status="done"), TaskBulkUpdate(id=3, assigned_to=2)], db
+    )
+    yield "list_comments", lambda db: comment_controller.list_comments(1, db)
+    yield "create_comment", lambda db: comment_controller.create_comment(1, 1, CommentCreate(content="c"), db)
+    yield "delete_comment", lambda db: comment_controller.delete_comment(1, 1, db)
+    yield "delete_task", lambda db: task_controller.delete_task(2, db)
+    yield "bulk_delete_tasks", lambda db: task_bulk_controller.bulk_delete_tasks([4, 5], db)
+    yield "get_user", lambda db: user_controller.get_user(1, db)
+    yield "create_user", lambda db: user_controller.create_user(
+        UserCreate(name="n", email="plan@example.com", password="1234"), db
+    )
+    yield "update_user", lambda db: user_controller.update_user(1, UserUpdate(email="plan1@example.com"), db)
+    yield "login_user", lambda db: auth_controller.login_user(UserLogin(email="plan1@example.com", password="1234"), db)
+    yield "get_current_user", lambda db: _load_active_user(1, db)
+    yield "delete_user", lambda db: user_controller.delete_user(2, db)
+    yield "due_scheduler.load", lambda db: DueScheduler().load(db)
+    yield "list_tasks_filtered(archived)", lambda db: task_controller.list_tasks_filtered(db, limit=2, archived=True)
+    yield "list_tasks_filtered(archived,assignedTo)", lambda db: task_controller.list_tasks_filtered(
+        db, user_id=1, limit=2, archived=True
+    )
+    yield "archive_chunk", lambda db: archive_chunk(db, datetime.now() + timedelta(days=1), chunk_size=2)
+    yield "list_changes", lambda db: sync_controller.list_changes(db)
+    yield "list_changes(since)", lambda db: sync_controller.list_changes(db, since="1", limit=2)
+    yield "reconcile_comment_activity", lambda db: comment_controller.reconcile_comment_activity(db, apply=False)
+    yield "compact_change_log", lambda db: sync_controller.compact_change_log(db, retention_days=0)
+
+def _seed(db):
+    hashed = hash_password("1234")
+    db.add_all([
+        User(name="a", email="a@example.com", hashed_password=hashed, is_active=True),
+        User(name="b", email="b@example.com", hashed_password=hashed, is_active=True),
+    ])
+    db.commit()
+    # linhas suficientes para o planejador não preferir varrer a tabela por ela ser minúscula
+    db.add_all(
+        Task(
+            title=f"t{i}", status=("pending", "in_progress", "done")[i % 3], priority=("low", "medium", "high")[i % 3],
+            due_date=date.today() + timedelta(days=i % 30), assigned_to=1 + i % 2,
+        )
+        for i in range(SEED_TASKS)
+    )
+    db.commit()
+    for i in range(SEED_COMMENTS):
+        comment_controller.create_comment(1 + i % 5, 1, CommentCreate(content=f"seed {i}"), db)
+
+def collect_plans():
+    # Executa todos os cenários num banco temporário migrado até head e
+    # devolve [(cenário, sql, linhas do EXPLAIN QUERY PLAN)]
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'plans.db')}"
+        run_migrations(url)
+        db_engine = create_db_engine(url)
+        Session = sessionmaker(bind=db_engine, autoflush=False)
+        captured = []
+
+        @event.listens_for(db_engine, "before_cursor_execute")
+        def _capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                captured.append((statement, parameters))
+
+        results = []
+        # o cache de listagens é global: sem ele as consultas são de fato executadas
+        list_cache.clear()
+        with Session() as db:
+            _seed(db)
+            for name, scenario in _scenarios():
+                captured.clear()
+                try:
+                    scenario(db)
+                except HTTPException as exc:
+                    db.rollback()
+                    logger.warning("Cenário %s terminou com HTTP %s", name, exc.status_code)
+                statements = list(captured)
+                raw = db_engine.raw_connection()
+                try:
+                    cursor = raw.cursor()
+                    for statement, parameters in statements:
+                        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                        results.append((name, statement, [row[-1] for row in cursor.fetchall()]))
+                    cursor.close()
+                finally:
+                    raw.close()
+        db_engine.dispose()
+        list_cache.clear()
+        return results
+
+def check_query_plans():
+    # Retorna (violações, avisos): varreduras completas falham, ordenações em memória só alertam
+    violations, warnings = [], []
+    for name, statement, plan in collect_plans():
+        derived = derived_tables(plan)
+        for detail in plan:
+            if is_full_scan(detail, derived, has_limit(statement)):
+                allowed = name in FULL_SCAN_ALLOWED or " ".join(statement.split()) in FULL_SCAN_ALLOWED_SQL
+                (warnings if allowed else violations).append((name, statement, detail))
+            elif TEMP_SORT in detail:
+                warnings.append((name, statement, detail))
+    return violations, warnings
@@ -0,0 +1,168 @@
+import os
+import re
+import logging
+import threading
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, UTC
+from functools import lru_cache
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# Instrumentação das consultas por requisição (hooks na engine + middleware)
+SQL_PROFILING = os.getenv("SQL_PROFILING", "1") == "1"
+# Consultas acima disso vão para o log de consultas lentas
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+# A mesma consulta (normalizada) repetida isso ou mais vezes numa requisição é sinalizada como N+1
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+RECENT_SLOW_QUERIES = 20
+UNMATCHED_ROUTE = "<sem rota>"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    # literais viram ?, listas IN (?, ?, ...) viram (?...): consultas que só diferem
+    # nos valores (ou no tamanho do IN) caem na mesma entrada
+    sql = _SPACES.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    return _PARAM_LIST.sub("(?...)", sql)
+
+# Consultas de uma requisição; alimentada pelos hooks da engine na thread
+# (ou greenlet) que executa o controller, via ContextVar
+class RequestProfile:
+    __slots__ = ("statements", "db_seconds", "counts", "slow", "_lock")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.counts = {}  # SQL normalizado -> execuções
+        self.slow = 0
+        self._lock = threading.Lock()
+
+    def add(self, sql: str, seconds: float, slow: bool):
+        with self._lock:
+            self.statements += 1
+            self.db_seconds += seconds
+            self.counts[sql] = self.counts.get(sql, 0) + 1
+            self.slow += slow
+
+    def repeated(self, threshold: int):
+        # SELECTs repetidos: candidatos a N+1 (um SELECT por item de uma lista)
+        with self._lock:
+            return [
+                (sql, count) for sql, count in self.counts.items()
+                if count >= threshold and sql.upper().startswith("SELECT")
+            ]
+
+    def server_timing(self) -> str:
+        with self._lock:
+            return f'db;dur={self.db_seconds * 1000:.1f};desc="{self.statements} queries"'
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_request_profile", default=None)
+
+class SQLProfiler:
+    def __init__(self, slow_ms: float = SQL_SLOW_QUERY_MS, n_plus_one_threshold: int = SQL_N_PLUS_ONE_THRESHOLD):
+        self.slow_seconds = slow_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes = {}  # "MÉTODO /rota/{param}" -> agregados
+        self._recent_slow = deque(maxlen=RECENT_SLOW_QUERIES)
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        # chamado pelo hook after_cursor_execute (src/database.py)
+        sql = normalize_sql(statement)
+        slow = seconds >= self.slow_seconds
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add(sql, seconds, slow)
+        if slow:
+            logger.warning("Consulta lenta (%.1f ms): %s", seconds * 1000, sql)
+            with self._lock:
+                self._recent_slow.append({"sql": sql, "ms": round(seconds * 1000, 3), "at": datetime.now(UTC)})
+
+    def finish(self, profile: RequestProfile, route: str):
+        repeated = profile.repeated(self.n_plus_one_threshold)
+        for sql, count in repeated:
+            logger.warning("Possível N+1 em %s: %d execuções de %s", route, count, sql)
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "route": route, "requests": 0, "statements": 0, "max_statements": 0, "db_ms": 0.0,
+                "slow_queries": 0, "n_plus_one": 0, "last_n_plus_one": None,
+            })
+            entry["requests"] += 1
+            entry["statements"] += profile.statements
+            entry["max_statements"] = max(entry["max_statements"], profile.statements)
+            entry["db_ms"] += profile.db_seconds * 1000
+            entry["slow_queries"] += profile.slow
+            if repeated:
+                entry["n_plus_one"] += 1
+                entry["last_n_plus_one"] = max(repeated, key=lambda item: item[1])[0]
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+            self._recent_slow.clear()
+
+    def stats(self):
+        with self._lock:
+            routes = [dict(entry) for entry in self._routes.values()]
+            recent_slow = list(self._recent_slow)
+        for entry in routes:
+            entry["avg_statements"] = round(entry["statements"] / entry["requests"], 2)
+            entry["avg_db_ms"] = round(entry["db_ms"] / entry["requests"], 3)
+            entry["db_ms"] = round(entry["db_ms"], 3)
+        return {
+            "enabled": SQL_PROFILING,
+            "slow_query_ms": self.slow_seconds * 1000,
+            "n_plus_one_threshold": self.n_plus_one_threshold,
+            # rotas que mais tempo passam no banco primeiro
+            "routes": sorted(routes, key=lambda entry: entry["db_ms"], reverse=True),
+            "recent_slow_queries": recent_slow,
+        }
+
+sql_profiler = SQLProfiler()
+
+def route_name(scope) -> str:
+    # template da rota (ex.: DELETE /tasks/{task_id}/comments/{comment_id}). Em rotas de um
+    # APIRouter incluído, path_format não tem o prefixo do router: o prefixo são os segmentos
+    # do caminho que sobram à esquerda dos que o template casou (um segmento por "/")
+    route = scope.get("route")
+    if route is None:
+        return f"{scope['method']} {UNMATCHED_ROUTE}"
+    template = route.path_format
+    prefix = scope["path"].rsplit("/", template.count("/"))[0]
+    return f"{scope['method']} {prefix}{template}"
+
+# Middleware ASGI: abre o perfil da requisição, devolve `Server-Timing` com o tempo e a
+# quantidade de consultas e, ao final, agrega por rota e procura consultas repetidas (N+1).
+# Consultas feitas depois do início da resposta (streaming) entram só nos agregados.
+class SQLProfilingMiddleware:
+    def __init__(self, app, profiler: SQLProfiler = sql_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", []))
+                MutableHeaders(raw=message["headers"]).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            self.profiler.finish(profile, route_name(scope))
@@ -0,0 +1,238 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from src.auth.jwt_utils import get_current_user
+from src.auth.principal_cache import principal_cache
+from src.auth import password_hashing
+from src.database import pool_stats
+from src.compression import compression_stats
+from src.logging_pipeline import logging_stats
+from src.sql_profiler import sql_profiler
+from src.controllers.list_cache import list_cache
+from src.controllers.event_broker import event_broker
+from src.controllers.due_scheduler import due_scheduler
+from src.controllers.archive_controller import archive_stats
+from src.controllers.utils import get_route_db, run_db
+
+router = APIRouter()
+
+class CacheStatsOut(BaseModel):
+    size: int = Field(..., description="Entradas atualmente em cache")
+    max_size: int = Field(..., description="Capacidade máxima (LRU)")
+    ttl_seconds: float = Field(..., description="Tempo de vida de cada entrada")
+    hits: int = Field(..., description="Consultas atendidas pelo cache")
+    misses: int = Field(..., description="Consultas que foram ao banco")
+    evictions: int = Field(..., description="Entradas descartadas por capacidade")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+
+class PasswordPoolOut(BaseModel):
+    kind: str = Field(..., description="Tipo do pool (thread|process)")
+    workers: int = Field(..., description="Workers dedicados ao bcrypt")
+    queue_limit: int = Field(..., description="Operações aceitas em espera além dos workers")
+    bcrypt_rounds: int = Field(..., description="Custo atual do bcrypt")
+    in_flight: int = Field(..., description="Operações executando ou na fila")
+    rejected: int = Field(..., description="Operações rejeitadas com 503")
+
+class DbPoolOut(BaseModel):
+    pool_class: str = Field(..., description="Implementação do pool do SQLAlchemy")
+    status: str = Field(..., description="Resumo textual do pool")
+    size: int | None = Field(None, description="Tamanho configurado do pool")
+    checkedin: int | None = Field(None, description="Conexões ociosas no pool")
+    checkedout: int | None = Field(None, description="Conexões em uso")
+    overflow: int | None = Field(None, description="Conexões abertas além do tamanho do pool")
+
+class ListCacheOut(BaseModel):
+    backend: str = Field(..., description="Backend do cache (MemoryBackend|SharedBackend)")
+    size: int = Field(..., description="Listagens atualmente em cache")
+    max_size: int = Field(..., description="Capacidade máxima (LRU)")
+    ttl_seconds: float = Field(..., description="Tempo de vida de cada entrada")
+    hits: int = Field(..., description="Listagens servidas do cache")
+    misses: int = Field(..., description="Listagens que foram ao banco")
+    saved_queries: int = Field(..., description="Consultas de listagem evitadas")
+    invalidations: int = Field(..., description="Entradas descartadas por escritas em tarefas")
+    evictions: int = Field(..., description="Entradas descartadas por capacidade")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+
+class EventsOut(BaseModel):
+    subscribers: int = Field(..., description="Assinantes conectados ao feed de eventos")
+    published: int = Field(..., description="Eventos publicados com assinantes conectados")
+    delivered: int = Field(..., description="Entregas enfileiradas (evento x assinante)")
+    disconnected_slow_consumers: int = Field(..., description="Assinantes desconectados por fila cheia")
+    queue_size: int = Field(..., description="Eventos pendentes aceitos por assinante")
+
+class DueSchedulerOut(BaseModel):
+    tracked: int = Field(..., description="Tarefas abertas com data limite na agenda")
+    timers: int = Field(..., description="Lembretes pendentes no heap (inclui obsoletos)")
+    fired: int = Field(..., description="Lembretes disparados")
+    stale_timers: int = Field(..., description="Lembretes descartados por tarefa alterada/removida")
+    next_fire_at: datetime | None = Field(None, description="Próximo lembrete agendado")
+    due_soon_hours: float = Field(..., description="Janela padrão de /tasks/due-soon")
+
+class ArchiveRunOut(BaseModel):
+    hot_tasks_before: int = Field(..., description="Tarefas na tabela quente antes da execução")
+    hot_tasks_after: int = Field(..., description="Tarefas na tabela quente após a execução")
+    archived_tasks: int = Field(..., description="Tarefas movidas para tasks_archive")
+    archived_comments: int = Field(..., description="Comentários movidos para comments_archive")
+    chunks: int = Field(..., description="Transações (lotes) executadas")
+    seconds: float = Field(..., description="Duração total")
+    finished_at: datetime = Field(..., description="Fim da execução (UTC)")
+
+class ArchiveOut(BaseModel):
+    hot_tasks: int = Field(..., description="Tarefas na tabela quente (tasks)")
+    archived_tasks: int = Field(..., description="Tarefas arquivadas (tasks_archive)")
+    archive_after_days: int = Field(..., description="Idade mínima (dias desde a conclusão) para arquivar")
+    chunk_size: int = Field(..., description="Tarefas movidas por transação")
+    last_run: ArchiveRunOut | None = Field(None, description="Última execução neste processo")
+
+class CompressionEncodingOut(BaseModel):
+    responses: int = Field(..., description="Respostas comprimidas com esta codificação")
+    bytes_in: int = Field(..., description="Bytes dos corpos antes da compressão")
+    bytes_out: int = Field(..., description="Bytes enviados após a compressão")
+    cpu_seconds: float = Field(..., description="Tempo de CPU gasto comprimindo")
+
+class CompressionOut(BaseModel):
+    encodings: list[str] = Field(..., description="Codificações oferecidas, em ordem de preferência")
+    min_size: int = Field(..., description="Tamanho mínimo do corpo para comprimir")
+    streaming: bool = Field(..., description="Se respostas em streaming também são comprimidas")
+    compressed: dict[str, CompressionEncodingOut] = Field(..., description="Contadores por codificação")
+    skipped: dict[str, int] = Field(..., description="Respostas não comprimidas, por motivo")
+    bytes_in: int = Field(..., description="Total antes da compressão")
+    bytes_out: int = Field(..., description="Total enviado comprimido")
+    bytes_saved: int = Field(..., description="bytes_in - bytes_out")
+    ratio: float = Field(..., description="bytes_out / bytes_in")
+    cpu_seconds: float = Field(..., description="CPU total gasta comprimindo")
+
+class LoggingOut(BaseModel):
+    level: str = Field(..., description="Nível do logger raiz (LOG_LEVEL)")
+    queued: bool = Field(..., description="Se os handlers rodam na thread de escrita (fila)")
+    queue_size: int = Field(..., description="Capacidade da fila de registros")
+    pending: int = Field(..., description="Registros aguardando a thread de escrita")
+    enqueued: int = Field(..., description="Registros enfileirados")
+    dropped: dict[str, int] = Field(..., description="Registros descartados com a fila cheia, por nível")
+    dropped_total: int = Field(..., description="Total de registros descartados")
+    debug_sample_rate: float = Field(..., description="Fração dos registros DEBUG mantidos")
+    sampled_out: int = Field(..., description="Registros DEBUG descartados pela amostragem")
+
+class SqlRouteOut(BaseModel):
+    route: str = Field(..., description="Método e template da rota (ex.: GET /tasks/{task_id})")
+    requests: int = Field(..., description="Requisições atendidas")
+    statements: int = Field(..., description="Comandos SQL executados no total")
+    avg_statements: float = Field(..., description="Comandos SQL por requisição")
+    max_statements: int = Field(..., description="Maior número de comandos numa requisição")
+    db_ms: float = Field(..., description="Tempo total no banco (ms)")
+    avg_db_ms: float = Field(..., description="Tempo no banco por requisição (ms)")
+    slow_queries: int = Field(..., description="Consultas acima de SQL_SLOW_QUERY_MS")
+    n_plus_one: int = Field(..., description="Requisições com consulta repetida (possível N+1)")
+    last_n_plus_one: str | None = Field(None, description="Última consulta sinalizada como N+1 (normalizada)")
+
+class SlowQueryOut(BaseModel):
+    sql: str = Field(..., description="Consulta normalizada (literais substituídos por ?)")
+    ms: float = Field(..., description="Duração (ms)")
+    at: datetime = Field(..., description="Momento da execução (UTC)")
+
+class SqlProfileOut(BaseModel):
+    enabled: bool = Field(..., description="Se a instrumentação está ativa (SQL_PROFILING)")
+    slow_query_ms: float = Field(..., description="Limite do log de consultas lentas (ms)")
+    n_plus_one_threshold: int = Field(..., description="Repetições de um SELECT numa requisição para sinalizar N+1")
+    routes: list[SqlRouteOut] = Field(..., description="Agregados por rota, do maior tempo no banco ao menor")
+    recent_slow_queries: list[SlowQueryOut] = Field(..., description="Consultas lentas mais recentes")
+
+@router.get(
+    "/principal-cache",
+    summary="Estatísticas do cache de autenticação",
+    description="Contadores do cache de usuários autenticados (hits evitam um SELECT por requisição).",
+    response_model=CacheStatsOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def principal_cache_stats(current_user=Depends(get_current_user)):
+    return principal_cache.stats()
+
+@router.get(
+    "/password-pool",
+    summary="Estado do pool de senhas",
+    description="Ocupação e rejeições do pool dedicado a hash/verificação bcrypt.",
+    response_model=PasswordPoolOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def password_pool_stats(current_user=Depends(get_current_user)):
+    return password_hashing.stats()
+
+@router.get(
+    "/db-pool",
+    summary="Estado do pool de conexões",
+    description="Conexões em uso, ociosas e em overflow no pool do banco.",
+    response_model=DbPoolOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def db_pool_stats(current_user=Depends(get_current_user)):
+    return pool_stats()
+
+@router.get(
+    "/list-cache",
+    summary="Estatísticas do cache de listagens",
+    description="Hits, consultas evitadas e invalidações do cache de resultados de GET /tasks/.",
+    response_model=ListCacheOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def list_cache_stats(current_user=Depends(get_current_user)):
+    return list_cache.stats()
+
+@router.get(
+    "/events",
+    summary="Estado do feed de eventos",
+    description="Assinantes conectados, eventos publicados/entregues e desconexões por consumidor lento.",
+    response_model=EventsOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def events_stats(current_user=Depends(get_current_user)):
+    return event_broker.stats()
+
+@router.get(
+    "/due-scheduler",
+    summary="Estado da agenda de vencimentos",
+    description="Tarefas acompanhadas, lembretes pendentes/disparados e o próximo disparo.",
+    response_model=DueSchedulerOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def due_scheduler_stats(current_user=Depends(get_current_user)):
+    return due_scheduler.stats()
+
+@router.get(
+    "/archive",
+    summary="Estado do arquivamento",
+    description="Tamanho das tabelas quente e de arquivo e o resultado da última execução do arquivamento.",
+    response_model=ArchiveOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+async def archive_state(current_user=Depends(get_current_user), db=Depends(get_route_db)):
+    return await run_db(db, archive_stats)
+
+@router.get(
+    "/compression",
+    summary="Estatísticas de compressão",
+    description="Bytes economizados e CPU gasta pela compressão das respostas, por codificação, e respostas enviadas sem compressão por motivo.",
+    response_model=CompressionOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def compression_state(current_user=Depends(get_current_user)):
+    return compression_stats.stats()
+
+@router.get(
+    "/logging",
+    summary="Estado da fila de logs",
+    description="Registros enfileirados, pendentes, descartados por fila cheia e pela amostragem de DEBUG.",
+    response_model=LoggingOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def logging_state(current_user=Depends(get_current_user)):
+    return logging_stats()
+
+@router.get(
+    "/sql",
+    summary="Consultas SQL por rota",
+    description="Comandos SQL, tempo no banco, consultas lentas e suspeitas de N+1 agregados por rota.",
+    response_model=SqlProfileOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+def sql_state(current_user=Depends(get_current_user)):
+    return sql_profiler.stats()
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Body, Depends, status
-from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from src.controllers.auth_controller import login_user, logout_user
-from src.controllers.utils import get_db
+from src.controllers.auth_controller import login_user_async, logout_user
+from src.controllers.utils import get_route_db
 from src.models.user_model import UserLogin
 
 router = APIRouter()
@@ -22,11 +21,11 @@ class MessageOut(BaseModel):
     status_code=status.HTTP_200_OK,
     responses={200: {"description": "Autenticado"}, 401: {"description": "Credenciais inválidas"}},
 )
-def login(
+async def login(
     credentials: UserLogin = Body(..., description="Email e senha para login"),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return login_user(credentials, db)
+    return await login_user_async(credentials, db)
 
 @router.post(
     "/logout",
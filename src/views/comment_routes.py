@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, Path, Body, status
+from fastapi import APIRouter, Depends, Path, Body, Query, Header, Response, status
 from typing import List
-from sqlalchemy.orm import Session
-from src.controllers.comment_controller import create_comment, list_comments, delete_comment
+from src.controllers.comment_controller import create_comment, list_comments, delete_comment, comments_etag
+from src.controllers.etag import not_modified
 from src.models.comment_model import CommentCreate, CommentOut, CommentUpdate
 from src.auth.jwt_utils import get_current_user
-from src.controllers.utils import get_db
+from src.controllers.utils import get_route_db, run_db
+from src.controllers.fast_json import FAST_JSON, COMMENT_ROWS, fast_response
+from src.controllers.msgpack_codec import MsgPackRoute, accepts_msgpack, msgpack_response, representation_etag
+from src.controllers.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, set_next_cursor
 
-router = APIRouter()
+router = APIRouter(route_class=MsgPackRoute)
 
 @router.post(
     "/tasks/{task_id}/comments",
@@ -21,31 +24,62 @@ router = APIRouter()
         404: {"description": "Tarefa não encontrada"},
     },
 )
-def add(
+async def add(
+    response: Response,
     task_id: int = Path(..., description="ID da tarefa"),
     data: CommentCreate = Body(..., description="Conteúdo do comentário"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: CommentOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return create_comment(task_id, current_user.id, data, db)
+    comment = await run_db(db, create_comment, task_id, current_user.id, data)
+    if as_msgpack:
+        return msgpack_response(COMMENT_ROWS.row(comment), response, status.HTTP_201_CREATED)
+    return comment
 
 @router.get(
     "/tasks/{task_id}/comments",
     summary="Listar comentários",
-    description="Retorna todos os comentários de uma tarefa.",
+    description=(
+        "Retorna os comentários de uma tarefa, do mais recente ao mais antigo. "
+        f"Paginado por cursor: a próxima página vem no cabeçalho `{NEXT_CURSOR_HEADER}`. "
+        "`before` (ID de um comentário) devolve os comentários mais antigos que ele. "
+        "Responde com ETag fraco; `If-None-Match` igual gera 304."
+    ),
     response_model=List[CommentOut],
     responses={
         200: {"description": "Lista retornada com sucesso"},
+        304: {"description": "Lista não modificada"},
+        400: {"description": "Cursor inválido ou comentário de referência inexistente"},
         401: {"description": "Não autenticado"},
         404: {"description": "Tarefa não encontrada"},
     },
 )
-def get_all(
+async def get_all(
+    response: Response,
     task_id: int = Path(..., description="ID da tarefa"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página"),
+    cursor: str | None = Query(None, description="Cursor opaco retornado pela página anterior"),
+    before: int | None = Query(None, description="ID de um comentário da tarefa; retorna os anteriores a ele"),
+    if_none_match: str | None = Header(None, description="ETag da lista que o cliente já possui"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: CommentOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return list_comments(task_id, db)
+    etag = representation_etag(
+        await run_db(db, comments_etag, task_id, limit=limit, cursor=cursor, before=before), as_msgpack
+    )
+    cached = not_modified(if_none_match, etag, response)
+    if cached:
+        return cached
+    page = await run_db(
+        db, list_comments, task_id, limit=limit, cursor=cursor, before=before, rows=FAST_JSON or as_msgpack
+    )
+    response.headers["ETag"] = etag
+    set_next_cursor(response, page)
+    if as_msgpack:
+        return msgpack_response(COMMENT_ROWS.rows(page), response)
+    return fast_response(COMMENT_ROWS, page, response) if FAST_JSON else page
 
 @router.delete(
     "/tasks/{task_id}/comments/{comment_id}",
@@ -59,10 +93,10 @@ def get_all(
         404: {"description": "Comentário não encontrado"},
     },
 )
-def remove(
+async def remove(
     task_id: int = Path(..., description="ID da tarefa"),
     comment_id: int = Path(..., description="ID do comentário"),
     current_user: CommentOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    delete_comment(comment_id, current_user.id, db)
+    await run_db(db, delete_comment, comment_id, current_user.id)
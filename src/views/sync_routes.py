@@ -0,0 +1,34 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from src.controllers.sync_controller import list_changes, SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT
+from src.models.change_log_model import ChangesPageOut
+from src.models.user_model import UserOut
+from src.auth.jwt_utils import get_current_user
+from src.controllers.utils import get_route_db, run_db
+
+router = APIRouter()
+
+@router.get(
+    "/changes",
+    summary="Alterações desde um cursor",
+    description=(
+        "Sincronização incremental: devolve, em ordem, as alterações de tarefas, comentários e "
+        "usuários posteriores ao cursor `since` (upserts com o estado atual e tombstones para remoções). "
+        "Sem `since`, devolve apenas o cursor atual. Cursores anteriores à compactação do log recebem 410 "
+        "e o cliente deve refazer a sincronização completa."
+    ),
+    response_model=ChangesPageOut,
+    responses={
+        200: {"description": "Alterações retornadas"},
+        400: {"description": "Cursor inválido"},
+        401: {"description": "Não autenticado"},
+        410: {"description": "Cursor expirado (log compactado); exige sincronização completa"},
+    },
+)
+async def changes(
+    since: Optional[str] = Query(None, description="Cursor (next_cursor) da última sincronização"),
+    limit: int = Query(SYNC_DEFAULT_LIMIT, ge=1, le=SYNC_MAX_LIMIT, description="Máximo de alterações por página"),
+    current_user: UserOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    return await run_db(db, list_changes, since=since, limit=limit)
@@ -1,15 +1,77 @@
-from fastapi import APIRouter, Depends, Path, Body, Query, status
+from fastapi import APIRouter, Depends, Path, Body, Query, Header, Response, status
+from fastapi.responses import StreamingResponse
 from datetime import date
 from typing import List
-from sqlalchemy.orm import Session
 from src.controllers.task_controller import (
-    create_task, get_task, update_task, delete_task, list_tasks_filtered, list_tasks_by_user
+    create_task, get_task, update_task, delete_task, list_tasks_filtered, list_tasks_by_user,
+    export_tasks, EXPORT_FORMATS, tasks_filtered_etag, tasks_by_user_etag,
 )
-from src.models.task_model import TaskCreate, TaskUpdate, TaskOut
-from src.auth.jwt_utils import get_current_user
-from src.controllers.utils import get_db
+from src.controllers.etag import strong_etag, not_modified
+from src.controllers.stats_controller import get_task_stats
+from src.controllers.search_controller import search_tasks
+from src.controllers.event_broker import event_broker, event_stream
+from src.controllers.due_scheduler import due_scheduler
+from src.controllers.includes import parse_include, expand_tasks, expand_task, INCLUDE_OPTIONS
+from src.models.stats_model import TaskStatsOut
+from src.controllers.task_bulk_controller import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from src.models.task_model import (
+    TaskCreate, TaskUpdate, TaskOut, TaskExpandedOut, TaskBulkUpdate, TaskBulkDelete, BulkResultOut
+)
+from src.auth.jwt_utils import get_current_user, get_stream_user
+from src.controllers.utils import get_route_db, run_db
+from src.controllers.fast_json import FAST_JSON, TASK_ROWS, fast_response
+from src.controllers.msgpack_codec import MsgPackRoute, accepts_msgpack, msgpack_response, representation_etag
+from src.controllers.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, set_next_cursor
+
+router = APIRouter(route_class=MsgPackRoute)
+
+INCLUDE_DESCRIPTION = (
+    f"Relações a embutir, separadas por vírgula ({', '.join(INCLUDE_OPTIONS)}); "
+    "carregadas com uma consulta por relação. Respostas com include não usam ETag."
+)
+
+def rows_response(response: Response, page, as_msgpack: bool):
+    # página lida como tuplas (FAST_JSON/MessagePack) ou objetos ORM (response_model)
+    set_next_cursor(response, page)
+    if as_msgpack:
+        return msgpack_response(TASK_ROWS.rows(page), response)
+    return fast_response(TASK_ROWS, page, response) if FAST_JSON else page
 
-router = APIRouter()
+def expanded_response(response: Response, page, as_msgpack: bool):
+    set_next_cursor(response, page)
+    if as_msgpack:
+        return msgpack_response([task.model_dump(exclude_unset=True) for task in page], response)
+    return page
+
+# Rotas estáticas (/export, ...) precisam vir antes de /{task_id}
+@router.get(
+    "/export",
+    summary="Exportar tarefas",
+    description=(
+        "Transmite todas as tarefas que atendem aos filtros em NDJSON ou CSV, "
+        "lendo o banco em lotes; a memória não cresce com o tamanho da tabela."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Exportação em andamento", "content": {media: {} for media in EXPORT_FORMATS.values()}},
+        400: {"description": "Filtro ou formato inválido"},
+        401: {"description": "Não autenticado"},
+    },
+)
+async def export(
+    format: str = Query("ndjson", description="Formato de saída (ndjson|csv)"),
+    status: str | None = Query(None, description="Status da tarefa"),
+    priority: str | None = Query(None, description="Prioridade da tarefa"),
+    due_before: date | None = Query(None, alias="dueBefore", description="Data limite YYYY-MM-DD"),
+    user_id: int | None = Query(None, alias="assignedTo", description="ID do usuário responsável"),
+    current_user: TaskOut = Depends(get_current_user),
+):
+    rows = export_tasks(format, status_filter=status, priority=priority, due_before=due_before, user_id=user_id)
+    return StreamingResponse(
+        rows,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
 
 @router.post(
     "/",
@@ -23,30 +85,208 @@ router = APIRouter()
         401: {"description": "Não autenticado"},
     },
 )
-def create(
+async def create(
+    response: Response,
     task: TaskCreate = Body(..., description="Dados para criação da tarefa"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return create_task(task, db)
+    created = await run_db(db, create_task, task)
+    if as_msgpack:
+        return msgpack_response(TASK_ROWS.row(created), response, status.HTTP_201_CREATED)
+    return created
+
+@router.get(
+    "/stats",
+    summary="Estatísticas de tarefas",
+    description=(
+        "Contagem de tarefas por status, prioridade e responsável, lida da tabela de "
+        "contadores mantida a cada escrita (custo proporcional ao número de grupos)."
+    ),
+    response_model=TaskStatsOut,
+    responses={200: {"description": "Estatísticas retornadas"}, 401: {"description": "Não autenticado"}},
+)
+async def stats(
+    current_user: TaskOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    return await run_db(db, get_task_stats)
+
+@router.get(
+    "/overdue",
+    summary="Tarefas vencidas",
+    description=(
+        "Tarefas não concluídas com data limite anterior a hoje, das mais atrasadas para as mais "
+        "recentes. Servido da agenda de vencimentos em memória, sem consulta ao banco."
+    ),
+    response_model=List[TaskOut],
+    responses={200: {"description": "Tarefas vencidas"}, 401: {"description": "Não autenticado"}},
+)
+async def overdue(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Máximo de tarefas"),
+    current_user: TaskOut = Depends(get_current_user),
+):
+    return due_scheduler.overdue(limit=limit)
+
+@router.get(
+    "/due-soon",
+    summary="Tarefas que vencem em breve",
+    description=(
+        "Tarefas não concluídas cujo prazo (fim do dia da data limite) cai nas próximas `hours` horas, "
+        "ordenadas por data limite. Servido da agenda de vencimentos em memória."
+    ),
+    response_model=List[TaskOut],
+    responses={200: {"description": "Tarefas a vencer"}, 401: {"description": "Não autenticado"}},
+)
+async def due_soon(
+    hours: float | None = Query(None, gt=0, le=24 * 365, description="Janela em horas (padrão: DUE_SOON_HOURS)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Máximo de tarefas"),
+    current_user: TaskOut = Depends(get_current_user),
+):
+    return due_scheduler.due_soon(hours=hours, limit=limit)
+
+@router.get(
+    "/events",
+    summary="Feed de alterações (SSE)",
+    description=(
+        "Stream Server-Sent Events com os eventos task.created/updated/deleted, task.bulk_* e "
+        "comment.created/deleted, emitidos após o commit. Filtros opcionais por responsável e status "
+        "(uma atualização é enviada se a tarefa atendia ao filtro antes ou depois). "
+        "Clientes que não consomem a fila a tempo recebem `event: disconnect` e devem reconectar."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Stream de eventos", "content": {"text/event-stream": {}}},
+        401: {"description": "Não autenticado"},
+    },
+)
+async def events(
+    status: str | None = Query(None, description="Somente tarefas com este status"),
+    user_id: int | None = Query(None, alias="assignedTo", description="Somente tarefas deste responsável"),
+    current_user: TaskOut = Depends(get_stream_user),
+):
+    subscriber = event_broker.subscribe(assigned_to=user_id, status=status)
+    return StreamingResponse(
+        event_stream(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get(
+    "/search",
+    summary="Buscar tarefas",
+    description=(
+        "Busca textual em título e descrição, ordenada por relevância (bm25). "
+        f"Paginado por cursor: a próxima página vem no cabeçalho `{NEXT_CURSOR_HEADER}`."
+    ),
+    response_model=List[TaskOut],
+    responses={200: {"description": "Resultados da busca"}, 400: {"description": "Busca ou cursor inválido"}, 401: {"description": "Não autenticado"}},
+)
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Termos de busca"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página"),
+    cursor: str | None = Query(None, description="Cursor opaco retornado pela página anterior"),
+    current_user: TaskOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    page = await run_db(db, search_tasks, q, limit=limit, cursor=cursor)
+    return set_next_cursor(response, page)
+
+@router.post(
+    "/bulk",
+    summary="Criar tarefas em lote",
+    description=(
+        "Valida o lote inteiro antes de gravar e insere os itens válidos numa única transação. "
+        "Itens inválidos são reportados individualmente e não impedem os demais."
+    ),
+    response_model=BulkResultOut,
+    responses={
+        200: {"description": "Lote processado (ver resultado por item)"},
+        401: {"description": "Não autenticado"},
+        413: {"description": "Lote acima do limite"},
+    },
+)
+async def create_bulk(
+    tasks: List[TaskCreate] = Body(..., description="Tarefas a criar"),
+    current_user: TaskOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    return await run_db(db, bulk_create_tasks, tasks)
+
+@router.patch(
+    "/bulk",
+    summary="Atualizar tarefas em lote",
+    description="Atualiza várias tarefas (identificadas por `id`) numa única transação.",
+    response_model=BulkResultOut,
+    responses={
+        200: {"description": "Lote processado (ver resultado por item)"},
+        401: {"description": "Não autenticado"},
+        413: {"description": "Lote acima do limite"},
+    },
+)
+async def update_bulk(
+    items: List[TaskBulkUpdate] = Body(..., description="Campos a atualizar, com o ID de cada tarefa"),
+    current_user: TaskOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    return await run_db(db, bulk_update_tasks, items)
+
+@router.delete(
+    "/bulk",
+    summary="Remover tarefas em lote",
+    description="Remove várias tarefas (e seus comentários) numa única transação.",
+    response_model=BulkResultOut,
+    responses={
+        200: {"description": "Lote processado (ver resultado por item)"},
+        401: {"description": "Não autenticado"},
+        413: {"description": "Lote acima do limite"},
+    },
+)
+async def delete_bulk(
+    data: TaskBulkDelete = Body(..., description="IDs das tarefas a remover"),
+    current_user: TaskOut = Depends(get_current_user),
+    db=Depends(get_route_db),
+):
+    return await run_db(db, bulk_delete_tasks, data.ids)
 
 @router.get(
     "/{task_id}",
     summary="Obter tarefa",
-    description="Recupera uma tarefa pelo seu ID.",
-    response_model=TaskOut,
+    description="Recupera uma tarefa pelo seu ID. Responde com ETag forte; `If-None-Match` igual gera 304.",
+    response_model=TaskExpandedOut,
+    response_model_exclude_unset=True,
     responses={
         200: {"description": "Tarefa retornada"},
+        304: {"description": "Tarefa não modificada"},
+        400: {"description": "Include inválido"},
         401: {"description": "Não autenticado"},
         404: {"description": "Tarefa não encontrada"},
     },
 )
-def read(
+async def read(
+    response: Response,
     task_id: int = Path(..., description="ID da tarefa"),
+    include: str | None = Query(None, description=INCLUDE_DESCRIPTION),
+    if_none_match: str | None = Header(None, description="ETag da versão que o cliente já possui"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return get_task(task_id, db)
+    includes = parse_include(include)
+    task = await run_db(db, get_task, task_id)
+    if includes:
+        expanded = await run_db(db, expand_task, task, includes)
+        return msgpack_response(expanded.model_dump(exclude_unset=True), response) if as_msgpack else expanded
+    etag = representation_etag(strong_etag(task), as_msgpack)
+    cached = not_modified(if_none_match, etag, response)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
+    if as_msgpack:
+        return msgpack_response(TASK_ROWS.row(task), response)
+    return task
 
 @router.put(
     "/{task_id}",
@@ -60,13 +300,16 @@ def read(
         404: {"description": "Tarefa não encontrada"},
     },
 )
-def update(
+async def update(
+    response: Response,
     task_id: int = Path(..., description="ID da tarefa"),
     task: TaskUpdate = Body(..., description="Campos a atualizar"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return update_task(task_id, task, db)
+    updated = await run_db(db, update_task, task_id, task)
+    return msgpack_response(TASK_ROWS.row(updated), response) if as_msgpack else updated
 
 @router.delete(
     "/{task_id}",
@@ -79,40 +322,89 @@ def update(
         404: {"description": "Tarefa não encontrada"},
     },
 )
-def delete(
+async def delete(
     task_id: int = Path(..., description="ID da tarefa"),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    delete_task(task_id, db)
+    await run_db(db, delete_task, task_id)
 
 @router.get(
     "/",
     summary="Listar tarefas com filtros",
-    description="Filtra tarefas por status, prioridade, data ou usuário responsável.",
-    response_model=List[TaskOut],
-    responses={200: {"description": "Lista retornada com sucesso"}, 401: {"description": "Não autenticado"}},
+    description=(
+        "Filtra tarefas por status, prioridade, data ou usuário responsável. "
+        "`sort` ordena por data limite (`due_date`, padrão), atividade mais recente (`activity`) "
+        "ou quantidade de comentários (`comments`). "
+        f"Paginado por cursor: a próxima página vem no cabeçalho `{NEXT_CURSOR_HEADER}`. "
+        "Responde com ETag fraco; `If-None-Match` igual gera 304."
+    ),
+    response_model=List[TaskExpandedOut],
+    response_model_exclude_unset=True,
+    responses={200: {"description": "Lista retornada com sucesso"}, 304: {"description": "Lista não modificada"}, 400: {"description": "Filtro, ordenação, cursor ou include inválido"}, 401: {"description": "Não autenticado"}},
 )
-def list_filtered(
+async def list_filtered(
+    response: Response,
     status: str | None = Query(None, description="Status da tarefa"),
     priority: str | None = Query(None, description="Prioridade da tarefa"),
     due_before: date | None = Query(None, alias="dueBefore", description="Data limite YYYY-MM-DD"),
     user_id: int | None = Query(None, alias="assignedTo", description="ID do usuário responsável"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página"),
+    cursor: str | None = Query(None, description="Cursor opaco retornado pela página anterior"),
+    archived: bool = Query(False, description="Lista as tarefas arquivadas (concluídas há mais de ARCHIVE_AFTER_DAYS)"),
+    sort: str | None = Query(None, description="Ordenação: due_date (padrão), activity ou comments"),
+    include: str | None = Query(None, description=INCLUDE_DESCRIPTION),
+    if_none_match: str | None = Header(None, description="ETag da lista que o cliente já possui"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return list_tasks_filtered(db, status, priority, due_before, user_id)
+    filters = dict(
+        status_filter=status, priority=priority, due_before=due_before, user_id=user_id, archived=archived, sort=sort,
+    )
+    includes = parse_include(include)
+    if includes:
+        page = await run_db(db, list_tasks_filtered, **filters, limit=limit, cursor=cursor)
+        return expanded_response(response, await run_db(db, expand_tasks, page, includes), as_msgpack)
+    etag = representation_etag(await run_db(db, tasks_filtered_etag, **filters, limit=limit, cursor=cursor), as_msgpack)
+    cached = not_modified(if_none_match, etag, response)
+    if cached:
+        return cached
+    page = await run_db(db, list_tasks_filtered, **filters, limit=limit, cursor=cursor, rows=FAST_JSON or as_msgpack)
+    response.headers["ETag"] = etag
+    return rows_response(response, page, as_msgpack)
 
 @router.get(
     "/user/{user_id}",
     summary="Listar tarefas por usuário",
-    description="Retorna todas as tarefas atribuídas a um usuário.",
-    response_model=List[TaskOut],
-    responses={200: {"description": "Lista retornada com sucesso"}, 401: {"description": "Não autenticado"}},
+    description=(
+        "Retorna as tarefas atribuídas a um usuário. "
+        f"Paginado por cursor: a próxima página vem no cabeçalho `{NEXT_CURSOR_HEADER}`. "
+        "Responde com ETag fraco; `If-None-Match` igual gera 304."
+    ),
+    response_model=List[TaskExpandedOut],
+    response_model_exclude_unset=True,
+    responses={200: {"description": "Lista retornada com sucesso"}, 304: {"description": "Lista não modificada"}, 400: {"description": "Cursor ou include inválido"}, 401: {"description": "Não autenticado"}},
 )
-def list_by_user(
+async def list_by_user(
+    response: Response,
     user_id: int = Path(..., description="ID do usuário"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tamanho da página"),
+    cursor: str | None = Query(None, description="Cursor opaco retornado pela página anterior"),
+    include: str | None = Query(None, description=INCLUDE_DESCRIPTION),
+    if_none_match: str | None = Header(None, description="ETag da lista que o cliente já possui"),
+    as_msgpack: bool = Depends(accepts_msgpack),
     current_user: TaskOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return list_tasks_by_user(user_id, db)
+    includes = parse_include(include)
+    if includes:
+        page = await run_db(db, list_tasks_by_user, user_id, limit=limit, cursor=cursor)
+        return expanded_response(response, await run_db(db, expand_tasks, page, includes), as_msgpack)
+    etag = representation_etag(await run_db(db, tasks_by_user_etag, user_id, limit=limit, cursor=cursor), as_msgpack)
+    cached = not_modified(if_none_match, etag, response)
+    if cached:
+        return cached
+    page = await run_db(db, list_tasks_by_user, user_id, limit=limit, cursor=cursor, rows=FAST_JSON or as_msgpack)
+    response.headers["ETag"] = etag
+    return rows_response(response, page, as_msgpack)
@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, Path, Body, status
-from sqlalchemy.orm import Session
-from src.controllers.user_controller import create_user, get_user, update_user, delete_user
+from src.controllers.user_controller import create_user_async, get_user, update_user_async, delete_user
 from src.models.user_model import UserCreate, UserUpdate, UserOut
 from src.auth.jwt_utils import get_current_user
-from src.controllers.utils import get_db
+from src.controllers.utils import get_route_db, run_db
 
 router = APIRouter()
 
@@ -19,12 +18,12 @@ router = APIRouter()
         401: {"description": "Não autenticado"},
     },
 )
-def create(
+async def create(
     user: UserCreate = Body(..., description="Dados para criação do usuário"),
     current_user: UserOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return create_user(user, db)
+    return await create_user_async(user, db)
 
 @router.get(
     "/{user_id}",
@@ -37,12 +36,12 @@ def create(
         404: {"description": "Usuário não encontrado"},
     },
 )
-def read(
+async def read(
     user_id: int = Path(..., description="ID do usuário"),
     current_user: UserOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return get_user(user_id, db)
+    return await run_db(db, get_user, user_id)
 
 @router.put(
     "/{user_id}",
@@ -56,13 +55,13 @@ def read(
         404: {"description": "Usuário não encontrado"},
     },
 )
-def update(
+async def update(
     user_id: int = Path(..., description="ID do usuário"),
     user: UserUpdate = Body(..., description="Campos a atualizar"),
     current_user: UserOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    return update_user(user_id, user, db)
+    return await update_user_async(user_id, user, db)
 
 @router.delete(
     "/{user_id}",
@@ -75,9 +74,9 @@ def update(
         404: {"description": "Usuário não encontrado"},
     },
 )
-def delete(
+async def delete(
     user_id: int = Path(..., description="ID do usuário"),
     current_user: UserOut = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db=Depends(get_route_db),
 ):
-    delete_user(user_id, db)
+    await run_db(db, delete_user, user_id)
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+from src.auth import password_hashing
+from src.models.user_model import User
+
+def test_hash_and_verify_roundtrip():
+    hashed = password_hashing.hash_password("s3cret")
+    assert password_hashing.verify_password("s3cret", hashed)
+    assert not password_hashing.verify_password("other", hashed)
+
+def test_async_hash_and_verify_roundtrip():
+    async def roundtrip():
+        hashed = await password_hashing.hash_password_async("s3cret")
+        return await password_hashing.verify_password_async("s3cret", hashed), password_hashing.verify_password("s3cret", hashed)
+    assert asyncio.run(roundtrip()) == (True, True)
+
+def test_login_rehashes_when_cost_changes(client, create_test_user, db, monkeypatch):
+    old_hash = create_test_user.hashed_password
+    monkeypatch.setattr(password_hashing, "BCRYPT_ROUNDS", password_hashing.BCRYPT_ROUNDS + 1)
+    assert password_hashing.needs_rehash(old_hash)
+
+    r = client.post("/auth/login", json={"email": create_test_user.email, "password": "1234"})
+    assert r.status_code == 200
+
+    db.expire_all()
+    new_hash = db.query(User).filter(User.id == create_test_user.id).first().hashed_password
+    assert new_hash != old_hash
+    assert not password_hashing.needs_rehash(new_hash)
+
+def test_login_returns_503_when_pool_saturated(client, create_test_user, monkeypatch):
+    monkeypatch.setattr(password_hashing, "_slots", threading.BoundedSemaphore(1))
+    password_hashing._slots.acquire()
+    r = client.post("/auth/login", json={"email": create_test_user.email, "password": "1234"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == str(password_hashing.PASSWORD_POOL_RETRY_AFTER)
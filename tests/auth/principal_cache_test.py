@@ -0,0 +1,44 @@
+import time
+from src.auth.principal_cache import PrincipalCache, Principal
+
+def _principal(uid):
+    return Principal(id=uid, name="U", email=f"u{uid}@example.com", is_active=True)
+
+def test_cache_hit_and_miss_counters():
+    cache = PrincipalCache(max_size=10, ttl=60)
+    exp = int(time.time()) + 3600
+    assert cache.get(1, exp) is None
+    cache.put(1, exp, _principal(1))
+    assert cache.get(1, exp).id == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_cache_lru_eviction():
+    cache = PrincipalCache(max_size=2, ttl=60)
+    exp = int(time.time()) + 3600
+    cache.put(1, exp, _principal(1))
+    cache.put(2, exp, _principal(2))
+    cache.get(1, exp)  # 1 passa a ser o mais recente
+    cache.put(3, exp, _principal(3))
+    assert cache.get(2, exp) is None
+    assert cache.get(1, exp) is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_ttl_expiration():
+    cache = PrincipalCache(max_size=10, ttl=0.01)
+    exp = int(time.time()) + 3600
+    cache.put(1, exp, _principal(1))
+    time.sleep(0.02)
+    assert cache.get(1, exp) is None
+
+def test_cache_invalidate_drops_every_token_of_user():
+    cache = PrincipalCache(max_size=10, ttl=60)
+    exp = int(time.time()) + 3600
+    cache.put(1, exp, _principal(1))
+    cache.put(1, exp + 10, _principal(1))
+    cache.put(2, exp, _principal(2))
+    cache.invalidate(1)
+    assert cache.get(1, exp) is None
+    assert cache.get(1, exp + 10) is None
+    assert cache.get(2, exp) is not None
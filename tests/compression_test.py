@@ -0,0 +1,86 @@
+import gzip
+
+from fastapi.testclient import TestClient
+from starlette.responses import StreamingResponse
+
+from src.compression import CompressionMiddleware, CompressionStats, negotiate, compression_stats
+
+def _seed_tasks(client, headers, count=40):
+    tasks = [{"title": f"Tarefa {i}", "description": "Descrição repetida " * 5, "assigned_to": 1} for i in range(count)]
+    assert client.post("/tasks/bulk", json=tasks, headers=headers).status_code == 200
+
+def test_negotiate_quality_and_server_preference():
+    assert negotiate("gzip, br", ["br", "gzip"]) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate(None, ["gzip"]) is None
+
+def test_large_list_is_gzipped(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _seed_tasks(client, headers)
+    compression_stats.clear()
+
+    r = client.get("/tasks/", headers={**headers, "Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert int(r.headers["content-length"]) < len(r.content)
+    assert len(r.json()) == 40  # httpx descomprime de forma transparente
+
+    stats = client.get("/admin/compression", headers=headers).json()
+    assert stats["compressed"]["gzip"]["responses"] == 1
+    assert stats["bytes_in"] == len(r.content)
+    assert stats["bytes_saved"] > 0
+
+def test_identity_and_small_responses_are_not_compressed(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _seed_tasks(client, headers)
+    compression_stats.clear()
+
+    r = client.get("/tasks/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in r.headers
+    assert "Accept-Encoding" in r.headers["vary"]
+    r = client.get("/tasks/1", headers={**headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+
+    assert compression_stats.stats()["skipped"] == {"not_accepted": 1, "too_small": 1}
+
+def test_compressed_strong_etag_becomes_weak(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}", "Accept-Encoding": "gzip"}
+    task_id = client.post("/tasks/", json={"title": "Grande", "description": "x" * 2000}, headers=headers).json()["id"]
+
+    r = client.get(f"/tasks/{task_id}", headers=headers)
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["etag"].startswith('W/"')
+    r = client.get(f"/tasks/{task_id}", headers={**headers, "If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
+
+def test_streaming_is_skipped_unless_enabled():
+    async def app(scope, receive, send):
+        chunks = (b'{"n":%d}\n' % i * 50 for i in range(3))
+        await StreamingResponse(chunks, media_type="application/x-ndjson")(scope, receive, send)
+
+    stats = CompressionStats()
+    skipped = TestClient(CompressionMiddleware(app, encodings=["gzip"], stats=stats))
+    r = skipped.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    assert stats.stats()["skipped"] == {"streaming": 1}
+
+    streamed = TestClient(CompressionMiddleware(app, encodings=["gzip"], streaming=True, stats=stats))
+    with streamed.stream("GET", "/", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        assert "content-length" not in r.headers
+        raw = b"".join(r.iter_raw())
+    assert gzip.decompress(raw) == b"".join(b'{"n":%d}\n' % i * 50 for i in range(3))
+    assert stats.stats()["compressed"]["gzip"]["bytes_out"] == len(raw)
+
+def test_event_stream_is_never_compressed():
+    async def app(scope, receive, send):
+        await StreamingResponse(iter([b"data: x\n\n" * 500]), media_type="text/event-stream")(scope, receive, send)
+
+    stats = CompressionStats()
+    client = TestClient(CompressionMiddleware(app, encodings=["gzip"], streaming=True, stats=stats))
+    r = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers
+    assert stats.stats()["skipped"] == {"content_type": 1}
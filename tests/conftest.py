@@ -1,15 +1,24 @@
 import os
 import pytest
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 import jwt
+
+# custo mínimo do bcrypt para manter a suíte rápida
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event, text
 from sqlalchemy.orm import Session
 
 from src.main import app
 from src.database import Base, engine, SessionLocal
 from src.models.user_model import UserCreate, User
 from src.controllers.user_controller import create_user
+from src.auth.principal_cache import principal_cache
+from src.controllers.list_cache import list_cache
+from src.controllers.due_scheduler import due_scheduler
 
 # copia a mesma key usada em auth_controller.py
 SECRET_KEY = os.getenv("JWT_SECRET", "supersecret")
@@ -33,7 +42,12 @@ def clear_and_seed_db(db):
     # 1) limpa todas as tabelas
     for table in reversed(Base.metadata.sorted_tables):
         db.execute(table.delete())
+    # reinicia os ids AUTOINCREMENT: cada teste começa da tarefa/comentário 1
+    db.execute(text("DELETE FROM sqlite_sequence"))
     db.commit()
+    principal_cache.clear()
+    list_cache.clear()
+    due_scheduler.clear()
     # 2) cria o usuário padrão: ID=1, senha “1234”
     default = UserCreate(
         name="Test User",
@@ -59,3 +73,18 @@ def auth_token(create_test_user):
 @pytest.fixture(scope="function")
 def client():
     return TestClient(app)
+
+@pytest.fixture
+def count_statements():
+    # uso: with count_statements() as statements: ...; statements = SQL executado no bloco
+    @contextmanager
+    def _counter():
+        statements = []
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+    return _counter
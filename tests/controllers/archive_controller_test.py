@@ -0,0 +1,119 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from src.controllers import archive_controller
+from src.controllers.archive_controller import archive_done_tasks, archive_stats
+from src.controllers.task_controller import create_task, update_task, get_task, delete_task, list_tasks_filtered
+from src.controllers.task_bulk_controller import bulk_update_tasks
+from src.controllers.comment_controller import create_comment
+from src.controllers.stats_controller import get_task_stats, reconcile_task_stats
+from src.controllers.includes import expand_task
+from src.models.task_model import Task, TaskCreate, TaskUpdate, TaskBulkUpdate
+from src.models.comment_model import CommentCreate
+from src.models.archive_model import ArchivedComment
+from src.database import SessionLocal
+
+def _age(db, days=60):
+    db.query(Task).filter(Task.status == "done").update({Task.completed_at: datetime.now() - timedelta(days=days)})
+    db.commit()
+
+def _seed(db, done=3):
+    ids = [create_task(TaskCreate(title=f"feita {i}", assigned_to=1), db).id for i in range(done)]
+    for task_id in ids:
+        update_task(task_id, TaskUpdate(status="done"), db)
+    create_comment(ids[0], 1, CommentCreate(content="histórico"), db)
+    # tarefa aberta segue na tabela quente
+    newest = create_task(TaskCreate(title="aberta"), db)
+    create_comment(newest.id, 1, CommentCreate(content="recente"), db)
+    return ids, newest.id
+
+def test_completed_at_follows_status(db):
+    task = create_task(TaskCreate(title="A"), db)
+    assert task.completed_at is None
+    update_task(task.id, TaskUpdate(status="done"), db)
+    completed_at = get_task(task.id, db).completed_at
+    assert completed_at is not None
+    update_task(task.id, TaskUpdate(title="B"), db)
+    assert get_task(task.id, db).completed_at == completed_at
+    bulk_update_tasks([TaskBulkUpdate(id=task.id, status="pending")], db)
+    db.expire_all()
+    assert get_task(task.id, db).completed_at is None
+
+def test_archive_moves_old_done_tasks_in_chunks(db):
+    ids, newest = _seed(db)
+    _age(db)
+    assert len(list_tasks_filtered(db, status_filter="done")) == 3
+
+    summary = archive_done_tasks(db, older_than_days=30, chunk_size=2, pause=0)
+    assert summary["archived_tasks"] == 3
+    assert summary["archived_comments"] == 1
+    assert summary["chunks"] == 2
+    assert (summary["hot_tasks_before"], summary["hot_tasks_after"]) == (4, 1)
+    assert db.query(ArchivedComment).count() == 1
+
+    # some das listagens quentes (inclusive do cache) e continua legível
+    assert list_tasks_filtered(db, status_filter="done") == []
+    assert [t.id for t in list_tasks_filtered(db, archived=True)] == ids
+    assert get_task(ids[0], db).title == "feita 0"
+    assert [c.content for c in expand_task(get_task(ids[0], db), {"comments"}, db).comments] == ["histórico"]
+    assert get_task(newest, db).title == "aberta"
+
+    # somente leitura
+    with pytest.raises(HTTPException) as exc:
+        update_task(ids[0], TaskUpdate(title="x"), db)
+    assert exc.value.status_code == 404
+
+    # contadores de /tasks/stats seguem contando as arquivadas
+    assert get_task_stats(db)["total"] == 4
+    assert reconcile_task_stats(db, apply=False) == []
+    assert archive_stats(db)["archived_tasks"] == 3
+
+def test_archive_respects_age(db):
+    _seed(db)
+    assert archive_done_tasks(db, older_than_days=30, pause=0)["archived_tasks"] == 0  # recém-concluídas
+    _age(db)
+    last = create_task(TaskCreate(title="última"), db)
+    update_task(last.id, TaskUpdate(status="done"), db)
+    assert archive_done_tasks(db, older_than_days=30, pause=0)["archived_tasks"] == 3
+    assert [t.id for t in list_tasks_filtered(db, status_filter="done")] == [last.id]
+
+def test_ids_and_versions_are_not_reused_after_delete_and_archive(db):
+    first, second, newest = (create_task(TaskCreate(title=f"t{i}"), db).id for i in range(3))
+    delete_task(newest, db)
+    archived = update_task(second, TaskUpdate(status="done"), db)  # maior id e maior versão
+    _age(db)
+    assert archive_done_tasks(db, older_than_days=30, pause=0)["archived_tasks"] == 1
+    # sem AUTOINCREMENT a nova tarefa receberia MAX(id) + 1 = id da arquivada
+    task = create_task(TaskCreate(title="nova"), db)
+    assert task.id == newest + 1
+    assert task.version > archived.version
+    update_task(task.id, TaskUpdate(status="done"), db)
+    _age(db)
+    assert archive_done_tasks(db, older_than_days=30, pause=0)["archived_tasks"] == 1
+    assert [t.id for t in list_tasks_filtered(db, archived=True)] == [second, task.id]
+    assert get_task(first, db).status == "pending"
+
+def test_archive_keeps_tasks_reopened_after_the_candidate_read(db, monkeypatch):
+    ids, newest = _seed(db)
+    _age(db)
+    assert [t.id for t in list_tasks_filtered(db, status_filter="pending")] == [newest]
+    read = archive_controller._candidates
+
+    def _reopen_after_read(session, cutoff, limit):
+        candidates = read(session, cutoff, limit)
+        # outra requisição reabre a primeira tarefa entre a leitura e a movimentação
+        with SessionLocal() as other:
+            update_task(ids[0], TaskUpdate(status="pending"), other)
+        return candidates
+
+    monkeypatch.setattr(archive_controller, "_candidates", _reopen_after_read)
+    summary = archive_done_tasks(db, older_than_days=30, chunk_size=10, pause=0, max_chunks=1)
+    assert (summary["archived_tasks"], summary["archived_comments"]) == (2, 0)
+
+    # a reaberta segue quente, com o comentário, e o cache enxerga a mudança de status
+    db.expire_all()
+    assert get_task(ids[0], db).status == "pending"
+    assert db.query(ArchivedComment).count() == 0
+    assert [t.id for t in list_tasks_filtered(db, status_filter="pending")] == [ids[0], newest]
+    assert [t.id for t in list_tasks_filtered(db, archived=True)] == ids[1:]
@@ -65,3 +65,54 @@ def test_delete_comment_permission_denied(db, comment_data, setup_task):
         delete_comment(comment.id, 2, db)
     assert exc.value.status_code == 403
     assert exc.value.detail == "Permissão negada"
+
+def test_comment_timestamps_are_per_row(db, comment_data, setup_task):
+    first = create_comment(setup_task.id, 1, comment_data, db)
+    second = create_comment(setup_task.id, 1, comment_data, db)
+    assert second.created_at > first.created_at
+
+def test_list_comments_before(db, comment_data, setup_task):
+    ids = [create_comment(setup_task.id, 1, comment_data, db).id for _ in range(4)]
+    page = list_comments(setup_task.id, db, limit=2, before=ids[2])
+    assert [c.id for c in page] == [ids[1], ids[0]]
+    assert page.next_cursor is None
+
+def test_list_comments_before_invalid(db, comment_data, setup_task):
+    comment = create_comment(setup_task.id, 1, comment_data, db)
+    with pytest.raises(HTTPException) as exc:
+        list_comments(setup_task.id, db, limit=2, before=comment.id + 100)
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        list_comments(setup_task.id, db, limit=2, cursor="x", before=comment.id)
+    assert exc.value.status_code == 400
+
+def test_comments_update_task_counters(db, comment_data, setup_task):
+    version = setup_task.version
+    first = create_comment(setup_task.id, 1, comment_data, db)
+    second = create_comment(setup_task.id, 1, comment_data, db)
+    db.refresh(setup_task)
+    assert setup_task.comment_count == 2
+    assert setup_task.last_activity_at == second.created_at
+    assert setup_task.version > version
+
+    delete_comment(second.id, 1, db)
+    db.refresh(setup_task)
+    assert setup_task.comment_count == 1
+    assert setup_task.last_activity_at == first.created_at
+    delete_comment(first.id, 1, db)
+    db.refresh(setup_task)
+    assert (setup_task.comment_count, setup_task.last_activity_at) == (0, None)
+
+def test_reconcile_comment_activity(db, comment_data, setup_task):
+    from src.controllers.comment_controller import reconcile_comment_activity
+    comment = create_comment(setup_task.id, 1, comment_data, db)
+    setup_task.comment_count = 7
+    setup_task.last_activity_at = None
+    db.commit()
+
+    drift = reconcile_comment_activity(db, apply=False)
+    assert drift == [(setup_task.id, 7, 1, None, comment.created_at)]
+    assert reconcile_comment_activity(db) == drift
+    db.refresh(setup_task)
+    assert (setup_task.comment_count, setup_task.last_activity_at) == (1, comment.created_at)
+    assert reconcile_comment_activity(db) == []
@@ -0,0 +1,120 @@
+from datetime import date, datetime, timedelta
+
+from src.controllers.due_scheduler import DueScheduler, due_scheduler
+from src.controllers.task_controller import create_task, update_task, delete_task
+from src.controllers.task_bulk_controller import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from src.models.task_model import Task, TaskCreate, TaskUpdate, TaskBulkUpdate
+
+NOW = datetime(2026, 10, 18, 10, 0)
+TODAY = NOW.date()
+
+def _task(task_id, due, status="pending"):
+    return {"id": task_id, "title": f"t{task_id}", "description": None, "status": status,
+            "priority": "medium", "due_date": due, "assigned_to": None}
+
+def test_overdue_and_due_soon_windows():
+    scheduler = DueScheduler(due_soon_hours=24)
+    scheduler.track(_task(1, TODAY - timedelta(days=2)), NOW)
+    scheduler.track(_task(2, TODAY - timedelta(days=1)), NOW)
+    scheduler.track(_task(3, TODAY), NOW)
+    scheduler.track(_task(4, TODAY + timedelta(days=1)), NOW)
+    scheduler.track(_task(5, TODAY + timedelta(days=3)), NOW)
+    scheduler.track(_task(6, None), NOW)
+    scheduler.track(_task(7, TODAY - timedelta(days=5), status="done"), NOW)
+
+    assert [t.id for t in scheduler.overdue(now=NOW)] == [1, 2]
+    assert [t.id for t in scheduler.overdue(limit=1, now=NOW)] == [1]
+    # prazo = fim do dia: às 10h, 24h cobrem só hoje; 48h incluem amanhã
+    assert [t.id for t in scheduler.due_soon(now=NOW)] == [3]
+    assert [t.id for t in scheduler.due_soon(hours=48, now=NOW)] == [3, 4]
+    assert scheduler.stats()["tracked"] == 5
+
+def test_track_replaces_and_untracks():
+    scheduler = DueScheduler()
+    scheduler.track(_task(1, TODAY - timedelta(days=1)), NOW)
+    scheduler.track(_task(1, TODAY), NOW)
+    assert scheduler.overdue(now=NOW) == []
+    assert [t.id for t in scheduler.due_soon(now=NOW)] == [1]
+    scheduler.track(_task(1, TODAY, status="done"), NOW)
+    assert scheduler.due_soon(now=NOW) == []
+    scheduler.track(_task(2, TODAY), NOW)
+    scheduler.untrack(2)
+    assert scheduler.stats()["tracked"] == 0
+
+def test_tick_fires_reminders_once_and_skips_stale():
+    scheduler = DueScheduler(due_soon_hours=24)
+    fired = []
+    scheduler.add_callback(lambda kind, task: fired.append((kind, task.id)))
+    scheduler.track(_task(1, TODAY + timedelta(days=1)), NOW)
+    scheduler.track(_task(2, TODAY + timedelta(days=1)), NOW)
+    scheduler.untrack(2)
+
+    assert scheduler.tick(NOW) == 0
+    # 24h antes do prazo (fim de amanhã) = meia-noite de hoje para amanhã
+    assert scheduler.tick(datetime.combine(TODAY + timedelta(days=1), datetime.min.time())) == 1
+    assert fired == [("due_soon", 1)]
+    assert scheduler.tick(datetime.combine(TODAY + timedelta(days=2), datetime.min.time())) == 1
+    assert fired == [("due_soon", 1), ("overdue", 1)]
+    assert scheduler.tick(NOW + timedelta(days=30)) == 0
+    assert scheduler.stats()["stale_timers"] == 2
+
+def test_tick_cost_does_not_depend_on_total_tasks():
+    scheduler = DueScheduler()
+    for i in range(5000):
+        scheduler.track(_task(i, TODAY + timedelta(days=30 + i % 100)), NOW)
+    scheduler.track(_task(99999, TODAY), NOW)
+    # só o topo do heap é inspecionado: um tick sem nada vencido não visita as demais entradas
+    assert scheduler.tick(NOW) == 0
+    assert scheduler.tick(datetime.combine(TODAY + timedelta(days=1), datetime.min.time())) == 1
+
+def test_failing_callback_does_not_stop_others():
+    scheduler = DueScheduler()
+    fired = []
+    scheduler.add_callback(lambda kind, task: 1 / 0)
+    scheduler.add_callback(lambda kind, task: fired.append(task.id))
+    scheduler.track(_task(1, TODAY + timedelta(days=5)), NOW)
+    scheduler.tick(NOW + timedelta(days=10))
+    assert fired == [1, 1]  # due_soon e overdue
+
+def test_reload_does_not_repeat_past_reminders(db):
+    today = date.today()
+    # tarefas com prazo no passado só existem após o tempo passar: grava direto no banco
+    db.add_all([
+        Task(title="vencida", status="pending", due_date=today - timedelta(days=3)),
+        Task(title="futura", status="pending", due_date=today + timedelta(days=10)),
+        Task(title="feita", status="done", due_date=today - timedelta(days=1)),
+        Task(title="sem data", status="pending"),
+    ])
+    db.commit()
+
+    scheduler = DueScheduler()
+    assert scheduler.load(db) == 2
+    assert [t.title for t in scheduler.overdue()] == ["vencida"]
+    assert scheduler.tick() == 0
+
+def test_controllers_keep_scheduler_current(db):
+    later = datetime.now() + timedelta(days=5)
+    task = create_task(TaskCreate(title="A", due_date=date.today()), db)
+    assert [t.id for t in due_scheduler.due_soon(hours=48)] == [task.id]
+    assert [t.id for t in due_scheduler.overdue(now=later)] == [task.id]
+
+    update_task(task.id, TaskUpdate(due_date=date.today() + timedelta(days=10)), db)
+    assert due_scheduler.due_soon(hours=48) == []
+    assert due_scheduler.overdue(now=later) == []
+
+    update_task(task.id, TaskUpdate(status="done"), db)
+    assert due_scheduler.stats()["tracked"] == 0
+    update_task(task.id, TaskUpdate(status="pending"), db)
+    assert due_scheduler.stats()["tracked"] == 1
+    delete_task(task.id, db)
+    assert due_scheduler.stats()["tracked"] == 0
+
+def test_bulk_writes_keep_scheduler_current(db):
+    later = datetime.now() + timedelta(days=5)
+    result = bulk_create_tasks([TaskCreate(title=f"t{i}", due_date=date.today()) for i in range(3)], db)
+    ids = [r["id"] for r in result["results"]]
+    assert [t.id for t in due_scheduler.overdue(now=later)] == ids
+
+    bulk_update_tasks([TaskBulkUpdate(id=ids[0], status="done")], db)
+    bulk_delete_tasks([ids[1]], db)
+    assert [t.id for t in due_scheduler.overdue(now=later)] == [ids[2]]
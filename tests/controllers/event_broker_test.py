@@ -0,0 +1,63 @@
+import asyncio
+
+from src.controllers.event_broker import EventBroker, event_broker, event_stream
+from src.controllers.task_controller import create_task, update_task
+from src.controllers.comment_controller import create_comment
+from src.models.task_model import TaskCreate, TaskUpdate
+from src.models.comment_model import CommentCreate
+
+def _row(assigned_to=None, status="pending"):
+    return {"status": status, "priority": "medium", "due_date": None, "assigned_to": assigned_to}
+
+def test_fanout_respects_filters():
+    async def scenario():
+        broker = EventBroker()
+        everyone = broker.subscribe()
+        mine = broker.subscribe(assigned_to=1)
+        done = broker.subscribe(status="done")
+        broker.publish("task.created", {"task_id": 1}, [_row(assigned_to=1)])
+        broker.publish("task.updated", {"task_id": 2}, [_row(assigned_to=2), _row(assigned_to=2, status="done")])
+        await asyncio.sleep(0)
+        return [[e.type for e in s.queue] for s in (everyone, mine, done)], broker.stats()
+
+    queues, stats = asyncio.run(scenario())
+    assert queues == [["task.created", "task.updated"], ["task.created"], ["task.updated"]]
+    assert stats["delivered"] == 4
+
+def test_slow_consumer_is_disconnected():
+    async def scenario():
+        broker = EventBroker()
+        slow = broker.subscribe(max_queue=2)
+        for i in range(3):
+            broker.publish("task.created", {"task_id": i}, [_row()])
+        await asyncio.sleep(0)
+        return slow, broker.stats()
+
+    slow, stats = asyncio.run(scenario())
+    assert slow.closed and slow.reason == "slow_consumer"
+    assert stats["subscribers"] == 0
+    assert stats["disconnected_slow_consumers"] == 1
+
+def test_controllers_publish_after_commit(db):
+    async def scenario():
+        subscriber = event_broker.subscribe(assigned_to=1)
+        stream = event_stream(subscriber, heartbeat=0.01)
+        chunks = [await stream.__anext__()]
+        task = await asyncio.to_thread(create_task, TaskCreate(title="Feed", assigned_to=1), db)
+        await asyncio.to_thread(update_task, task.id, TaskUpdate(status="done"), db)
+        await asyncio.to_thread(create_comment, task.id, 1, CommentCreate(content="oi"), db)
+        await asyncio.to_thread(create_task, TaskCreate(title="Outro"), db)
+        for _ in range(4):
+            chunks.append(await stream.__anext__())
+        await stream.aclose()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+    assert chunks[0] == ": conectado\n\n"
+    assert chunks[1].startswith("event: task.created\n")
+    assert '"title":"Feed"' in chunks[1]
+    assert chunks[2].startswith("event: task.updated\n")
+    assert chunks[3].startswith("event: comment.created\n")
+    # a tarefa sem responsável não passa pelo filtro: só keep-alive
+    assert chunks[4] == ": ping\n\n"
+    assert event_broker.stats()["subscribers"] == 0
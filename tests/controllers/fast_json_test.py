@@ -0,0 +1,47 @@
+import json
+from datetime import date, datetime, UTC
+from fastapi import Response
+
+from src.controllers import fast_json
+from src.controllers.fast_json import TASK_ROWS, COMMENT_ROWS, USER_ROWS, fast_response
+from src.controllers.task_controller import create_task, list_tasks_filtered
+from src.controllers.comment_controller import create_comment, list_comments
+from src.models.task_model import TaskCreate, TaskOut
+from src.models.comment_model import CommentCreate, CommentOut
+from src.models.user_model import UserOut
+
+def _pydantic_json(schema, items) -> bytes:
+    # mesmo formato do caminho padrão (response_model + JSONResponse)
+    data = [schema.model_validate(item).model_dump(mode="json") for item in items]
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+def test_rows_match_pydantic_output(db):
+    task = create_task(TaskCreate(title="Ação", assigned_to=1, due_date=date(2100, 1, 2)), db)
+    create_task(TaskCreate(title="sem data"), db)
+    create_comment(task.id, 1, CommentCreate(content="olá"), db)
+
+    rows = list_tasks_filtered(db, rows=True)
+    assert not isinstance(rows[0], TaskOut)
+    assert TASK_ROWS.dumps(rows) == _pydantic_json(TaskOut, list_tasks_filtered(db))
+    comments = list_comments(task.id, db, rows=True)
+    assert COMMENT_ROWS.dumps(comments) == _pydantic_json(CommentOut, list_comments(task.id, db))
+
+def test_serializer_accepts_schema_instances_and_utc(db):
+    users = [UserOut(id=1, name="Zé", email="ze@example.com", is_active=True)]
+    assert USER_ROWS.dumps(users) == _pydantic_json(UserOut, users)
+    comment = CommentOut(id=1, created_at=datetime(2026, 1, 1, 9, 0, tzinfo=UTC), content="c")
+    assert COMMENT_ROWS.dumps([comment]) == _pydantic_json(CommentOut, [comment])
+
+def test_stdlib_fallback(monkeypatch):
+    monkeypatch.setattr(fast_json, "orjson", None)
+    comment = CommentOut(id=1, created_at=datetime(2026, 1, 1, 9, 0, 0, 5), content="ç")
+    assert COMMENT_ROWS.dumps([comment]) == _pydantic_json(CommentOut, [comment])
+
+def test_fast_response_keeps_route_headers():
+    response = Response()
+    response.headers["ETag"] = 'W/"1"'
+    fast = fast_response(USER_ROWS, [], response)
+    assert fast.body == b"[]"
+    assert fast.headers["etag"] == 'W/"1"'
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.headers["content-length"] == "2"
@@ -0,0 +1,46 @@
+import pytest
+from fastapi import HTTPException
+
+from src.controllers.includes import parse_include, expand_tasks, expand_task
+from src.controllers.task_controller import create_task, list_tasks_filtered, get_task
+from src.controllers.comment_controller import create_comment
+from src.models.task_model import TaskCreate
+from src.models.comment_model import CommentCreate
+
+def _seed(db, total):
+    for i in range(total):
+        task = create_task(TaskCreate(title=f"t{i}", assigned_to=1 if i % 2 else None), db)
+        for j in range(i % 3):
+            create_comment(task.id, 1, CommentCreate(content=f"c{i}-{j}"), db)
+
+def test_parse_include():
+    assert parse_include(None) == set()
+    assert parse_include(" assignee, comments ") == {"assignee", "comments"}
+    with pytest.raises(HTTPException) as exc:
+        parse_include("assignee,owner")
+    assert exc.value.status_code == 400
+
+def test_expand_embeds_assignee_and_latest_comments(db):
+    task = create_task(TaskCreate(title="A", assigned_to=1), db)
+    for i in range(4):
+        create_comment(task.id, 1, CommentCreate(content=f"c{i}"), db)
+    other = create_task(TaskCreate(title="B"), db)
+
+    expanded = expand_tasks([get_task(task.id, db), get_task(other.id, db)], {"assignee", "comments"}, db,
+                            comments_limit=3)
+    assert expanded[0].assignee.id == 1
+    assert [c.content for c in expanded[0].comments] == ["c3", "c2", "c1"]
+    assert expanded[1].assignee is None
+    assert expanded[1].comments == []
+    # só os campos pedidos entram na resposta
+    assert "comments" not in expand_task(get_task(task.id, db), {"assignee"}, db).model_dump(exclude_unset=True)
+
+@pytest.mark.parametrize("page_size", [2, 20])
+def test_statement_count_does_not_depend_on_page_size(db, page_size, count_statements):
+    _seed(db, 20)
+    page = list_tasks_filtered(db, limit=page_size)
+    with count_statements() as statements:
+        expanded = expand_tasks(page, {"assignee", "comments"}, db)
+    assert len(expanded) == page_size
+    assert len(statements) == 2  # uma consulta por relação
+    assert page.next_cursor is None or expanded.next_cursor == page.next_cursor
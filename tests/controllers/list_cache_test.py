@@ -0,0 +1,88 @@
+import time
+from datetime import date, timedelta
+
+from src.controllers.list_cache import (
+    ListCache, MemoryBackend, SharedBackend, LocalStore, filters_key, list_cache,
+)
+from src.controllers.pagination import Page
+from src.controllers.task_controller import create_task, update_task, delete_task, list_tasks_filtered
+from src.models.task_model import TaskCreate, TaskUpdate, TaskOut
+
+def _page(*ids):
+    return Page([TaskOut(id=i, title="t", status="pending", priority="low") for i in ids], next_cursor="c")
+
+def test_memory_backend_lru_and_ttl():
+    backend = MemoryBackend(max_size=2, ttl=60)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+    assert backend.get("b") is None
+    assert backend.get("a") == 1
+    assert backend.evictions == 1
+
+    expiring = MemoryBackend(max_size=2, ttl=0.01)
+    expiring.set("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+
+def test_shared_backend_with_local_store():
+    backend = SharedBackend(LocalStore(), max_size=2, ttl=60)
+    cache = ListCache(backend)
+    for key in ("k1", "k2", "k3"):
+        cache.put(key, _page(1, 2), cache.generation())
+    assert backend.size() == 2
+    assert cache.get("k1") is None
+    page = cache.get("k3")
+    assert [t.id for t in page] == [1, 2] and page.next_cursor == "c"
+
+def test_invalidation_only_drops_matching_entries():
+    cache = ListCache(MemoryBackend(max_size=10, ttl=60))
+    soon = date.today() + timedelta(days=3)
+    keys = {
+        "pending": filters_key(status_filter="pending"),
+        "done": filters_key(status_filter="done"),
+        "user2": filters_key(user_id=2),
+        "due": filters_key(due_before=soon),
+        "all": filters_key(limit=10),
+    }
+    for key in keys.values():
+        cache.put(key, _page(1), cache.generation())
+    cache.invalidate_rows([{"status": "pending", "priority": "low", "due_date": None, "assigned_to": 1}])
+    survivors = {name for name, key in keys.items() if cache.get(key) is not None}
+    assert survivors == {"done", "user2", "due"}
+    assert cache.stats()["invalidations"] == 2
+
+def test_stale_read_is_not_cached():
+    cache = ListCache(MemoryBackend(max_size=10, ttl=60))
+    generation = cache.generation()
+    cache.invalidate_rows([{"status": "done", "priority": "low", "due_date": None, "assigned_to": None}])
+    cache.put("k", _page(1), generation)
+    assert cache.get("k") is None
+
+def test_shared_generation_is_seen_by_every_worker():
+    store = LocalStore()
+    reader, writer = ListCache(SharedBackend(store)), ListCache(SharedBackend(store))
+    generation = reader.generation()
+    # outro worker grava e invalida enquanto este ainda consultava o banco
+    writer.invalidate_rows([{"status": "done", "priority": "low", "due_date": None, "assigned_to": None}])
+    reader.put("k", _page(1), generation)
+    assert reader.get("k") is None
+    reader.put("k", _page(1), reader.generation())
+    assert [t.id for t in writer.get("k")] == [1]
+
+def test_list_tasks_filtered_uses_cache(db):
+    t1 = create_task(TaskCreate(title="C1", status="pending"), db)
+    create_task(TaskCreate(title="C2", status="done"), db)
+    assert [t.title for t in list_tasks_filtered(db, status_filter="pending")] == ["C1"]
+    assert [t.title for t in list_tasks_filtered(db, status_filter="pending")] == ["C1"]
+    list_tasks_filtered(db, status_filter="done")
+    assert list_cache.stats()["hits"] == 1
+
+    # update que move a tarefa de pending para done invalida as duas listagens
+    update_task(t1.id, TaskUpdate(status="done"), db)
+    assert list_tasks_filtered(db, status_filter="pending") == []
+    assert len(list_tasks_filtered(db, status_filter="done")) == 2
+    delete_task(t1.id, db)
+    assert [t.title for t in list_tasks_filtered(db, status_filter="done")] == ["C2"]
+    assert list_cache.stats()["saved_queries"] == 1
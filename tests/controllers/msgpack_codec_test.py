@@ -0,0 +1,45 @@
+import asyncio
+from datetime import date, datetime, UTC
+
+import pytest
+from fastapi import HTTPException, Request
+
+from src.controllers import msgpack_codec
+from src.controllers.msgpack_codec import prefers_msgpack, packb, _as_json_request
+
+msgpack = pytest.importorskip("msgpack")
+
+def test_prefers_msgpack_only_when_asked():
+    assert prefers_msgpack("application/msgpack")
+    assert prefers_msgpack("application/x-msgpack, application/json")
+    assert not prefers_msgpack("application/json;q=1, application/msgpack;q=0.5")
+    assert not prefers_msgpack("*/*")
+    assert not prefers_msgpack(None)
+
+def test_prefers_json_without_msgpack_package(monkeypatch):
+    monkeypatch.setattr(msgpack_codec, "msgpack", None)
+    assert not prefers_msgpack("application/msgpack")
+
+def test_packb_dates_match_json_text():
+    data = msgpack.unpackb(packb({"d": date(2100, 1, 2), "naive": datetime(2026, 1, 1, 12), "utc": datetime(2026, 1, 1, tzinfo=UTC)}))
+    assert data == {"d": "2100-01-02", "naive": "2026-01-01T12:00:00", "utc": "2026-01-01T00:00:00Z"}
+
+def _request(body: bytes) -> Request:
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+    scope = {"type": "http", "method": "POST", "path": "/tasks/", "headers": [(b"content-type", b"application/msgpack")]}
+    return Request(scope, receive)
+
+def test_msgpack_body_becomes_json_request():
+    request = asyncio.run(_as_json_request(_request(msgpack.packb({"title": "t"}))))
+    assert request.headers["content-type"] == "application/json"
+    assert asyncio.run(request.json()) == {"title": "t"}
+
+def test_invalid_msgpack_body_is_rejected(monkeypatch):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(_as_json_request(_request(b"\xc1")))
+    assert exc.value.status_code == 400
+    monkeypatch.setattr(msgpack_codec, "msgpack", None)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(_as_json_request(_request(b"\x80")))
+    assert exc.value.status_code == 415
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from src.controllers.search_controller import search_tasks, rebuild_search_index, build_match_expression, _search_like
+from src.controllers.task_controller import create_task, update_task, delete_task
+from src.controllers.task_bulk_controller import bulk_create_tasks
+from src.models.task_model import TaskCreate, TaskUpdate
+
+def test_search_follows_writes(db):
+    t1 = create_task(TaskCreate(title="Implementar autenticação", description="login JWT"), db)
+    t2 = create_task(TaskCreate(title="Revisar relatório"), db)
+    assert [t.id for t in search_tasks("autenticacao", db, limit=10)] == [t1.id]
+    assert [t.id for t in search_tasks("jwt", db, limit=10)] == [t1.id]
+    assert [t.id for t in search_tasks("relat", db, limit=10)] == [t2.id]
+
+    update_task(t2.id, TaskUpdate(title="Revisar deploy"), db)
+    assert search_tasks("relatório", db, limit=10) == []
+    delete_task(t1.id, db)
+    assert search_tasks("login", db, limit=10) == []
+
+def test_search_ranks_and_paginates(db):
+    bulk_create_tasks([
+        TaskCreate(title="deploy", description="deploy deploy em produção"),
+        TaskCreate(title="outra coisa", description="mencionar deploy"),
+        TaskCreate(title="deploy"),
+    ], db)
+    first = search_tasks("deploy", db, limit=2)
+    assert len(first) == 2 and first.next_cursor
+    second = search_tasks("deploy", db, limit=2, cursor=first.next_cursor)
+    assert len(second) == 1 and second.next_cursor is None
+    ranked = [t.title for t in first] + [t.title for t in second]
+    assert ranked[-1] == "outra coisa"
+
+def test_search_rejects_empty_terms(db):
+    with pytest.raises(HTTPException) as exc:
+        search_tasks('"*', db, limit=10)
+    assert exc.value.status_code == 400
+    assert build_match_expression('a AND "b') == '"a"* "AND"* "b"*'
+
+def test_rebuild_search_index(db):
+    create_task(TaskCreate(title="migrada"), db)
+    db.execute(text("INSERT INTO tasks_fts(tasks_fts) VALUES ('delete-all')"))
+    db.commit()
+    assert search_tasks("migrada", db, limit=10) == []
+    assert rebuild_search_index(db) == 1
+    assert len(search_tasks("migrada", db, limit=10)) == 1
+
+def test_like_fallback_treats_wildcards_as_literals(db):
+    # caminho de bancos sem FTS5 (Postgres), exercitado direto no SQLite
+    desconto = create_task(TaskCreate(title="Desconto de 50%"), db)
+    create_task(TaskCreate(title="Meta 50 pontos"), db)
+    create_task(TaskCreate(title="arquivo_final"), db)
+    caminho = create_task(TaskCreate(title="Pasta", description="C:\\dados"), db)
+
+    assert [t.id for t in _search_like("%", db, limit=10, cursor=None)] == [desconto.id]
+    assert [t.id for t in _search_like("50%", db, limit=10, cursor=None)] == [desconto.id]
+    assert [t.title for t in _search_like("o_f", db, limit=10, cursor=None)] == ["arquivo_final"]
+    assert len(_search_like("a_q", db, limit=10, cursor=None)) == 0
+    assert [t.id for t in _search_like("c:\\d", db, limit=10, cursor=None)] == [caminho.id]
@@ -0,0 +1,46 @@
+from src.controllers.stats_controller import get_task_stats, reconcile_task_stats
+from src.controllers.task_controller import create_task, update_task, delete_task
+from src.controllers.task_bulk_controller import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from src.models.task_model import Task, TaskCreate, TaskUpdate, TaskBulkUpdate
+
+def test_stats_follow_task_writes(db):
+    t1 = create_task(TaskCreate(title="A", assigned_to=1, priority="high"), db)
+    create_task(TaskCreate(title="B"), db)
+    update_task(t1.id, TaskUpdate(status="done"), db)
+    stats = get_task_stats(db)
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"pending": 1, "done": 1}
+    assert stats["by_priority"] == {"high": 1, "medium": 1}
+    assert stats["by_assignee"] == [{"assigned_to": 1, "count": 1}, {"assigned_to": None, "count": 1}]
+
+    delete_task(t1.id, db)
+    stats = get_task_stats(db)
+    assert stats["total"] == 1
+    assert stats["by_status"] == {"pending": 1}
+    assert reconcile_task_stats(db, apply=False) == []
+
+def test_stats_follow_bulk_writes(db):
+    result = bulk_create_tasks([TaskCreate(title=f"t{i}", assigned_to=1) for i in range(3)], db)
+    ids = [r["id"] for r in result["results"]]
+    bulk_update_tasks([
+        TaskBulkUpdate(id=ids[0], status="in_progress"),
+        TaskBulkUpdate(id=ids[0], status="done"),
+        TaskBulkUpdate(id=ids[1], priority="low"),
+    ], db)
+    bulk_delete_tasks([ids[2]], db)
+    stats = get_task_stats(db)
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"done": 1, "pending": 1}
+    assert stats["by_priority"] == {"low": 1, "medium": 1}
+    assert reconcile_task_stats(db, apply=False) == []
+
+def test_reconcile_reports_and_fixes_drift(db):
+    create_task(TaskCreate(title="A"), db)
+    # escrita fora dos controllers: contadores ficam defasados
+    db.add(Task(title="direto", status="done", priority="low"))
+    db.commit()
+    drift = reconcile_task_stats(db)
+    assert ("total", "", 1, 2) in drift
+    assert ("status", "done", 0, 1) in drift
+    assert get_task_stats(db)["total"] == 2
+    assert reconcile_task_stats(db, apply=False) == []
@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+
+from src.controllers.sync_controller import list_changes, compact_change_log, current_cursor, record_changes
+from src.controllers.task_controller import create_task, update_task, delete_task
+from src.controllers.task_bulk_controller import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from src.controllers.comment_controller import create_comment, delete_comment
+from src.controllers.user_controller import update_user, delete_user
+from src.models.change_log_model import ChangeLog
+from src.models.task_model import TaskCreate, TaskUpdate, TaskBulkUpdate
+from src.models.comment_model import CommentCreate
+from src.models.user_model import UserUpdate
+
+def _ops(page):
+    return [(c["entity"], c["entity_id"], c["op"]) for c in page["changes"]]
+
+def test_changes_follow_writes(db):
+    start = list_changes(db)["next_cursor"]
+    task = create_task(TaskCreate(title="A", assigned_to=1), db)
+    update_task(task.id, TaskUpdate(status="done"), db)
+    comment = create_comment(task.id, 1, CommentCreate(content="c"), db)
+    update_user(1, UserUpdate(name="Novo"), db)
+
+    page = list_changes(db, since=start)
+    assert _ops(page) == [
+        ("task", task.id, "upsert"),
+        ("task", task.id, "upsert"),
+        ("comment", comment.id, "upsert"),
+        ("task", task.id, "upsert"),  # comment_count/last_activity_at
+        ("user", 1, "upsert"),
+    ]
+    assert page["changes"][1]["data"]["status"] == "done"
+    assert page["changes"][2]["data"]["task_id"] == task.id
+    assert page["has_more"] is False
+    assert list_changes(db, since=page["next_cursor"])["changes"] == []
+
+def test_deletes_produce_tombstones(db):
+    task = create_task(TaskCreate(title="A"), db)
+    c1 = create_comment(task.id, 1, CommentCreate(content="c1"), db)
+    c2 = create_comment(task.id, 1, CommentCreate(content="c2"), db)
+    task_id, c1_id, c2_id = task.id, c1.id, c2.id
+    cursor = list_changes(db)["next_cursor"]
+
+    delete_comment(task_id, c1_id, db)
+    delete_task(task_id, db)
+    delete_user(1, db)
+    page = list_changes(db, since=cursor)
+    assert _ops(page) == [
+        ("comment", c1_id, "delete"),
+        ("task", task_id, "upsert"),
+        ("comment", c2_id, "delete"),
+        ("task", task_id, "delete"),
+        ("user", 1, "delete"),
+    ]
+    assert page["changes"][1]["data"]["comment_count"] == 1
+    assert all(c["data"] is None for c in page["changes"] if c["op"] == "delete")
+
+def test_bulk_writes_are_logged(db):
+    cursor = list_changes(db)["next_cursor"]
+    result = bulk_create_tasks([TaskCreate(title=f"t{i}") for i in range(3)], db)
+    ids = [r["id"] for r in result["results"]]
+    bulk_update_tasks([TaskBulkUpdate(id=ids[0], priority="low")], db)
+    bulk_delete_tasks(ids[1:], db)
+
+    page = list_changes(db, since=cursor)
+    assert _ops(page) == (
+        [("task", i, "upsert") for i in ids]
+        + [("task", ids[0], "upsert")]
+        + [("task", i, "delete") for i in ids[1:]]
+    )
+    assert page["changes"][3]["data"]["priority"] == "low"
+
+def test_changes_are_paged_by_cursor(db):
+    cursor = list_changes(db)["next_cursor"]
+    for i in range(5):
+        create_task(TaskCreate(title=f"t{i}"), db)
+
+    seen = []
+    while True:
+        page = list_changes(db, since=cursor, limit=2)
+        seen += [c["data"]["title"] for c in page["changes"]]
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            break
+    assert seen == [f"t{i}" for i in range(5)]
+
+def test_invalid_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        list_changes(db, since="abc")
+    assert exc.value.status_code == 400
+
+def test_compaction_expires_old_cursors(db):
+    old_cursor = list_changes(db)["next_cursor"]
+    create_task(TaskCreate(title="antiga"), db)
+    # envelhece as entradas existentes além da retenção
+    db.query(ChangeLog).update({ChangeLog.changed_at: datetime.now() - timedelta(days=40)})
+    db.commit()
+    create_task(TaskCreate(title="recente"), db)
+    head = current_cursor(db)
+
+    assert compact_change_log(db, retention_days=30) == 2  # seed do usuário + tarefa antiga
+    with pytest.raises(HTTPException) as exc:
+        list_changes(db, since=old_cursor)
+    assert exc.value.status_code == 410
+
+    # cursor posterior à compactação continua válido; o cursor atual não regride
+    assert current_cursor(db) == head
+    page = list_changes(db, since=str(head - 1))
+    assert [c["data"]["title"] for c in page["changes"]] == ["recente"]
+
+def test_postgres_change_log_inserts_hold_a_commit_lock():
+    # no Postgres o seq só é reservado depois do lock de transação: seq em ordem de commit
+    executed = []
+    bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+    session = SimpleNamespace(get_bind=lambda: bind, execute=lambda stmt, *args: executed.append(stmt))
+    record_changes(session, "task", [(1, None)])
+    sql = [str(stmt.compile(dialect=postgresql.dialect())) for stmt in executed]
+    assert "pg_advisory_xact_lock" in sql[0]
+    assert sql[1].startswith("INSERT INTO change_log")
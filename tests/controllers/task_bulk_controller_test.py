@@ -0,0 +1,81 @@
+import pytest
+from fastapi import HTTPException
+from datetime import date, timedelta
+
+from src.controllers import task_bulk_controller
+from src.controllers.task_bulk_controller import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from src.controllers.task_controller import get_task, create_task, update_task
+from src.controllers.stats_controller import reconcile_task_stats
+from src.controllers.comment_controller import create_comment
+from src.models.task_model import TaskCreate, TaskUpdate, TaskBulkUpdate
+from src.models.comment_model import CommentCreate
+
+def test_bulk_create_reports_errors_per_item(db):
+    result = bulk_create_tasks([
+        TaskCreate(title="A", assigned_to=1),
+        TaskCreate(title="B", priority="urgent"),
+        TaskCreate(title="C", assigned_to=9999),
+        TaskCreate(title="D", due_date=date.today() + timedelta(days=1)),
+    ], db)
+    assert result["succeeded"] == 2
+    assert result["failed"] == 2
+    ok, bad_priority, bad_user, ok2 = result["results"]
+    assert ok["ok"] and ok2["ok"]
+    assert "Prioridade inválida" in bad_priority["error"]
+    assert "Usuário responsável (ID=9999)" in bad_user["error"]
+    created = get_task(ok["id"], db)
+    assert created.title == "A"
+    assert created.status == "pending"
+    assert get_task(ok2["id"], db).title == "D"
+
+def test_bulk_update(db):
+    t1 = create_task(TaskCreate(title="U1", assigned_to=1), db)
+    t2 = create_task(TaskCreate(title="U2", assigned_to=1), db)
+    result = bulk_update_tasks([
+        TaskBulkUpdate(id=t1.id, status="done"),
+        TaskBulkUpdate(id=t2.id, title="U2 novo", priority="high"),
+        TaskBulkUpdate(id=9999, title="X"),
+        TaskBulkUpdate(id=t1.id, status="archived"),
+    ], db)
+    assert [r["ok"] for r in result["results"]] == [True, True, False, False]
+    db.expire_all()
+    assert get_task(t1.id, db).status == "done"
+    assert get_task(t2.id, db).title == "U2 novo"
+    assert get_task(t2.id, db).priority == "high"
+
+def test_bulk_delete_removes_comments(db):
+    t1 = create_task(TaskCreate(title="D1", assigned_to=1), db)
+    create_comment(t1.id, 1, CommentCreate(content="c"), db)
+    result = bulk_delete_tasks([t1.id, 9999], db)
+    assert result["succeeded"] == 1
+    assert result["results"][1]["error"] == "Tarefa (ID=9999) não encontrada."
+    with pytest.raises(HTTPException):
+        get_task(t1.id, db)
+    assert reconcile_task_stats(db, apply=False) == []
+
+def test_bulk_update_reports_tasks_changed_after_read(db, monkeypatch):
+    # outra escrita entre a leitura do lote e o UPDATE: o item dessa tarefa é rejeitado
+    # e os contadores continuam batendo com as linhas
+    t1 = create_task(TaskCreate(title="R1", assigned_to=1), db)
+    t2 = create_task(TaskCreate(title="R2", assigned_to=1), db)
+    read_existing = task_bulk_controller._existing_tasks
+
+    def racing_existing(db, ids):
+        existing = read_existing(db, ids)
+        update_task(t1.id, TaskUpdate(status="in_progress"), db)
+        return existing
+
+    monkeypatch.setattr(task_bulk_controller, "_existing_tasks", racing_existing)
+    result = bulk_update_tasks([TaskBulkUpdate(id=t1.id, status="done"), TaskBulkUpdate(id=t2.id, priority="high")], db)
+    assert [r["ok"] for r in result["results"]] == [False, True]
+    assert "alterada por outra requisição" in result["results"][0]["error"]
+    db.expire_all()
+    assert get_task(t1.id, db).status == "in_progress"
+    assert get_task(t2.id, db).priority == "high"
+    assert reconcile_task_stats(db, apply=False) == []
+
+def test_bulk_size_limit(db, monkeypatch):
+    monkeypatch.setattr(task_bulk_controller, "BULK_MAX_ITEMS", 1)
+    with pytest.raises(HTTPException) as exc:
+        bulk_delete_tasks([1, 2], db)
+    assert exc.value.status_code == 413
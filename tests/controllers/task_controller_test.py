@@ -1,5 +1,8 @@
 import pytest
+import sqlite3
+from types import SimpleNamespace
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 from datetime import date, timedelta
 
 from src.controllers.task_controller import (
@@ -10,6 +13,8 @@ from src.controllers.task_controller import (
     delete_task,
     list_tasks_filtered
 )
+from src.controllers import task_controller
+from src.controllers.stats_controller import reconcile_task_stats
 from src.models.task_model import TaskCreate, TaskUpdate
 
 @pytest.fixture(autouse=True)
@@ -140,3 +145,150 @@ def test_list_tasks_filtered_invalid_params(db):
         list_tasks_filtered(db, status_filter=None, priority="urgent")
     assert exc.value.status_code == 400
     assert "Prioridade inválida" in exc.value.detail
+
+def test_create_task_unknown_assignee(db):
+    with pytest.raises(HTTPException) as exc:
+        create_task(TaskCreate(title="Sem dono", assigned_to=9999), db)
+    assert exc.value.status_code == 404
+    assert "Usuário responsável (ID=9999) não encontrado" in exc.value.detail
+
+def test_create_task_other_integrity_errors_are_not_reported_as_missing_assignee(db, monkeypatch):
+    def broken_change_log(*args, **kwargs):
+        raise IntegrityError("INSERT INTO change_log", {}, sqlite3.IntegrityError("UNIQUE constraint failed: change_log.seq"))
+
+    monkeypatch.setattr(task_controller, "record_change", broken_change_log)
+    with pytest.raises(IntegrityError):
+        create_task(TaskCreate(title="X", assigned_to=1), db)
+
+def _postgres_error(sqlstate, constraint, via_cause):
+    # imita o erro do psycopg (diag) ou do adaptador asyncpg (__cause__)
+    orig = Exception("violates foreign key constraint")
+    orig.sqlstate = sqlstate
+    if via_cause:
+        cause = Exception()
+        cause.constraint_name = constraint
+        orig.__cause__ = cause
+    else:
+        orig.diag = SimpleNamespace(constraint_name=constraint)
+    return IntegrityError("INSERT INTO tasks", {}, orig)
+
+@pytest.mark.parametrize("via_cause", [False, True])
+def test_assignee_violation_is_recognized_on_postgres_drivers(via_cause):
+    assert task_controller._is_assignee_violation(_postgres_error("23503", "tasks_assigned_to_fkey", via_cause))
+    assert not task_controller._is_assignee_violation(_postgres_error("23505", "tasks_assigned_to_fkey", via_cause))
+    assert not task_controller._is_assignee_violation(_postgres_error("23503", "comments_task_id_fkey", via_cause))
+
+def test_delete_task_with_comments(db):
+    from src.controllers.comment_controller import create_comment
+    from src.models.comment_model import CommentCreate
+    created = create_task(TaskCreate(title="Com comentários", assigned_to=1), db)
+    create_comment(created.id, 1, CommentCreate(content="oi"), db)
+    resp = delete_task(created.id, db)
+    assert resp["message"] == "Tarefa removida com sucesso"
+
+def test_list_tasks_filtered_keyset_pages(db):
+    for i in range(5):
+        create_task(TaskCreate(title=f"P{i}", assigned_to=1, due_date=date.today() + timedelta(days=i % 3)), db)
+    create_task(TaskCreate(title="Sem data", assigned_to=1), db)
+
+    seen, cursor = [], None
+    while True:
+        page = list_tasks_filtered(db, limit=2, cursor=cursor)
+        assert len(page) <= 2
+        seen.extend(t.id for t in page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    full = list_tasks_filtered(db)
+    assert seen == [t.id for t in full]
+
+def test_list_tasks_filtered_orders_nulls_explicitly(db, count_statements):
+    # a posição dos NULLs no ORDER BY não pode depender do banco (o Postgres inverte o padrão do SQLite)
+    create_task(TaskCreate(title="Sem data", assigned_to=1), db)
+    with count_statements() as statements:
+        list_tasks_filtered(db, limit=2)
+    assert any("due_date ASC NULLS FIRST" in sql for sql in statements)
+
+def test_list_tasks_filtered_invalid_cursor(db):
+    with pytest.raises(HTTPException) as exc:
+        list_tasks_filtered(db, limit=2, cursor="não-é-cursor")
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Cursor inválido"
+
+def test_versions_increase_with_writes(db):
+    t1 = create_task(TaskCreate(title="V1"), db)
+    t2 = create_task(TaskCreate(title="V2"), db)
+    assert t2.version > t1.version
+    before = t1.version
+    updated = update_task(t1.id, TaskUpdate(title="V1b"), db)
+    assert updated.version > t2.version > before
+
+def test_versions_do_not_go_back_after_deleting_newest(db):
+    create_task(TaskCreate(title="V1"), db)
+    newest = create_task(TaskCreate(title="V2"), db)
+    delete_task(newest.id, db)
+    # com MAX(version) + 1 a próxima escrita repetiria a versão da tarefa removida
+    assert create_task(TaskCreate(title="V3"), db).version > newest.version
+
+def test_filtered_etag_changes_on_write(db):
+    from src.controllers.task_controller import tasks_filtered_etag
+    t1 = create_task(TaskCreate(title="E1", status="pending"), db)
+    create_task(TaskCreate(title="E2", status="pending"), db)
+    etag = tasks_filtered_etag(db, status_filter="pending", limit=10)
+    assert etag.startswith('W/"2-')
+    assert tasks_filtered_etag(db, status_filter="pending", limit=10) == etag
+    assert tasks_filtered_etag(db, status_filter="pending", limit=5) != etag
+    update_task(t1.id, TaskUpdate(title="E1b"), db)
+    assert tasks_filtered_etag(db, status_filter="pending", limit=10) != etag
+
+def test_list_tasks_filtered_sort_by_activity(db):
+    from src.controllers.comment_controller import create_comment
+    from src.models.comment_model import CommentCreate
+    quiet, busy, recent = (create_task(TaskCreate(title=t, assigned_to=1), db) for t in ("quiet", "busy", "recent"))
+    for _ in range(3):
+        create_comment(busy.id, 1, CommentCreate(content="c"), db)
+    create_comment(recent.id, 1, CommentCreate(content="c"), db)
+
+    by_activity = list_tasks_filtered(db, sort="activity")
+    assert [t.id for t in by_activity] == [recent.id, busy.id, quiet.id]
+    by_comments = list_tasks_filtered(db, sort="comments")
+    assert [t.comment_count for t in by_comments] == [3, 1, 0]
+    page = list_tasks_filtered(db, limit=2, sort="activity")
+    rest = list_tasks_filtered(db, limit=2, cursor=page.next_cursor, sort="activity")
+    assert [t.id for t in page + rest] == [recent.id, busy.id, quiet.id]
+
+    with pytest.raises(HTTPException) as exc:
+        list_tasks_filtered(db, sort="title")
+    assert exc.value.status_code == 400
+
+def test_update_rereads_task_changed_after_read(db, monkeypatch):
+    # outra escrita entre a leitura do estado anterior e o UPDATE: os contadores
+    # precisam partir do estado que o UPDATE de fato substituiu
+    created = create_task(TaskCreate(title="Corrida", assigned_to=1), db)
+    read_current = task_controller._current_task
+    raced = []
+
+    def racing_current(db, task_id, payload):
+        current = read_current(db, task_id, payload)
+        if not raced:
+            raced.append(task_id)
+            update_task(task_id, TaskUpdate(status="in_progress"), db)
+        return current
+
+    monkeypatch.setattr(task_controller, "_current_task", racing_current)
+    updated = update_task(created.id, TaskUpdate(status="done"), db)
+    assert updated.status == "done"
+    assert reconcile_task_stats(db, apply=False) == []
+
+def test_update_gives_up_when_task_keeps_changing(db, monkeypatch):
+    created = create_task(TaskCreate(title="Disputada", assigned_to=1), db)
+    read_current = task_controller._current_task
+
+    def always_stale(db, task_id, payload):
+        current = read_current(db, task_id, payload)
+        return SimpleNamespace(**{**current._asdict(), "version": current.version - 1})
+
+    monkeypatch.setattr(task_controller, "_current_task", always_stale)
+    with pytest.raises(HTTPException) as exc:
+        update_task(created.id, TaskUpdate(status="done"), db)
+    assert exc.value.status_code == 409
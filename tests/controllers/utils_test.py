@@ -0,0 +1,29 @@
+import asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from src.database import Base, create_async_db_engine, to_async_url
+from src.controllers.utils import run_db
+from src.controllers.task_controller import create_task, get_task
+from src.models.task_model import TaskCreate
+
+def test_to_async_url_picks_async_driver():
+    assert to_async_url("sqlite:///./sql_app.db") == "sqlite+aiosqlite:///./sql_app.db"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+def test_run_db_with_async_session(tmp_path):
+    async def scenario():
+        engine = create_async_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+        async with Session() as db:
+            created = await run_db(db, create_task, TaskCreate(title="Async"))
+            fetched = await run_db(db, get_task, created.id)
+        await engine.dispose()
+        return fetched
+
+    fetched = asyncio.run(scenario())
+    assert fetched.title == "Async"
+
+def test_run_db_with_sync_session(db):
+    created = asyncio.run(run_db(db, create_task, TaskCreate(title="Sync", assigned_to=1)))
+    assert created.id is not None
@@ -0,0 +1,140 @@
+from sqlalchemy import text
+from src.database import engine, create_db_engine, pool_stats, run_migrations
+
+def test_sqlite_pragmas_applied_on_connect():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+
+def test_memory_engine_skips_pool_sizing():
+    mem = create_db_engine("sqlite://", sqlite_pragmas={"foreign_keys": "ON"})
+    with mem.connect() as conn:
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    assert pool_stats(mem)["pool_class"]
+
+def test_db_pool_route(client, auth_token):
+    r = client.get("/admin/db-pool", headers={"Authorization": f"Bearer {auth_token}"})
+    assert r.status_code == 200
+    assert r.json()["pool_class"] == "QueuePool"
+
+def test_migrations_create_filter_indexes(tmp_path):
+    from sqlalchemy import inspect
+    from src.database import run_migrations
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    run_migrations(url)
+    inspector = inspect(create_db_engine(url))
+    task_indexes = {ix["name"] for ix in inspector.get_indexes("tasks")}
+    assert {"ix_tasks_due_date", "ix_tasks_assigned_to_due_date", "ix_tasks_status_due_date"} <= task_indexes
+    comment_indexes = {ix["name"] for ix in inspector.get_indexes("comments")}
+    assert "ix_comments_task_id_created_at_id" in comment_indexes
+
+def test_migration_backfills_task_counters(tmp_path):
+    url = f"sqlite:///{tmp_path / 'counters.db'}"
+    run_migrations(url, "0002")
+    db_engine = create_db_engine(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO tasks (title, status, priority) VALUES ('a', 'done', 'low'), ('b', 'done', 'high')"))
+    run_migrations(url)
+    with db_engine.connect() as conn:
+        rows = dict(conn.execute(text(
+            "SELECT dimension || ':' || value, count FROM task_counters"
+        )).all())
+    db_engine.dispose()
+    assert rows["total:"] == 2
+    assert rows["status:done"] == 2
+    assert rows["assigned_to:none"] == 2
+
+def test_migration_backfills_comment_ordering(tmp_path):
+    url = f"sqlite:///{tmp_path / 'comments.db'}"
+    run_migrations(url, "0007")
+    db_engine = create_db_engine(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (name, email, hashed_password) VALUES ('u', 'u@example.com', 'x')"))
+        conn.execute(text("INSERT INTO tasks (title, status, priority) VALUES ('t', 'pending', 'low')"))
+        # carimbos fixados no início de cada processo: o segundo processo começou antes
+        conn.execute(text(
+            "INSERT INTO comments (content, task_id, user_id, created_at) VALUES "
+            "('a', 1, 1, '2026-01-02 10:00:00'), ('b', 1, 1, '2026-01-01 09:00:00'), "
+            "('c', 1, 1, '2026-01-01 09:00:00'), ('d', 1, 1, '2026-01-03 08:00:00')"
+        ))
+    run_migrations(url)
+    with db_engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, created_at FROM comments ORDER BY created_at, id")).all()
+    db_engine.dispose()
+    assert [row.id for row in rows] == [1, 2, 3, 4]
+    assert rows[-1].created_at == "2026-01-03 08:00:00"
+
+def test_migration_backfills_comment_activity(tmp_path):
+    url = f"sqlite:///{tmp_path / 'activity.db'}"
+    run_migrations(url, "0008")
+    db_engine = create_db_engine(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (name, email, hashed_password) VALUES ('u', 'u@example.com', 'x')"))
+        conn.execute(text("INSERT INTO tasks (title, status, priority) VALUES ('a', 'pending', 'low'), ('b', 'pending', 'low')"))
+        conn.execute(text(
+            "INSERT INTO comments (content, task_id, user_id, created_at) VALUES "
+            "('x', 1, 1, '2026-01-01 09:00:00'), ('y', 1, 1, '2026-01-02 09:00:00')"
+        ))
+    run_migrations(url)
+    with db_engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, comment_count, last_activity_at FROM tasks ORDER BY id")).all()
+    db_engine.dispose()
+    assert [tuple(row) for row in rows] == [(1, 2, "2026-01-02 09:00:00"), (2, 0, None)]
+
+def test_migration_seeds_autoincrement_from_archive(tmp_path):
+    url = f"sqlite:///{tmp_path / 'ids.db'}"
+    run_migrations(url, "0009")
+    db_engine = create_db_engine(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (name, email, hashed_password) VALUES ('u', 'u@example.com', 'x')"))
+        conn.execute(text("INSERT INTO tasks (title, status, priority) VALUES ('a', 'pending', 'low')"))
+        conn.execute(text("INSERT INTO comments (content, task_id, user_id) VALUES ('c', 1, 1)"))
+        conn.execute(text("INSERT INTO tasks_archive (id, title, version, archived_at) VALUES (5, 'velha', 1, '2026-01-01')"))
+    run_migrations(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO tasks (title, status, priority) VALUES ('b', 'pending', 'low')"))
+        ids = conn.execute(text("SELECT id FROM tasks ORDER BY id")).scalars().all()
+        comments = conn.execute(text("SELECT task_id FROM comments")).scalars().all()
+        found = conn.execute(text("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'b'")).scalars().all()
+    db_engine.dispose()
+    # o id 5 já está no arquivo: a próxima tarefa recebe 6; comentários e busca sobrevivem à recriação
+    assert ids == [1, 6]
+    assert comments == [1]
+    assert found == [6]
+
+def test_migration_seeds_version_counters(tmp_path):
+    url = f"sqlite:///{tmp_path / 'versions.db'}"
+    run_migrations(url, "0010")
+    db_engine = create_db_engine(url)
+    with db_engine.begin() as conn:
+        conn.execute(text("INSERT INTO tasks (title, status, priority, version) VALUES ('a', 'pending', 'low', 3)"))
+        conn.execute(text("INSERT INTO tasks_archive (id, title, version, archived_at) VALUES (9, 'velha', 7, '2026-01-01')"))
+    run_migrations(url)
+    with db_engine.connect() as conn:
+        counters = dict(conn.execute(text("SELECT name, value FROM version_counters")).all())
+    db_engine.dispose()
+    assert counters == {"tasks": 7, "comments": 0}
+
+def test_migration_keeps_orphan_rows_from_before_fk_enforcement(tmp_path):
+    # bancos antigos não validavam assigned_to: a recriação de 0010 não pode abortar nos órfãos
+    url = f"sqlite:///{tmp_path / 'orphans.db'}"
+    run_migrations(url, "0009")
+    db_engine = create_db_engine(url)
+    with db_engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        conn.execute(text("INSERT INTO tasks (title, status, priority, assigned_to) VALUES ('a', 'pending', 'low', 99)"))
+        conn.execute(text("INSERT INTO comments (content, task_id, user_id) VALUES ('c', 42, 7)"))
+        conn.commit()
+    db_engine.dispose()
+    run_migrations(url)
+    db_engine = create_db_engine(url)
+    with db_engine.connect() as conn:
+        revision = conn.execute(text("SELECT version_num FROM alembic_version")).scalar_one()
+        assignees = conn.execute(text("SELECT assigned_to FROM tasks")).scalars().all()
+        comments = conn.execute(text("SELECT task_id FROM comments")).scalars().all()
+    db_engine.dispose()
+    assert revision == "0011"
+    assert assignees == [99]
+    assert comments == [42]
@@ -0,0 +1,94 @@
+import time
+import queue
+import logging
+
+from src.main import LOGGING_CONFIG
+from src.logging_pipeline import (
+    PipelineStats, DebugSampler, DroppingQueueHandler, BlockingStopListener,
+    setup_logging, stop_logging, logging_stats,
+)
+
+class SlowHandler(logging.Handler):
+    # simula um disco lento
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        time.sleep(0.05)
+        self.messages.append(record.getMessage())
+
+def _logger(name, handler):
+    log = logging.getLogger(name)
+    log.propagate = False
+    log.setLevel(logging.DEBUG)
+    log.handlers = [handler]
+    return log
+
+def test_slow_handler_does_not_block_the_caller():
+    stats = PipelineStats()
+    log_queue = queue.Queue(maxsize=100)
+    slow = SlowHandler()
+    listener = BlockingStopListener(log_queue, slow, respect_handler_level=True)
+    listener.start()
+    log = _logger("tests.pipeline.slow", DroppingQueueHandler(log_queue, stats))
+
+    started = time.perf_counter()
+    for i in range(10):
+        log.info("registro %d", i)
+    assert time.perf_counter() - started < 0.05 * 10 / 2
+    listener.stop()  # esvazia a fila antes de parar
+    assert slow.messages == [f"registro {i}" for i in range(10)]
+    assert stats.snapshot()["enqueued"] == 10
+
+def test_full_queue_drops_and_counts():
+    stats = PipelineStats()
+    log = _logger("tests.pipeline.full", DroppingQueueHandler(queue.Queue(maxsize=2), stats))
+    for i in range(5):
+        log.warning("registro %d", i)
+    assert stats.snapshot() == {"enqueued": 2, "dropped": {"WARNING": 3}, "sampled_out": 0}
+
+def test_debug_sampling_skips_formatting():
+    class Expensive:
+        formatted = 0
+        def __str__(self):
+            Expensive.formatted += 1
+            return "caro"
+
+    stats = PipelineStats()
+    log_queue = queue.Queue()
+    handler = DroppingQueueHandler(log_queue, stats)
+    handler.addFilter(DebugSampler(rate=0, stats=stats))
+    log = _logger("tests.pipeline.sampled", handler)
+    for _ in range(3):
+        log.debug("payload %s", Expensive())
+    log.info("sempre mantido %s", Expensive())
+    assert Expensive.formatted == 1
+    assert log_queue.qsize() == 1
+    assert stats.snapshot()["sampled_out"] == 3
+
+def test_setup_logging_moves_root_handlers_to_listener(tmp_path):
+    config = {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "handlers": {"file": {"class": "logging.FileHandler", "filename": str(tmp_path / "app.log"), "level": "INFO"}},
+        "root": {"level": "DEBUG", "handlers": ["file"]},
+    }
+    try:
+        setup_logging(config, queue_size=10)
+        root = logging.getLogger()
+        assert [type(h) for h in root.handlers] == [DroppingQueueHandler]
+        logging.getLogger("tests.pipeline.setup").info("via fila")
+        logging.getLogger("tests.pipeline.setup").debug("abaixo do nível do arquivo")
+        stop_logging()
+        assert (tmp_path / "app.log").read_text() == "via fila\n"
+        assert not logging_stats()["queued"]
+    finally:
+        setup_logging(LOGGING_CONFIG)
+    assert logging_stats()["queued"]
+
+def test_admin_logging_route(client, auth_token):
+    r = client.get("/admin/logging", headers={"Authorization": f"Bearer {auth_token}"})
+    assert r.status_code == 200
+    assert r.json()["queued"] is True
+    assert r.json()["enqueued"] > 0
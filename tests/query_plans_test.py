@@ -0,0 +1,33 @@
+from src.query_plans import check_query_plans, is_full_scan, derived_tables, has_limit
+
+def test_full_scan_pattern():
+    assert is_full_scan("SCAN tasks")
+    assert not is_full_scan("SEARCH tasks USING INDEX ix_tasks_status_due_date (status=?)")
+    assert not is_full_scan("SCAN tasks_fts VIRTUAL TABLE INDEX 0:M2")
+    assert not is_full_scan("SCAN 2 CONSTANT ROWS")
+
+def test_index_walk_is_only_accepted_with_limit():
+    # percorrer o índice na ordem pedida só é barato quando a leitura para na página
+    assert is_full_scan("SCAN tasks USING INDEX ix_tasks_due_date")
+    assert is_full_scan("SCAN tasks USING COVERING INDEX ix_tasks_version")
+    assert not is_full_scan("SCAN tasks USING INDEX ix_tasks_due_date", limited=True)
+    assert has_limit("SELECT id FROM tasks ORDER BY due_date\n LIMIT ? OFFSET ?")
+    assert not has_limit("SELECT count(*) FROM tasks")
+
+def test_subquery_scans_are_not_table_scans():
+    plan = ["CO-ROUTINE anon_1", "SEARCH comments USING INDEX ix_comments_task_id_created_at_id (task_id=?)", "SCAN anon_1"]
+    derived = derived_tables(plan)
+    assert derived == {"anon_1"}
+    assert not is_full_scan("SCAN anon_1", derived)
+    assert is_full_scan("SCAN comments", derived)
+
+def test_controller_queries_do_not_scan():
+    violations, _ = check_query_plans()
+    assert violations == []
+
+def test_comment_page_is_read_in_index_order():
+    from src.query_plans import collect_plans, TEMP_SORT
+    plans = [plan for name, _, plan in collect_plans() if name.startswith("list_comments(")]
+    assert plans
+    for plan in plans:
+        assert not any(TEMP_SORT in detail for detail in plan)
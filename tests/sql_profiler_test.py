@@ -0,0 +1,70 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from starlette.responses import PlainTextResponse
+
+from src.database import SessionLocal
+from src.sql_profiler import SQLProfiler, SQLProfilingMiddleware, normalize_sql, sql_profiler
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    assert normalize_sql("SELECT *\n  FROM tasks WHERE id IN (?, ?, ?) AND title = 'a''b' LIMIT 10") == (
+        "SELECT * FROM tasks WHERE id IN (?...) AND title = ? LIMIT ?"
+    )
+    assert normalize_sql("SELECT * FROM tasks_archive WHERE id IN (?, ?)") == normalize_sql(
+        "SELECT * FROM tasks_archive WHERE id IN (?, ?, ?, ?)"
+    )
+
+def test_server_timing_counts_request_statements(client, auth_token, count_statements):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    task_id = client.post("/tasks/", json={"title": "Medida"}, headers=headers).json()["id"]
+    sql_profiler.clear()
+
+    with count_statements() as statements:
+        r = client.get(f"/tasks/{task_id}", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+    assert r.headers["Server-Timing"].endswith(f'desc="{len(statements)} queries"')
+
+    routes = {entry["route"]: entry for entry in client.get("/admin/sql", headers=headers).json()["routes"]}
+    assert routes["GET /tasks/{task_id}"]["requests"] == 1
+    assert routes["GET /tasks/{task_id}"]["statements"] == len(statements)
+    assert routes["GET /tasks/{task_id}"]["n_plus_one"] == 0
+
+def test_route_name_keeps_parameter_names_with_equal_values(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    task_id = client.post("/tasks/", json={"title": "Mesmo id"}, headers=headers).json()["id"]
+    comment_id = client.post(f"/tasks/{task_id}/comments", json={"content": "c"}, headers=headers).json()["id"]
+    assert task_id == comment_id == 1
+    sql_profiler.clear()
+
+    assert client.delete(f"/tasks/{task_id}/comments/{comment_id}", headers=headers).status_code == 204
+    assert client.get("/tasks/", headers=headers).status_code == 200
+    routes = {entry["route"] for entry in client.get("/admin/sql", headers=headers).json()["routes"]}
+    assert {"DELETE /tasks/{task_id}/comments/{comment_id}", "GET /tasks/"} <= routes
+
+def test_repeated_selects_are_flagged_as_n_plus_one(caplog):
+    async def app(scope, receive, send):
+        with SessionLocal() as db:
+            for task_id in range(6):
+                db.execute(text("SELECT title FROM tasks WHERE id = :id"), {"id": task_id})
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    profiler = SQLProfiler(n_plus_one_threshold=5)
+    client = TestClient(SQLProfilingMiddleware(app, profiler))
+    with caplog.at_level(logging.WARNING, logger="src.sql_profiler"):
+        r = client.get("/")
+    assert r.headers["Server-Timing"].endswith('desc="6 queries"')
+    route = profiler.stats()["routes"][0]
+    assert route["route"] == "GET <sem rota>"
+    assert route["n_plus_one"] == 1
+    assert route["last_n_plus_one"] == "SELECT title FROM tasks WHERE id = ?"
+    assert "Possível N+1" in caplog.text
+
+def test_slow_queries_are_logged(caplog):
+    profiler = SQLProfiler(slow_ms=50)
+    with caplog.at_level(logging.WARNING, logger="src.sql_profiler"):
+        profiler.record("SELECT * FROM tasks WHERE title = 'x'", 0.01)
+        profiler.record("SELECT * FROM tasks WHERE title = 'x'", 0.2)
+    assert [q["sql"] for q in profiler.stats()["recent_slow_queries"]] == ["SELECT * FROM tasks WHERE title = ?"]
+    assert caplog.text.count("Consulta lenta") == 1
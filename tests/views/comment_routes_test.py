@@ -49,3 +49,64 @@ def test_delete_comment_route(client, auth_token, task):
     )
     assert r2.status_code == 204  # conforme comment_routes.delete :contentReference[oaicite:6]{index=6}
     assert r2.content == b""
+
+def test_get_comments_route_paginated(client, auth_token, task):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for i in range(3):
+        client.post(f"/tasks/{task['id']}/comments", json={"content": f"c{i}"}, headers=headers)
+
+    r1 = client.get(f"/tasks/{task['id']}/comments?limit=2", headers=headers)
+    assert len(r1.json()) == 2
+    r2 = client.get(
+        f"/tasks/{task['id']}/comments?limit=2&cursor={r1.headers['X-Next-Cursor']}",
+        headers=headers
+    )
+    assert len(r2.json()) == 1
+    ids = [c["id"] for c in r1.json() + r2.json()]
+    assert ids == sorted(ids, reverse=True)
+
+def test_get_comments_etag(client, auth_token, task):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    url = f"/tasks/{task['id']}/comments"
+    client.post(url, json={"content": "c1"}, headers=headers)
+    etag = client.get(url, headers=headers).headers["ETag"]
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+    client.post(url, json={"content": "c2"}, headers=headers)
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 200
+
+def test_get_comments_route_before(client, auth_token, task):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    url = f"/tasks/{task['id']}/comments"
+    ids = [client.post(url, json={"content": f"c{i}"}, headers=headers).json()["id"] for i in range(3)]
+    r = client.get(f"{url}?limit=5&before={ids[2]}", headers=headers)
+    assert r.status_code == 200
+    assert [c["id"] for c in r.json()] == [ids[1], ids[0]]
+    assert client.get(f"{url}?before=999999", headers=headers).status_code == 400
+
+def test_get_comments_fast_json(client, auth_token, task, monkeypatch):
+    from src.views import comment_routes
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    url = f"/tasks/{task['id']}/comments"
+    for i in range(3):
+        client.post(url, json={"content": f"c{i}"}, headers=headers)
+    default = client.get(f"{url}?limit=2", headers=headers)
+    monkeypatch.setattr(comment_routes, "FAST_JSON", True)
+    fast = client.get(f"{url}?limit=2", headers=headers)
+    assert fast.content == default.content
+    assert fast.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
+
+def test_comments_msgpack_negotiation(client, auth_token, task):
+    import pytest
+    msgpack = pytest.importorskip("msgpack")
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    url = f"/tasks/{task['id']}/comments"
+    r = client.post(url, content=msgpack.packb({"content": "binário"}),
+                    headers={**headers, "Content-Type": "application/msgpack", "Accept": "application/msgpack"})
+    assert r.status_code == 201
+    assert msgpack.unpackb(r.content)["content"] == "binário"
+    client.post(url, json={"content": "json"}, headers=headers)
+
+    r = client.get(f"{url}?limit=1", headers={**headers, "Accept": "application/msgpack"})
+    as_json = client.get(f"{url}?limit=1", headers=headers)
+    assert msgpack.unpackb(r.content) == as_json.json()
+    assert r.headers["X-Next-Cursor"] == as_json.headers["X-Next-Cursor"]
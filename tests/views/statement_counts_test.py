@@ -0,0 +1,97 @@
+import pytest
+
+# Escritas com INSERT/UPDATE/DELETE ... RETURNING: número de comandos SQL por endpoint
+# (entre parênteses, quantos eram com SELECT prévio + refresh). Cada tarefa/comentário
+# gravado reserva a versão no contador da tabela (upsert RETURNING em version_counters)
+
+@pytest.fixture
+def headers(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    # aquece o cache de principais: as contagens medem só o endpoint
+    client.get("/tasks/stats", headers=headers)
+    return headers
+
+@pytest.fixture
+def measure(count_statements):
+    def _measure(call):
+        with count_statements() as statements:
+            response = call()
+        return response, [" ".join(s.split()).upper() for s in statements]
+    return _measure
+
+def _selects(statements):
+    return [s for s in statements if s.startswith("SELECT")]
+
+def _task(client, headers, **fields):
+    return client.post("/tasks/", json={"title": "t", "assigned_to": 1, **fields}, headers=headers).json()
+
+def test_create_task_statements(client, headers, measure):
+    r, statements = measure(lambda: client.post("/tasks/", json={"title": "a", "assigned_to": 1}, headers=headers))
+    assert r.status_code == 201
+    assert len(statements) == 4  # versão + INSERT RETURNING + contadores + log de sync (4)
+    assert _selects(statements) == []
+
+def test_update_task_statements(client, headers, measure):
+    task = _task(client, headers)
+    r, statements = measure(lambda: client.put(f"/tasks/{task['id']}", json={"title": "b"}, headers=headers))
+    assert r.json()["title"] == "b"
+    assert len(statements) == 3  # versão + UPDATE RETURNING + log de sync (4)
+    assert _selects(statements) == []
+
+    r, statements = measure(
+        lambda: client.put(f"/tasks/{task['id']}", json={"status": "done", "assigned_to": 1}, headers=headers)
+    )
+    assert r.json()["status"] == "done"
+    # estado anterior + usuário ativo numa consulta, versão, UPDATE RETURNING, contadores, log (6)
+    assert len(statements) == 5
+    assert len(_selects(statements)) == 1
+
+def test_update_missing_task_statements(client, headers, measure):
+    r, statements = measure(lambda: client.put("/tasks/9999", json={"title": "b"}, headers=headers))
+    assert r.status_code == 404
+    assert len(statements) == 2  # versão (desfeita no rollback) + UPDATE sem linhas
+
+def test_delete_task_statements(client, headers, measure):
+    task = _task(client, headers)
+    r, statements = measure(lambda: client.delete(f"/tasks/{task['id']}", headers=headers))
+    assert r.status_code == 204
+    # DELETE RETURNING (comentários e tarefa) + log + contadores (6)
+    assert len(statements) == 4
+    assert _selects(statements) == []
+
+def test_comment_statements(client, headers, measure):
+    task = _task(client, headers)
+    url = f"/tasks/{task['id']}/comments"
+    r, statements = measure(lambda: client.post(url, json={"content": "c"}, headers=headers))
+    assert r.status_code == 201
+    # 2 versões + UPDATE da tarefa RETURNING (existência + contagem) + INSERT RETURNING + 2 entradas de log (9)
+    assert len(statements) == 6
+    assert _selects(statements) == []
+
+    r, statements = measure(lambda: client.delete(f"{url}/{r.json()['id']}", headers=headers))
+    assert r.status_code == 204
+    assert len(statements) == 5  # DELETE RETURNING + versão + UPDATE RETURNING + 2 entradas de log (8)
+    assert _selects(statements) == []
+
+    r, statements = measure(lambda: client.post("/tasks/9999/comments", json={"content": "c"}, headers=headers))
+    assert r.status_code == 404
+    assert len(statements) == 2
+
+def test_user_statements(client, headers, measure):
+    payload = {"name": "n", "email": "n@example.com", "password": "1234"}
+    r, statements = measure(lambda: client.post("/users/", json=payload, headers=headers))
+    assert r.status_code == 201
+    assert len(statements) == 2  # INSERT RETURNING + log (5)
+    user_id = r.json()["id"]
+
+    r, statements = measure(lambda: client.put(f"/users/{user_id}", json={"name": "m"}, headers=headers))
+    assert r.json()["name"] == "m"
+    assert len(statements) == 2  # UPDATE RETURNING + log (4)
+
+    r, statements = measure(lambda: client.delete(f"/users/{user_id}", headers=headers))
+    assert r.status_code == 204
+    assert len(statements) == 2  # UPDATE RETURNING + log (3)
+    assert _selects(statements) == []
+
+    r, _ = measure(lambda: client.post("/users/", json=payload, headers=headers))
+    assert r.status_code == 400
@@ -0,0 +1,13 @@
+def test_sync_changes_route(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    cursor = client.get("/sync/changes", headers=headers).json()["next_cursor"]
+    task = client.post("/tasks/", json={"title": "Sync"}, headers=headers).json()
+
+    r = client.get(f"/sync/changes?since={cursor}", headers=headers)
+    assert r.status_code == 200
+    body = r.json()
+    assert [(c["entity"], c["entity_id"], c["op"]) for c in body["changes"]] == [("task", task["id"], "upsert")]
+    assert body["has_more"] is False
+
+def test_sync_changes_requires_auth(client):
+    assert client.get("/sync/changes").status_code == 401
@@ -1,4 +1,12 @@
-from datetime import date, timedelta
+import asyncio
+import pytest
+from datetime import date, datetime, timedelta
+
+from src.main import app
+from src.database import engine
+from src.auth.principal_cache import principal_cache
+from src.controllers.pagination import encode_cursor, cursor_key
+from src.models.task_model import Task
 
 def test_create_task_route(client, auth_token):
     r = client.post(
@@ -70,3 +78,356 @@ def test_list_tasks_filtered_route(client, auth_token):
     )
     assert r.status_code == 200
     assert any(t["title"] == "Filtro Tarefa" for t in r.json())
+
+def test_list_tasks_by_user_route_paginated(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"Pag {i}", "assigned_to": 1}, headers=headers)
+
+    r1 = client.get("/tasks/user/1?limit=2", headers=headers)
+    assert r1.status_code == 200
+    assert len(r1.json()) == 2
+    cursor = r1.headers["X-Next-Cursor"]
+
+    r2 = client.get(f"/tasks/user/1?limit=2&cursor={cursor}", headers=headers)
+    assert r2.status_code == 200
+    assert len(r2.json()) == 1
+    assert "X-Next-Cursor" not in r2.headers
+    ids = [t["id"] for t in r1.json() + r2.json()]
+    assert len(set(ids)) == 3
+
+def test_cursor_with_wrong_types_or_ordering_is_rejected(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    task = client.post("/tasks/", json={"title": "Cursor", "assigned_to": 1}, headers=headers).json()
+    due_date = encode_cursor(cursor_key(Task.due_date), date.today(), 1)
+    assert client.get(f"/tasks/?limit=2&cursor={due_date}", headers=headers).status_code == 200
+
+    rejected = [
+        f"/tasks/?limit=2&cursor={encode_cursor(cursor_key(Task.due_date), {'x': 1}, 1)}",
+        f"/tasks/?limit=2&cursor={encode_cursor(cursor_key(Task.due_date), datetime.now(), 1)}",
+        f"/tasks/?limit=2&cursor={encode_cursor(cursor_key(Task.due_date), date.today(), '1')}",
+        f"/tasks/?limit=2&sort=activity&cursor={due_date}",
+        f"/tasks/{task['id']}/comments?limit=2&cursor={due_date}",
+    ]
+    for url in rejected:
+        r = client.get(url, headers=headers)
+        assert r.status_code == 400, url
+        assert r.json()["detail"] == "Cursor inválido"
+
+def test_export_tasks_ndjson_route(client, auth_token):
+    import json
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "Exp A", "assigned_to": 1, "status": "done"}, headers=headers)
+    client.post("/tasks/", json={"title": "Exp B", "assigned_to": 1}, headers=headers)
+
+    r = client.get("/tasks/export?status=done", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Exp A"]
+
+def test_export_tasks_csv_route(client, auth_token):
+    import csv, io
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post(
+        "/tasks/",
+        json={"title": "Exp, CSV", "assigned_to": 1, "due_date": str(date.today() + timedelta(days=2))},
+        headers=headers
+    )
+    r = client.get("/tasks/export?format=csv", headers=headers)
+    assert r.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert rows[0]["title"] == "Exp, CSV"
+    assert rows[0]["due_date"] == str(date.today() + timedelta(days=2))
+
+def test_export_tasks_invalid_filter_route(client, auth_token):
+    r = client.get("/tasks/export?priority=urgent", headers={"Authorization": f"Bearer {auth_token}"})
+    assert r.status_code == 400
+
+def test_bulk_routes(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    r = client.post("/tasks/bulk", json=[{"title": "L1", "assigned_to": 1}, {"title": "L2"}], headers=headers)
+    assert r.status_code == 200
+    ids = [item["id"] for item in r.json()["results"]]
+    assert r.json()["succeeded"] == 2
+
+    r = client.patch("/tasks/bulk", json=[{"id": ids[0], "status": "done"}], headers=headers)
+    assert r.status_code == 200
+    assert client.get(f"/tasks/{ids[0]}", headers=headers).json()["status"] == "done"
+
+    r = client.request("DELETE", "/tasks/bulk", json={"ids": ids}, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["succeeded"] == 2
+    assert client.get(f"/tasks/{ids[1]}", headers=headers).status_code == 404
+
+def test_stats_route(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "S1", "assigned_to": 1, "status": "done"}, headers=headers)
+    r = client.get("/tasks/stats", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["total"] == 1
+    assert r.json()["by_status"] == {"done": 1}
+    assert r.json()["by_assignee"] == [{"assigned_to": 1, "count": 1}]
+
+def test_search_route(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "Corrigir busca textual"}, headers=headers)
+    client.post("/tasks/", json={"title": "Outra tarefa"}, headers=headers)
+    r = client.get("/tasks/search", params={"q": "busca", "limit": 1}, headers=headers)
+    assert r.status_code == 200
+    assert [t["title"] for t in r.json()] == ["Corrigir busca textual"]
+    assert "X-Next-Cursor" not in r.headers
+    assert client.get("/tasks/search", params={"q": "!!"}, headers=headers).status_code == 400
+
+def test_get_task_etag_and_304(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    task_id = client.post("/tasks/", json={"title": "ETag"}, headers=headers).json()["id"]
+    r = client.get(f"/tasks/{task_id}", headers=headers)
+    etag = r.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    r = client.get(f"/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+
+    client.put(f"/tasks/{task_id}", json={"status": "done"}, headers=headers)
+    r = client.get(f"/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+def test_list_weak_etag_and_304(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "L1", "assigned_to": 1}, headers=headers)
+    for url in ("/tasks/?status=pending", "/tasks/user/1"):
+        r = client.get(url, headers=headers)
+        etag = r.headers["ETag"]
+        assert etag.startswith("W/")
+        assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    etag = client.get("/tasks/user/1", headers=headers).headers["ETag"]
+    client.post("/tasks/", json={"title": "L2", "assigned_to": 1}, headers=headers)
+    r = client.get("/tasks/user/1", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert len(r.json()) == 2
+
+def test_list_etag_not_reused_after_deleting_newest(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "L1"}, headers=headers)
+    newest = client.post("/tasks/", json={"title": "L2"}, headers=headers).json()["id"]
+    etag = client.get("/tasks/", headers=headers).headers["ETag"]
+    client.delete(f"/tasks/{newest}", headers=headers)
+    client.post("/tasks/", json={"title": "L3"}, headers=headers)
+    # mesma quantidade de tarefas, conteúdo diferente: não pode responder 304
+    r = client.get("/tasks/", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert [t["title"] for t in r.json()] == ["L1", "L3"]
+
+def test_list_cache_admin_route(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.get("/tasks/?status=pending", headers=headers)
+    client.get("/tasks/?status=pending", headers=headers)
+    r = client.get("/admin/list-cache", headers=headers)
+    assert r.status_code == 200
+    # a segunda requisição tira da mesma entrada o ETag e a página
+    assert r.json()["hits"] == 2
+    assert r.json()["saved_queries"] == 2
+
+@pytest.mark.parametrize("url", ["/tasks/?status=pending", "/tasks/user/1"])
+def test_cached_list_serves_etag_and_page_without_sql(client, auth_token, count_statements, url):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post("/tasks/", json={"title": "Quente", "assigned_to": 1}, headers=headers)
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    with count_statements() as statements:
+        not_modified = client.get(url, headers={**headers, "If-None-Match": etag})
+        full = client.get(url, headers=headers)
+    assert not_modified.status_code == 304
+    assert full.headers["ETag"] == etag
+    # só sobra a checagem do usuário ativo de /tasks/user/{id}; nada lê a tabela tasks
+    assert not [sql for sql in statements if "tasks" in sql]
+
+    client.post("/tasks/", json={"title": "Nova", "assigned_to": 1}, headers=headers)
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert len(changed.json()) == 2
+
+def test_events_route_requires_auth_and_stats(client, auth_token):
+    # o stream em si é coberto em tests/controllers/event_broker_test.py
+    assert client.get("/tasks/events").status_code in (401, 403)
+    r = client.get("/admin/events", headers={"Authorization": f"Bearer {auth_token}"})
+    assert r.status_code == 200
+    assert r.json()["subscribers"] == 0
+
+def test_due_soon_and_overdue_routes(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    today = client.post("/tasks/", json={"title": "Hoje", "due_date": str(date.today())}, headers=headers).json()
+    client.post("/tasks/", json={"title": "Depois", "due_date": str(date.today() + timedelta(days=30))}, headers=headers)
+
+    r = client.get("/tasks/due-soon?hours=24", headers=headers)
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()] == [today["id"]]
+    assert client.get("/tasks/overdue", headers=headers).json() == []
+    assert client.get("/tasks/due-soon?hours=0", headers=headers).status_code == 422
+    assert client.get("/admin/due-scheduler", headers=headers).json()["tracked"] == 2
+    assert client.get("/tasks/overdue").status_code == 401
+
+def test_include_route_uses_constant_statements(client, auth_token, count_statements):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for i in range(12):
+        task = client.post("/tasks/", json={"title": f"t{i}", "assigned_to": 1}, headers=headers).json()
+        client.post(f"/tasks/{task['id']}/comments", json={"content": f"c{i}"}, headers=headers)
+
+    counts = {}
+    for limit in (2, 12):
+        with count_statements() as statements:
+            r = client.get(f"/tasks/?limit={limit}&include=assignee,comments", headers=headers)
+        assert r.status_code == 200
+        assert len(r.json()) == limit
+        assert r.json()[0]["assignee"]["id"] == 1
+        assert len(r.json()[0]["comments"]) == 1
+        counts[limit] = len(statements)
+    assert counts[2] == counts[12]
+
+    plain = client.get("/tasks/?limit=2", headers=headers).json()[0]
+    assert "assignee" not in plain and "comments" not in plain
+    assert client.get("/tasks/?include=owner", headers=headers).status_code == 400
+    single = client.get(f"/tasks/{task['id']}?include=comments", headers=headers).json()
+    assert [c["content"] for c in single["comments"]] == ["c11"]
+
+def test_archived_filter_and_admin_route(client, auth_token, db):
+    from src.controllers.archive_controller import archive_done_tasks
+    from src.models.task_model import Task
+    from datetime import datetime
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    old = client.post("/tasks/", json={"title": "Antiga", "status": "done"}, headers=headers).json()
+    client.post("/tasks/", json={"title": "Nova"}, headers=headers)
+    db.query(Task).filter(Task.id == old["id"]).update({Task.completed_at: datetime(2020, 1, 1)})
+    db.commit()
+    archive_done_tasks(db, older_than_days=30, pause=0)
+
+    assert old["id"] not in [t["id"] for t in client.get("/tasks/", headers=headers).json()]
+    r = client.get("/tasks/?archived=true", headers=headers)
+    assert [t["id"] for t in r.json()] == [old["id"]]
+    assert "ETag" in r.headers
+    assert client.get(f"/tasks/{old['id']}", headers=headers).json()["title"] == "Antiga"
+    stats = client.get("/admin/archive", headers=headers).json()
+    assert stats["archived_tasks"] == 1
+    assert stats["last_run"]["archived_tasks"] == 1
+
+def test_list_tasks_sorted_by_activity_route(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    ids = [client.post("/tasks/", json={"title": f"S{i}", "assigned_to": 1}, headers=headers).json()["id"] for i in range(2)]
+    client.post(f"/tasks/{ids[1]}/comments", json={"content": "oi"}, headers=headers)
+    r = client.get("/tasks/?sort=activity", headers=headers)
+    assert r.status_code == 200
+    assert [t["id"] for t in r.json()][:2] == [ids[1], ids[0]]
+    assert r.json()[0]["comment_count"] == 1 and r.json()[0]["last_activity_at"] is not None
+    assert client.get("/tasks/?sort=title", headers=headers).status_code == 400
+
+def test_list_fast_json_matches_default_path(client, auth_token, monkeypatch):
+    from src.main import app
+    from src.views import task_routes
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"F{i}", "assigned_to": 1,
+                                     "due_date": str(date.today() + timedelta(days=i))}, headers=headers)
+    schema = app.openapi()
+    default = client.get("/tasks/?limit=2", headers=headers)
+    by_user = client.get("/tasks/user/1?limit=2", headers=headers)
+
+    monkeypatch.setattr(task_routes, "FAST_JSON", True)
+    fast = client.get("/tasks/?limit=2", headers=headers)
+    assert fast.content == default.content
+    assert fast.headers["ETag"] == default.headers["ETag"]
+    assert fast.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
+    assert client.get("/tasks/user/1?limit=2", headers=headers).content == by_user.content
+    app.openapi_schema = None  # regera: o caminho rápido não altera o schema declarado
+    assert app.openapi() == schema
+
+def test_tasks_msgpack_negotiation(client, auth_token):
+    import pytest
+    msgpack = pytest.importorskip("msgpack")
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    packed = {**headers, "Accept": "application/msgpack", "Content-Type": "application/msgpack"}
+    r = client.post("/tasks/", content=msgpack.packb({"title": "Binária", "due_date": "2100-01-02"}), headers=packed)
+    assert r.status_code == 201
+    assert r.headers["content-type"] == "application/msgpack"
+    created = msgpack.unpackb(r.content)
+    assert created["title"] == "Binária" and created["due_date"] == "2100-01-02"
+
+    r = client.put(f"/tasks/{created['id']}", content=msgpack.packb({"status": "done"}), headers=packed)
+    assert msgpack.unpackb(r.content)["status"] == "done"
+    r = client.post("/tasks/", content=msgpack.packb({"title": ""}), headers=packed)
+    assert r.status_code == 422  # mesma validação do corpo JSON
+
+    as_json = client.get("/tasks/", headers=headers)
+    r = client.get("/tasks/", headers={**headers, "Accept": "application/msgpack"})
+    assert r.headers["content-type"] == "application/msgpack"
+    assert r.headers["ETag"] == as_json.headers["ETag"][:-1] + '-mp"'
+    assert r.headers["vary"].startswith("Accept")
+    assert msgpack.unpackb(r.content) == as_json.json()
+    r = client.get(f"/tasks/{created['id']}", headers={**headers, "Accept": "application/msgpack"})
+    as_json = client.get(f"/tasks/{created['id']}", headers=headers)
+    assert msgpack.unpackb(r.content) == as_json.json()
+    assert r.headers["ETag"] == as_json.headers["ETag"][:-1] + '-mp"'
+    r = client.get("/tasks/?include=assignee", headers={**headers, "Accept": "application/msgpack"})
+    assert msgpack.unpackb(r.content) == client.get("/tasks/?include=assignee", headers=headers).json()
+
+def test_msgpack_and_json_etags_do_not_cross_match(client, auth_token):
+    import pytest
+    pytest.importorskip("msgpack")
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    task_id = client.post("/tasks/", json={"title": "Duas representações"}, headers=headers).json()["id"]
+    packed = {**headers, "Accept": "application/msgpack"}
+    for url in (f"/tasks/{task_id}", "/tasks/", "/tasks/user/1"):
+        json_etag = client.get(url, headers=headers).headers["ETag"]
+        r = client.get(url, headers={**packed, "If-None-Match": json_etag})
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "application/msgpack"
+        # o 304 repete o Vary: caches não servem uma representação no lugar da outra
+        r = client.get(url, headers={**packed, "If-None-Match": r.headers["ETag"]})
+        assert r.status_code == 304
+        assert r.headers["vary"].startswith("Accept")
+        assert client.get(url, headers={**headers, "If-None-Match": r.headers["ETag"]}).status_code == 200
+
+async def _open_event_streams(app, token, count):
+    # abre `count` streams SSE direto no app ASGI e devolve (conexões em uso, desconectar)
+    disconnect = asyncio.Event()
+    connected = asyncio.Semaphore(0)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/tasks/events", "raw_path": b"/tasks/events", "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"test"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+
+    async def run_stream():
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                connected.release()
+
+        await app(scope, receive, send)
+
+    streams = [asyncio.create_task(run_stream()) for _ in range(count)]
+    for _ in range(count):
+        await asyncio.wait_for(connected.acquire(), 5)
+    checked_out = engine.pool.checkedout()
+    disconnect.set()
+    await asyncio.gather(*streams)
+    return checked_out
+
+def test_event_streams_do_not_hold_db_connections(client, auth_token):
+    # o principal não está em cache: cada stream carrega o usuário no banco
+    before = engine.pool.checkedout()
+    principal_cache.clear()
+    assert asyncio.run(_open_event_streams(app, auth_token, 6)) == before
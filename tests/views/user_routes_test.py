@@ -1,3 +1,7 @@
+import inspect
+
+from src.views.user_routes import router
+
 def test_create_user_route(client, auth_token):
     r = client.post(
         "/users/",
@@ -39,6 +43,14 @@ def test_update_user_route(client, auth_token):
     assert r.status_code == 200
     assert r.json()["name"] == "Bruno Alterado"
 
+def test_update_password_of_missing_user_skips_hashing(client, auth_token, monkeypatch):
+    from src.auth import password_hashing
+    calls = []
+    monkeypatch.setattr(password_hashing, "_hash", lambda *args: calls.append(args))
+    r = client.put("/users/9999", json={"password": "nova"}, headers={"Authorization": f"Bearer {auth_token}"})
+    assert r.status_code == 404
+    assert calls == []
+
 def test_delete_user_route(client, auth_token):
     cr = client.post(
         "/users/",
@@ -54,3 +66,28 @@ def test_delete_user_route(client, auth_token):
 
     r2 = client.get(f"/users/{uid}", headers={"Authorization":f"Bearer {auth_token}"})
     assert r2.status_code == 404
+
+def test_deactivated_user_is_locked_out_immediately(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    # primeira chamada popula o cache de principal
+    assert client.get("/users/1", headers=headers).status_code == 200
+    assert client.get("/users/1", headers=headers).status_code == 200
+
+    r = client.delete("/users/1", headers=headers)
+    assert r.status_code == 204
+
+    r2 = client.get("/users/1", headers=headers)
+    assert r2.status_code == 401
+
+def test_principal_cache_avoids_db_lookup(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.get("/users/1", headers=headers)
+    client.get("/users/1", headers=headers)
+    stats = client.get("/admin/principal-cache", headers=headers).json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
+
+def test_user_routes_run_on_the_event_loop():
+    # rotas de usuário usam get_route_db + run_db (AsyncSession no DB_MODE=async), nenhuma no threadpool
+    assert router.routes
+    assert all(inspect.iscoroutinefunction(route.endpoint) for route in router.routes)